@@ -0,0 +1,64 @@
+"""
+Benchmark of the compiled DTO decoders against dataclasses_json's from_dict over the Ondus fixture payloads in
+tests/fixtures/ondus. Both paths start from the raw response body: json + from_dict is the previous path,
+json_loads (orjson if available) + decode the current one.
+
+Run from the repository root:  python -m benchmarks.bench_decoder
+"""
+import argparse
+import json
+import time
+import warnings
+from pathlib import Path
+from typing import Callable, Any
+
+from custom_components.grohe_sense.dto import ondus_dtos
+from custom_components.grohe_sense.dto.ondus_decoder import decode, decode_list, json_loads
+
+FIXTURES = Path(__file__).parent.parent / 'tests' / 'fixtures' / 'ondus'
+
+
+def measure(function: Callable[[], Any], duration: float) -> float:
+    """Get the calls per second of a function."""
+    function()
+    calls = 0
+    started = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < duration:
+        for _ in range(10):
+            function()
+        calls += 10
+    return calls / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--duration', type=float, default=1.0, help='seconds to measure each path per fixture')
+    args = parser.parse_args()
+    warnings.simplefilter('ignore')
+
+    index = json.loads((FIXTURES / 'index.json').read_text(encoding='utf-8'))
+    print(f'{"fixture":<38}{"bytes":>8}{"from_dict/s":>13}{"decode/s":>11}{"speedup":>9}')
+    total_baseline = total_compiled = 0.0
+    for name, entry in sorted(index.items()):
+        raw = (FIXTURES / name).read_bytes()
+        cls = getattr(ondus_dtos, entry['dto'])
+        if entry['list']:
+            baseline = lambda: [cls.from_dict(item) for item in json.loads(raw)]
+            compiled = lambda: decode_list(cls, json_loads(raw))
+        else:
+            baseline = lambda: cls.from_dict(json.loads(raw))
+            compiled = lambda: decode(cls, json_loads(raw))
+
+        baseline_rate = measure(baseline, args.duration)
+        compiled_rate = measure(compiled, args.duration)
+        total_baseline += 1 / baseline_rate
+        total_compiled += 1 / compiled_rate
+        print(f'{name:<38}{len(raw):>8}{baseline_rate:>13.0f}{compiled_rate:>11.0f}'
+              f'{compiled_rate / baseline_rate:>8.1f}x')
+
+    print(f'{"all fixtures once":<38}{"":>8}{1 / total_baseline:>13.0f}{1 / total_compiled:>11.0f}'
+          f'{total_baseline / total_compiled:>8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
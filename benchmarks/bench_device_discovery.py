@@ -0,0 +1,54 @@
+"""
+Benchmark of GroheDevice.get_devices against the local stand-in server with 50 locations x 10 rooms.
+
+Run from the repository root:  python -m benchmarks.bench_device_discovery
+"""
+import argparse
+import asyncio
+import time
+
+from aiohttp import ClientSession
+
+from benchmarks.fake_ondus_server import FakeOndusServer
+from custom_components.grohe_sense.dto.grohe_device import GroheDevice
+
+# The request scheduler of the API is opened up, so only the discovery itself is measured
+UNTHROTTLED = {'request_rate': 10_000.0, 'request_burst': 10_000}
+
+
+async def run(locations: int, rooms: int, latency: float, concurrencies: list[int]) -> None:
+    server = FakeOndusServer(locations, rooms, appliances=1, latency=latency)
+    await server.start()
+    print(f'{locations} locations x {rooms} rooms, {latency * 1000:.0f} ms latency per request')
+    print(f'{"mode":<22}{"devices":>8}{"requests":>10}{"peak":>6}{"seconds":>9}')
+    try:
+        async with ClientSession() as session:
+            modes = [(f'crawl, limit {concurrency}', concurrency, False) for concurrency in concurrencies]
+            modes.append(('dashboard', 1, True))
+            for name, concurrency, use_dashboard in modes:
+                api = server.create_api(session, **UNTHROTTLED)
+                await api.login(refresh_token='benchmark')
+                server.reset()
+
+                started = time.perf_counter()
+                devices = await GroheDevice.get_devices(api, concurrency, use_dashboard=use_dashboard)
+                duration = time.perf_counter() - started
+
+                print(f'{name:<22}{len(devices):>8}{sum(server.requests.values()):>10}{server.peak_in_flight:>6}'
+                      f'{duration:>9.2f}')
+    finally:
+        await server.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--locations', type=int, default=50)
+    parser.add_argument('--rooms', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.01, help='latency per request in seconds')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 5, 10, 25])
+    args = parser.parse_args()
+    asyncio.run(run(args.locations, args.rooms, args.latency, args.concurrency))
+
+
+if __name__ == '__main__':
+    main()
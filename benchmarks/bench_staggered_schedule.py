@@ -0,0 +1,87 @@
+"""
+Simulation of the peak number of concurrent requests of an account, with all appliances polling at the same time
+after setup (before) and with the polls staggered across the interval by GroheStaggeredSchedule.
+
+Run from the repository root:  python -m benchmarks.bench_staggered_schedule
+"""
+import argparse
+import heapq
+import random
+from datetime import timedelta
+
+from custom_components.grohe_sense.entities.grohe_staggered_schedule import GroheStaggeredSchedule, DEFAULT_JITTER
+
+START = 1_700_000_000.0
+
+
+def get_peak(polls: list[float], requests_per_poll: int, latency: float) -> tuple[int, int]:
+    """
+    Get the peak number of concurrent requests and the peak number of requests started within one second.
+    """
+    events = sorted([(poll, 1) for poll in polls] + [(poll + latency, -1) for poll in polls])
+    in_flight = peak = 0
+    for _, change in events:
+        in_flight += change * requests_per_poll
+        peak = max(peak, in_flight)
+
+    per_second: dict[int, int] = {}
+    for poll in polls:
+        per_second[int(poll)] = per_second.get(int(poll), 0) + requests_per_poll
+    return peak, max(per_second.values())
+
+
+def simulate(appliances: int, interval: timedelta, duration: timedelta, staggered: bool,
+             jitter: timedelta) -> list[float]:
+    """
+    Get the times of all polls after the first refresh. Like the DataUpdateCoordinator, each appliance starts with the
+    first refresh during setup and is polled again after the wait returned for its last poll.
+    """
+    # The coordinators are refreshed together during setup, the timers of Home Assistant add a random sub-second offset
+    queue = [(START + random.random(), f'appliance-{index}') for index in range(appliances)]
+    schedules = {appliance_id: GroheStaggeredSchedule(appliance_id, jitter) for _, appliance_id in queue}
+    heapq.heapify(queue)
+
+    polls = []
+    end = START + duration.total_seconds()
+    first_refresh = len(queue)
+    while queue and queue[0][0] < end:
+        now, appliance_id = heapq.heappop(queue)
+        if first_refresh:
+            # The first refresh of all appliances runs concurrently on purpose, it is the same for both schedules
+            first_refresh -= 1
+        else:
+            polls.append(now)
+        wait = schedules[appliance_id].align(interval, now) if staggered else interval
+        heapq.heappush(queue, (now + wait.total_seconds(), appliance_id))
+    return polls
+
+
+def run(appliances: list[int], interval: int, hours: int, requests_per_poll: int, latency: float,
+        jitter: int) -> None:
+    print(f'{interval} s interval, {requests_per_poll} requests per poll, {latency * 1000:.0f} ms per request, '
+          f'{hours} h simulated after the first refresh')
+    print(f'{"appliances":>10}  {"schedule":<11}{"polls":>7}{"peak concurrent":>17}{"peak per second":>17}')
+    for count in appliances:
+        for name, staggered in (('together', False), ('staggered', True)):
+            random.seed(count)
+            polls = simulate(count, timedelta(seconds=interval), timedelta(hours=hours), staggered,
+                             timedelta(seconds=jitter))
+            peak, per_second = get_peak(polls, requests_per_poll, latency)
+            print(f'{count:>10}  {name:<11}{len(polls):>7}{peak:>17}{per_second:>17}')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--appliances', type=int, nargs='+', default=[1, 10, 50, 100])
+    parser.add_argument('--interval', type=int, default=300, help='polling interval in seconds')
+    parser.add_argument('--hours', type=int, default=6)
+    parser.add_argument('--requests', type=int, default=2, help='requests per poll')
+    parser.add_argument('--latency', type=float, default=0.2, help='duration of a request in seconds')
+    parser.add_argument('--jitter', type=int, default=int(DEFAULT_JITTER.total_seconds()),
+                        help='jitter of the staggered polls in seconds')
+    args = parser.parse_args()
+    run(args.appliances, args.interval, args.hours, args.requests, args.latency, args.jitter)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark of the config entry setup against the local stand-in server with 1, 10 and 100 appliances.
+
+Run from the repository root:  python -m benchmarks.bench_startup
+"""
+import argparse
+import asyncio
+import functools
+import logging
+import tempfile
+import time
+
+from homeassistant import bootstrap, loader
+from homeassistant.config_entries import ConfigEntries, ConfigEntry
+from homeassistant.core import HomeAssistant, CoreState
+
+import custom_components.grohe_sense as grohe_sense
+from benchmarks.fake_ondus_server import FakeOndusServer
+from custom_components.grohe_sense.api.ondus_api import OndusApi
+from custom_components.grohe_sense.const import DOMAIN, CONF_USERNAME, CONF_PASSWORD
+
+UNTHROTTLED = {'request_rate': 10_000.0, 'request_burst': 10_000}
+
+_concurrent_first_refresh = grohe_sense._async_first_refresh
+
+
+async def _serial_first_refresh(hass, entry, coordinators) -> None:
+    # The setup before the concurrent first refresh: one coordinator after the other
+    for coordinator in coordinators.values():
+        await coordinator.async_refresh()
+
+
+async def _login(api, entry, token_store) -> bool:
+    return await api.login(refresh_token='benchmark')
+
+
+async def setup_entry(server: FakeOndusServer) -> tuple[float, int]:
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        loader.async_setup(hass)
+        hass.config_entries = ConfigEntries(hass, {})
+        await bootstrap.async_load_base_functionality(hass)
+        hass.set_state(CoreState.running)
+
+        entry = ConfigEntry(version=1, minor_version=1, domain=DOMAIN, title='Grohe Sense', source='user',
+                            data={CONF_USERNAME: 'benchmark', CONF_PASSWORD: 'benchmark'}, options={})
+        server.reset()
+        started = time.perf_counter()
+        await hass.config_entries.async_add(entry)
+        duration = time.perf_counter() - started
+
+        entities = len(hass.states.async_all())
+        await hass.async_stop()
+        return duration, entities
+
+
+async def run(appliances: list[int], latency: float, throttled: bool) -> None:
+    grohe_sense._login = _login
+    if not throttled:
+        grohe_sense.OndusApi = functools.partial(OndusApi, **UNTHROTTLED)
+
+    print(f'{latency * 1000:.0f} ms latency per request, request scheduler {"on" if throttled else "off"}')
+    print(f'{"appliances":>10}  {"first refresh":<14}{"entities":>9}{"requests":>10}{"peak":>6}{"seconds":>9}')
+    for count in appliances:
+        server = FakeOndusServer(appliances=count, latency=latency)
+        await server.start()
+        server.patch_api_url()
+        try:
+            for name, first_refresh in (('serial', _serial_first_refresh),
+                                        ('concurrent', _concurrent_first_refresh)):
+                grohe_sense._async_first_refresh = first_refresh
+                duration, entities = await setup_entry(server)
+                print(f'{count:>10}  {name:<14}{entities:>9}{sum(server.requests.values()):>10}'
+                      f'{server.peak_in_flight:>6}{duration:>9.2f}')
+        finally:
+            await server.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--appliances', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--latency', type=float, default=0.05, help='latency per request in seconds')
+    parser.add_argument('--throttled', action='store_true',
+                        help='keep the default request rate of the integration')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    asyncio.run(run(args.appliances, args.latency, args.throttled))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""
+Local stand-in for the Grohe Ondus API used by the benchmarks. It serves a generated account of
+locations x rooms x appliances with a fixed latency per request and records the number of requests and the peak
+number of concurrent requests.
+"""
+import asyncio
+import time
+from collections import Counter
+from typing import Dict, Any, List, Set
+
+import jwt
+from aiohttp import web, ClientSession
+
+from custom_components.grohe_sense.api.ondus_api import OndusApi
+
+API_PATH = '/v3/iot'
+APPLIANCE_PATH = API_PATH + '/locations/{location_id}/rooms/{room_id}/appliances/{appliance_id}'
+
+
+def tokens(lifetime: int = 3600) -> Dict[str, Any]:
+    now = int(time.time())
+    return {'access_token': jwt.encode({'exp': now + lifetime, 'sub': 'benchmark'}, 'secret'),
+            'expires_in': lifetime, 'refresh_expires_in': 2 * lifetime,
+            'refresh_token': jwt.encode({'exp': now + 2 * lifetime}, 'secret'), 'token_type': 'bearer',
+            'id_token': '', 'session_state': '', 'scope': '', 'not-before-policy': 0}
+
+
+def appliance(appliance_id: str, appliance_type: int = 103) -> Dict[str, Any]:
+    return {'appliance_id': appliance_id, 'installation_date': '2021-03-04T10:00:00.000+00:00',
+            'name': f'Sense Guard {appliance_id}', 'serial_number': f'SN{appliance_id}', 'type': appliance_type,
+            'version': '03.06', 'tdt': '2024-03-04T10:00:00.000+00:00', 'timezone': 60,
+            'config': {'measurement_transmission_intervall': 900, 'measurement_transmission_intervall_offset': 1},
+            'role': 'owner', 'registration_complete': True,
+            'notifications': [{'appliance_id': appliance_id, 'id': f'{appliance_id}-n1', 'category': 20,
+                               'is_read': False, 'timestamp': '2024-03-04T10:00:00.000+00:00', 'type': 11}],
+            'data_latest': {'measurement': {'timestamp': '2024-03-04T10:00:00.000+00:00', 'flow_rate': 0.0,
+                                            'pressure': 3.1, 'temperature_guard': 15.0}},
+            'command': {'temp_user_unlock_on': False, 'reason_for_change': 0, 'pressure_measurement_running': False,
+                        'buzzer_on': False, 'buzzer_sound_profile': 0, 'valve_open': True, 'measure_now': False},
+            'last_pressure_measurement': {'id': f'{appliance_id}-m1', 'status': 'SUCCESS',
+                                          'estimated_time_of_completion': '2024-03-04T03:01:30.000+00:00',
+                                          'start_time': '2024-03-04T03:00:00.000+00:00', 'error_message': '',
+                                          'leakage': False, 'level': 0, 'total_duration': 90,
+                                          'drop_of_pressure': 0.0,
+                                          'pressure_curve': [{'fr': 0.1, 'pr': 3.1, 'tp': 1}]}}
+
+
+def room(room_id: int, appliances: List[Dict[str, Any]] | None) -> Dict[str, Any]:
+    return {'id': room_id, 'name': f'Room {room_id}', 'type': 0, 'room_type': 0, 'role': 'owner',
+            'appliances': appliances}
+
+
+def location(location_id: int, rooms: List[Dict[str, Any]] | None) -> Dict[str, Any]:
+    return {'id': location_id, 'name': f'Location {location_id}', 'type': 2, 'role': 'owner',
+            'timezone': 'Europe/Berlin', 'water_cost': 2.5, 'energy_cost': 0.3, 'heating_type': 1, 'currency': 'EUR',
+            'default_water_cost': 2.5, 'default_energy_cost': 0.3, 'default_heating_type': 1,
+            'emergency_shutdown_enable': True,
+            'address': {'street': 'Street', 'city': 'City', 'zipcode': '12345', 'housenumber': '1', 'country': 'DE',
+                        'country_code': 'DE', 'additionalInfo': '', 'state': ''},
+            'rooms': rooms}
+
+
+def aggregated(appliance_id: str) -> Dict[str, Any]:
+    return {'appliance_id': appliance_id, 'type': 103, 'data': {'group_by': 'hour',
+            'measurement': [{'date': '2024-03-04T10:00:00.000+01:00', 'flowrate': 0.5, 'pressure': 3.0,
+                             'temperature_guard': 14.0}],
+            'withdrawals': [{'date': '2024-03-04T10:00:00.000+01:00', 'waterconsumption': 3.0,
+                             'hotwater_share': 0, 'water_cost': 0.01, 'energy_cost': 0}]}}
+
+
+class FakeOndusServer:
+    def __init__(self, locations: int = 1, rooms: int = 1, appliances: int = 1, latency: float = 0.0,
+                 port: int = 0) -> None:
+        self.locations = locations
+        self.rooms = rooms
+        self.appliances = appliances
+        self.latency = latency
+        self.requests: Counter = Counter()
+        # Names of the endpoints which answer with a server error
+        self.failing: Set[str] = set()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._port = port
+        self._runner: web.AppRunner | None = None
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self._port}{API_PATH}'
+
+    def appliance_ids(self, location_id: int, room_id: int) -> List[str]:
+        return [f'{location_id}-{room_id}-{appliance_id}' for appliance_id in range(self.appliances)]
+
+    def dashboard(self) -> Dict[str, Any]:
+        return {'locations': [location(location_id, [room(room_id, [appliance(appliance_id) for appliance_id in
+                                                                   self.appliance_ids(location_id, room_id)])
+                                                     for room_id in range(self.rooms)])
+                              for location_id in range(self.locations)]}
+
+    def reset(self) -> None:
+        self.requests.clear()
+        self.peak_in_flight = 0
+
+    def _handler(self, name: str, payload):
+        async def handle(request: web.Request) -> web.Response:
+            self.requests[name] += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            try:
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                if name in self.failing:
+                    return web.Response(status=500)
+                return web.json_response(payload(request.match_info))
+            finally:
+                self.in_flight -= 1
+        return handle
+
+    async def start(self) -> None:
+        app = web.Application()
+        routes = {
+            ('POST', '/oidc/refresh'): ('refresh', lambda _: tokens()),
+            ('GET', '/dashboard'): ('dashboard', lambda _: self.dashboard()),
+            ('GET', '/locations'): ('locations', lambda _: [location(location_id, None)
+                                                           for location_id in range(self.locations)]),
+            ('GET', '/locations/{location_id}/rooms'): ('rooms', lambda _: [room(room_id, None)
+                                                                           for room_id in range(self.rooms)]),
+            ('GET', '/locations/{location_id}/rooms/{room_id}/appliances'):
+                ('appliances', lambda m: [appliance(appliance_id) for appliance_id in
+                                          self.appliance_ids(m['location_id'], m['room_id'])]),
+            ('GET', '/profile/notifications'): ('profile_notifications',
+                                                lambda _: {'continuation_token': '', 'remaining_notifications': 0,
+                                                           'notifications': []}),
+        }
+        appliance_routes = {
+            '': ('appliance', lambda m: appliance(m['appliance_id'])),
+            '/details': ('details', lambda m: appliance(m['appliance_id'])),
+            '/command': ('command', lambda m: {'appliance_id': m['appliance_id'], 'type': 103,
+                                               'command': appliance(m['appliance_id'])['command']}),
+            '/notifications': ('notifications', lambda m: appliance(m['appliance_id'])['notifications']),
+            '/data/aggregated': ('data', lambda m: aggregated(m['appliance_id'])),
+            '/status': ('status', lambda _: [{'type': 'update_available', 'value': 0},
+                                             {'type': 'connection', 'value': 1}]),
+        }
+        for (method, path), (name, payload) in routes.items():
+            app.router.add_route(method, API_PATH + path, self._handler(name, payload))
+        for suffix, (name, payload) in appliance_routes.items():
+            app.router.add_route('GET', APPLIANCE_PATH + suffix, self._handler(name, payload))
+
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', self._port)
+        await site.start()
+        self._port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def create_api(self, session: ClientSession, **kwargs) -> OndusApi:
+        """Create an OndusApi which sends its requests to this server instead of the Grohe cloud."""
+        api = OndusApi(session, **kwargs)
+        api._OndusApi__api_url = self.url
+        return api
+
+    def patch_api_url(self) -> None:
+        """Let all OndusApi instances, e.g. the one created by the integration, use this server."""
+        OndusApi._OndusApi__api_url = self.url
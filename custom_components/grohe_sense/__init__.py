@@ -1,29 +1,370 @@
+import asyncio
 import logging
-from typing import List
+from datetime import timedelta
+from typing import List, Dict, Set, Tuple, Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
 from homeassistant.helpers import aiohttp_client
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from custom_components.grohe_sense.api.ondus_api import OndusApi
-from custom_components.grohe_sense.const import DOMAIN, CONF_USERNAME, CONF_PASSWORD, CONF_PLATFORM
+from custom_components.grohe_sense.api.ondus_response_cache import OndusResponseCache
+from custom_components.grohe_sense.api.ondus_exceptions import OndusAuthenticationError, OndusApiError
+from custom_components.grohe_sense.api.ondus_notifications import NOTIFICATION_CATALOG
+from custom_components.grohe_sense.const import DOMAIN, CONF_USERNAME, CONF_PASSWORD, CONF_PLATFORM, DATA_RESPONSE_CACHE, \
+    CONF_INTERVAL_FLOOR, CONF_INTERVAL_CEILING
 from custom_components.grohe_sense.dto.grohe_device import GroheDevice
+from custom_components.grohe_sense.entities.configuration.grohe_entity_configuration import GROHE_ENTITY_CONFIG
+from custom_components.grohe_sense.entities.grohe_adaptive_interval import DEFAULT_INTERVAL_FLOOR, \
+    DEFAULT_INTERVAL_CEILING
+from custom_components.grohe_sense.entities.grohe_blue_update_coordinator import GroheBlueUpdateCoordinator
+from custom_components.grohe_sense.entities.grohe_dashboard_update_coordinator import GroheDashboardUpdateCoordinator
+from custom_components.grohe_sense.entities.grohe_notification_events import GroheNotificationEvents
+from custom_components.grohe_sense.entities.grohe_notification_update_coordinator import \
+    GroheNotificationUpdateCoordinator
+from custom_components.grohe_sense.entities.grohe_sense_update_coordinator import GroheSenseUpdateCoordinator
 from custom_components.grohe_sense.enum.ondus_types import GroheTypes
+from custom_components.grohe_sense.services import async_register_services, async_unregister_services
+from custom_components.grohe_sense.storage.grohe_notification_store import GroheNotificationStore
+from custom_components.grohe_sense.storage.grohe_snapshot_store import GroheSnapshotStore
+from custom_components.grohe_sense.storage.grohe_timeseries_store import GroheTimeSeriesStore
+from custom_components.grohe_sense.storage.grohe_token_store import GroheTokenStore
 
 _LOGGER = logging.getLogger(__name__)
 
+STARTUP_REFRESH_TIMEOUT = timedelta(seconds=30)
+RECONCILE_RETRY_DELAY = timedelta(seconds=30)
+RECONCILE_RETRY_MAX_DELAY = timedelta(minutes=15)
+
+
+async def _login(api: OndusApi, entry: ConfigEntry, token_store: GroheTokenStore) -> bool:
+    """
+    Login with the stored refresh token if possible, otherwise with username and password.
+
+    :param api: The OndusApi to log in.
+    :param entry: The config entry containing the credentials.
+    :param token_store: The store containing the refresh token of the last run.
+    :return: True if the login was successful, False otherwise.
+    """
+    username = entry.data[CONF_USERNAME]
+
+    refresh_token = await token_store.async_load(username)
+    if refresh_token is not None:
+        try:
+            if await api.login(refresh_token=refresh_token):
+                _LOGGER.debug('Logged in with stored refresh token')
+                return True
+        except Exception as e:
+            _LOGGER.info('Login with stored refresh token failed, using username/password: %s', str(e))
+
+    try:
+        return await api.login(username, entry.data[CONF_PASSWORD])
+    except OndusAuthenticationError as e:
+        raise ConfigEntryAuthFailed(str(e)) from e
+    except Exception as e:
+        raise ConfigEntryNotReady(f'Could not login to Grohe: {e}') from e
+
+
+def _create_coordinators(hass: HomeAssistant, api: OndusApi, dashboard: GroheDashboardUpdateCoordinator,
+                         notifications: GroheNotificationUpdateCoordinator, timeseries: GroheTimeSeriesStore,
+                         devices: List[GroheDevice], interval_floor: timedelta = DEFAULT_INTERVAL_FLOOR,
+                         interval_ceiling: timedelta = DEFAULT_INTERVAL_CEILING) -> Dict[str, DataUpdateCoordinator]:
+    """
+    Create the update coordinators of all supported devices.
+
+    :param hass: The Home Assistant instance.
+    :param api: The OndusApi used by the coordinators.
+    :param dashboard: The dashboard coordinator shared by all coordinators.
+    :param notifications: The notification sync shared by all Sense coordinators.
+    :param timeseries: The time-series store shared by all Sense coordinators.
+    :param devices: The discovered devices.
+    :param interval_floor: The shortest polling interval of the Sense coordinators.
+    :param interval_ceiling: The longest polling interval of the Sense coordinators.
+    :return: The coordinators by appliance ID.
+    """
+    coordinators: Dict[str, DataUpdateCoordinator] = {}
+    for device in devices:
+        if device.type not in GROHE_ENTITY_CONFIG:
+            continue
+        if device.type == GroheTypes.GROHE_BLUE_PROFESSIONAL or device.type == GroheTypes.GROHE_BLUE_HOME:
+            coordinators[device.appliance_id] = GroheBlueUpdateCoordinator(hass, device, api, dashboard)
+        else:
+            coordinators[device.appliance_id] = GroheSenseUpdateCoordinator(hass, device, api, dashboard,
+                                                                            notifications, timeseries,
+                                                                            interval_floor=interval_floor,
+                                                                            interval_ceiling=interval_ceiling)
+    return coordinators
+
+
+def _get_interval_limits(entry: ConfigEntry) -> Tuple[timedelta, timedelta]:
+    """
+    Get the floor and ceiling of the polling interval from the options of the entry.
+
+    :param entry: The config entry.
+    :return: The floor and the ceiling of the polling interval.
+    """
+    floor = entry.options.get(CONF_INTERVAL_FLOOR, DEFAULT_INTERVAL_FLOOR.total_seconds())
+    ceiling = entry.options.get(CONF_INTERVAL_CEILING, DEFAULT_INTERVAL_CEILING.total_seconds())
+    return timedelta(seconds=floor), timedelta(seconds=ceiling)
+
+
+async def _async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def _async_create_notification_sync(hass: HomeAssistant, entry: ConfigEntry, api: OndusApi,
+                                          devices: List[GroheDevice],
+                                          dashboard: GroheDashboardUpdateCoordinator | None = None
+                                          ) -> GroheNotificationUpdateCoordinator:
+    """
+    Create the account wide notification sync, which fires the events of new notifications. On the first start the
+    events are primed with all notifications of the account right away, from the sync or from the dashboard, so the
+    existing backlog of no appliance fires.
+
+    :param hass: The Home Assistant instance.
+    :param entry: The config entry being set up.
+    :param api: The OndusApi used by the sync.
+    :param devices: The devices of the account.
+    :param dashboard: (optional) The dashboard coordinator to prime the events with if the sync is not available.
+                      Without it (not logged in yet), the events are primed by the first successful sync.
+    :return: The notification sync.
+    """
+    events = GroheNotificationEvents(hass, GroheNotificationStore(hass, entry.entry_id), devices)
+    await events.async_load()
+    notifications = GroheNotificationUpdateCoordinator(hass, api, events)
+    # No entity listens to the sync itself, but a coordinator only runs on its update interval while it has listeners
+    entry.async_on_unload(notifications.async_add_listener(lambda: None))
+
+    if dashboard is not None and not events.primed:
+        # The first sync is a full sync, which primes the events
+        await notifications.async_refresh()
+        if not events.primed:
+            locations = await dashboard.get_locations()
+            if locations is not None:
+                events.async_prime(notification for location in locations.locations
+                                   for room in location.rooms or []
+                                   for appliance in room.appliances or []
+                                   for notification in appliance.notifications or [])
+    return notifications
+
+
+async def _async_first_refresh(hass: HomeAssistant, entry: ConfigEntry,
+                               coordinators: Dict[str, DataUpdateCoordinator]) -> None:
+    """
+    Run the first refresh of all coordinators concurrently. Setup waits at most STARTUP_REFRESH_TIMEOUT, refreshes
+    which take longer keep running in the background and the entities get their values once they are done.
+
+    :param hass: The Home Assistant instance.
+    :param entry: The config entry being set up.
+    :param coordinators: The coordinators to refresh.
+    :return: None
+    """
+    if not coordinators:
+        return
+
+    tasks = [entry.async_create_background_task(hass, coordinator.async_refresh(),
+                                                f'Grohe Sense first refresh {appliance_id}')
+             for appliance_id, coordinator in coordinators.items()]
+    _, pending = await asyncio.wait(tasks, timeout=STARTUP_REFRESH_TIMEOUT.total_seconds())
+    if pending:
+        _LOGGER.info('First refresh of %d Grohe appliances is still running, continuing in the background',
+                     len(pending))
+
+
+async def _async_discover_devices(api: OndusApi, dashboard: GroheDashboardUpdateCoordinator,
+                                  use_cache: bool = False) -> List[GroheDevice]:
+    """
+    Discover the devices of the account, from the dashboard if possible, otherwise by crawling the locations.
+
+    :param api: The logged in OndusApi.
+    :param dashboard: The dashboard coordinator.
+    :param use_cache: Take the topology of the last dashboard from the response cache if it is still valid.
+    :return: The discovered devices.
+    :raises ConfigEntryNotReady: If the devices could not be discovered.
+    """
+    if use_cache:
+        locations = api.get_cached_topology()
+        if locations is not None:
+            _LOGGER.debug('Discovered the Grohe devices from the cached topology')
+            return GroheDevice.get_devices_from_locations(locations)
+
+    locations = await dashboard.get_locations()
+    if locations is not None:
+        return GroheDevice.get_devices_from_locations(locations)
+
+    try:
+        return await GroheDevice.get_devices(api)
+    except OndusApiError as e:
+        raise ConfigEntryNotReady(f'Could not discover Grohe devices: {e}') from e
+
+
+def _get_topology(devices: List[GroheDevice]) -> Set[Tuple[Any, ...]]:
+    return {(device.appliance_id, device.location_id, device.room_id, device.type, device.name, device.sw_version,
+             device.location_name, device.room_name, device.emergency_shutdown_enable)
+            for device in devices}
+
+
+async def _async_reload_if_changed(hass: HomeAssistant, entry: ConfigEntry, snapshot_store: GroheSnapshotStore,
+                                   discovered: List[GroheDevice], devices: List[GroheDevice],
+                                   coordinators: Dict[str, DataUpdateCoordinator]) -> bool:
+    """
+    Reload the entry if the discovered devices differ from the set up ones.
+
+    :param hass: The Home Assistant instance.
+    :param entry: The config entry.
+    :param snapshot_store: The store containing the snapshot, it is updated with the discovered devices.
+    :param discovered: The discovered devices.
+    :param devices: The devices the entry was set up with.
+    :param coordinators: The coordinators of the set up devices.
+    :return: True if the entry is reloaded, False otherwise.
+    """
+    if _get_topology(discovered) == _get_topology(devices):
+        return False
+
+    _LOGGER.info('Grohe devices changed since the last run, reloading')
+    await snapshot_store.async_save(discovered, {appliance_id: coordinator.data
+                                                 for appliance_id, coordinator in coordinators.items()})
+    hass.config_entries.async_schedule_reload(entry.entry_id)
+    return True
+
+
+async def _async_reconcile(hass: HomeAssistant, entry: ConfigEntry, api: OndusApi, token_store: GroheTokenStore,
+                           snapshot_store: GroheSnapshotStore, dashboard: GroheDashboardUpdateCoordinator,
+                           devices: List[GroheDevice], coordinators: Dict[str, DataUpdateCoordinator]) -> None:
+    """
+    Login and reconcile the devices restored from the snapshot with the Grohe cloud in the background. If the
+    topology changed, the entry is reloaded to add or remove entities, otherwise the restored values are refreshed.
+
+    After a reload the topology of the last dashboard is usually still cached, so the devices are compared with it
+    without a request. The first refresh fetches the dashboard again, which updates the cached topology, so changes
+    are still picked up right after it.
+
+    :param hass: The Home Assistant instance.
+    :param entry: The config entry.
+    :param api: The OndusApi, not logged in yet.
+    :param token_store: The store containing the refresh token of the last run.
+    :param snapshot_store: The store containing the snapshot.
+    :param dashboard: The dashboard coordinator.
+    :param devices: The devices restored from the snapshot.
+    :param coordinators: The coordinators of the restored devices.
+    :return: None
+    """
+    delay = RECONCILE_RETRY_DELAY
+    while True:
+        try:
+            if not await _login(api, entry, token_store):
+                raise ConfigEntryAuthFailed('Login to Grohe failed')
+            api.auth.start_renewal()
+            discovered = await _async_discover_devices(api, dashboard, use_cache=True)
+            break
+        except ConfigEntryAuthFailed as e:
+            _LOGGER.error('Could not login to Grohe: %s', str(e))
+            entry.async_start_reauth(hass)
+            return
+        except ConfigEntryNotReady as e:
+            _LOGGER.warning('Could not reach Grohe, retrying in %s: %s', delay, str(e))
+            await asyncio.sleep(delay.total_seconds())
+            delay = min(delay * 2, RECONCILE_RETRY_MAX_DELAY)
+
+    if await _async_reload_if_changed(hass, entry, snapshot_store, discovered, devices, coordinators):
+        return
+
+    await _async_first_refresh(hass, entry, coordinators)
+
+    locations = api.get_cached_topology()
+    if locations is not None:
+        await _async_reload_if_changed(hass, entry, snapshot_store, GroheDevice.get_devices_from_locations(locations),
+                                       devices, coordinators)
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     _LOGGER.debug("Loading Grohe Sense")
 
     session = aiohttp_client.async_get_clientsession(hass)
 
-    api = OndusApi(session)
-    state = await api.login(entry.data[CONF_USERNAME], entry.data[CONF_PASSWORD])
+    # The response cache survives reloads of the entry, so that the topology does not have to be fetched again
+    cache = hass.data.setdefault(DATA_RESPONSE_CACHE, {}).setdefault(entry.entry_id, OndusResponseCache())
+    api = OndusApi(session, cache=cache)
+    token_store = GroheTokenStore(hass, entry.entry_id)
+    entry.async_on_unload(api.auth.add_token_listener(
+        lambda: token_store.async_save(entry.data[CONF_USERNAME], api.auth.refresh_token,
+                                       api.auth.refresh_token_expires)))
+    entry.async_on_unload(api.auth.add_auth_failure_listener(lambda: entry.async_start_reauth(hass)))
+    entry.async_on_unload(api.auth.stop_renewal)
 
-    devices: List[GroheDevice] = await GroheDevice.get_devices(api)
+    dashboard = GroheDashboardUpdateCoordinator(hass, api)
+    await hass.async_add_executor_job(NOTIFICATION_CATALOG.load_translations, hass.config.language)
+    snapshot_store = GroheSnapshotStore(hass, entry.entry_id)
+    snapshot = await snapshot_store.async_load()
+    timeseries = GroheTimeSeriesStore(hass, entry.entry_id)
+    interval_floor, interval_ceiling = _get_interval_limits(entry)
 
-    hass.data[DOMAIN] = {'session': api, 'devices': devices}
+    if snapshot is not None:
+        devices, snapshot_data = snapshot
+        _LOGGER.debug('Restored %d Grohe devices from snapshot, login in the background', len(devices))
+
+        notifications = await _async_create_notification_sync(hass, entry, api, devices)
+        coordinators = _create_coordinators(hass, api, dashboard, notifications, timeseries, devices,
+                                            interval_floor, interval_ceiling)
+        for appliance_id, data in snapshot_data.items():
+            if appliance_id in coordinators:
+                coordinators[appliance_id].data = data
+
+        entry.async_create_background_task(
+            hass, _async_reconcile(hass, entry, api, token_store, snapshot_store, dashboard, devices, coordinators),
+            'Grohe Sense reconcile')
+    else:
+        state = await _login(api, entry, token_store)
+        if not state:
+            raise ConfigEntryAuthFailed('Login to Grohe failed')
+
+        api.auth.start_renewal()
+
+        devices = await _async_discover_devices(api, dashboard)
+        notifications = await _async_create_notification_sync(hass, entry, api, devices, dashboard)
+        coordinators = _create_coordinators(hass, api, dashboard, notifications, timeseries, devices,
+                                            interval_floor, interval_ceiling)
+        await _async_first_refresh(hass, entry, coordinators)
+        await snapshot_store.async_save(devices, {appliance_id: coordinator.data
+                                                  for appliance_id, coordinator in coordinators.items()})
+
+    def save_snapshot() -> None:
+        snapshot_store.async_delay_save(devices, lambda: {appliance_id: coordinator.data
+                                                          for appliance_id, coordinator in coordinators.items()})
+
+    for coordinator in coordinators.values():
+        entry.async_on_unload(coordinator.async_add_listener(save_snapshot))
+    entry.async_on_unload(entry.add_update_listener(_async_update_options))
+
+    hass.data[DOMAIN] = {'session': api, 'devices': devices, 'dashboard': dashboard, 'notifications': notifications,
+                         'coordinators': coordinators, 'timeseries': timeseries}
 
     await hass.config_entries.async_forward_entry_setups(entry, CONF_PLATFORM)
+    async_register_services(hass)
+
+    return True
+
+
+async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    _LOGGER.debug("Unloading Grohe Sense")
+
+    unloaded = await hass.config_entries.async_unload_platforms(entry, CONF_PLATFORM)
+    if unloaded:
+        async_unregister_services(hass)
+        data = hass.data.pop(DOMAIN, None)
+        if data is not None:
+            await data['timeseries'].async_close()
+            # Only reloads are served from the cached topology, a disabled entry discovers its devices again
+            if entry.disabled_by is not None:
+                data['session'].invalidate_cache()
+
+    return unloaded
+
 
-    return state
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    hass.data.get(DATA_RESPONSE_CACHE, {}).pop(entry.entry_id, None)
+    await GroheTokenStore(hass, entry.entry_id).async_remove()
+    await GroheSnapshotStore(hass, entry.entry_id).async_remove()
+    await GroheNotificationStore(hass, entry.entry_id).async_remove()
+    await GroheTimeSeriesStore(hass, entry.entry_id).async_remove()
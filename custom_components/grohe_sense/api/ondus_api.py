@@ -1,19 +1,28 @@
+import asyncio
 import logging
+import random
 import string
 import urllib.parse
-from datetime import datetime, timedelta
+from datetime import datetime
 from http.cookies import SimpleCookie
-from typing import List, Optional, Tuple, Dict, Any
+from typing import List, Optional, Tuple, Dict, Any, Iterable, AsyncIterator
 
 import aiohttp
-import jwt
-from aiohttp import ClientSession
+from aiohttp import ClientSession, ClientResponse
 from lxml import html
 
-from custom_components.grohe_sense.api.ondus_notifications import ondus_notifications
+from custom_components.grohe_sense.api.ondus_auth_manager import OndusAuthManager
+from custom_components.grohe_sense.api.ondus_circuit_breaker import OndusCircuitBreaker, get_endpoint_family
+from custom_components.grohe_sense.api.ondus_exceptions import OndusAuthenticationError, OndusApiError
+from custom_components.grohe_sense.api.ondus_notifications import NOTIFICATION_CATALOG
+from custom_components.grohe_sense.api.ondus_response_cache import OndusResponseCache
+from custom_components.grohe_sense.api.ondus_request_scheduler import OndusRequestScheduler, DEFAULT_REQUEST_RATE, \
+    DEFAULT_REQUEST_BURST, parse_retry_after
+from custom_components.grohe_sense.dto.ondus_decoder import decode, decode_list, json_loads
 from custom_components.grohe_sense.dto.ondus_dtos import Locations, Location, Room, Appliance, Notification, Status, \
-    ApplianceCommand, MeasurementData, OndusToken, PressureMeasurementStart, ProfileNotifications
-from custom_components.grohe_sense.enum.ondus_types import OndusGroupByTypes, OndusCommands, GroheTypes
+    ApplianceCommand, MeasurementData, OndusToken, PressureMeasurementStart, ProfileNotifications, ProfileNotification
+from custom_components.grohe_sense.enum.ondus_types import OndusGroupByTypes, OndusCommands, GroheTypes, \
+    OndusRequestPriority, OndusEndpointFamily
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,38 +41,68 @@ def is_iteratable(obj: Any) -> bool:
         return False
 
 
+def set_notification_text(notification: Notification) -> Notification:
+    """
+    Resolve the text and the type text of a notification by its category and type.
+
+    :param notification: The notification to resolve the texts for.
+    :return: The same notification with notification_text and notification_type set.
+    """
+    notification.notification_text, notification.notification_type = NOTIFICATION_CATALOG.resolve(
+        notification.category, notification.type)
+    return notification
+
+
 class OndusApi:
     __base_url: str = 'https://idp2-apigw.cloud.grohe.com'
     __api_url: str = __base_url + '/v3/iot'
-    __tokens: OndusToken = None
-    __token_update_time: datetime = None
-
-    __update_token_before_expiration: timedelta = timedelta(seconds=300)
-    __access_token_expires: datetime = None
-    __refresh_token_expires: datetime = None
     __username: str = None
     __password: str = None
-    __user_id: str = None
-
-    def __init__(self, session: ClientSession) -> None:
+    __max_throttled_retries: int = 2
+    __max_retries: int = 3
+    __retry_backoff_base: float = 1.0
+    __retry_backoff_max: float = 30.0
+    __max_critical_retries: int = 3
+    __critical_backoff_base: float = 0.25
+
+    def __init__(self, session: ClientSession, request_rate: float = DEFAULT_REQUEST_RATE,
+                 request_burst: int = DEFAULT_REQUEST_BURST, cache: OndusResponseCache | None = None) -> None:
         self._session = session
+        self._cache = cache if cache is not None else OndusResponseCache()
+        self._auth = OndusAuthManager(self.__refresh_tokens)
+        self._scheduler = OndusRequestScheduler(request_rate, request_burst)
+        self._circuit_breakers: Dict[OndusEndpointFamily, OndusCircuitBreaker] = {
+            family: OndusCircuitBreaker(family) for family in OndusEndpointFamily
+        }
 
-    def __set_token(self, token: OndusToken) -> None:
+    @property
+    def auth(self) -> OndusAuthManager:
+        return self._auth
+
+    @property
+    def scheduler(self) -> OndusRequestScheduler:
+        return self._scheduler
+
+    @property
+    def circuit_breakers(self) -> Dict[OndusEndpointFamily, OndusCircuitBreaker]:
+        return self._circuit_breakers
+
+    @property
+    def cache(self) -> OndusResponseCache:
+        return self._cache
+
+    def invalidate_cache(self, location_id: str | None = None) -> None:
         """
-        Set the token and update the last update
+        Remove cached responses, e.g. because the topology was changed in the app.
 
-        :param token: The token to be set.
+        :param location_id: Only remove the responses of this location. If None, everything is removed.
+        :type location_id: str | None
         :return: None
         """
-        self.__tokens = token
-        access_token_data = jwt.decode(token.access_token, options={'verify_signature': False})
-        self.__access_token_expires = datetime.fromtimestamp(int(access_token_data['exp']))
-        self.__user_id = access_token_data['sub']
-
-        refresh_token_data = jwt.decode(token.refresh_token, options={'verify_signature': False})
-        self.__refresh_token_expires = datetime.fromtimestamp(int(refresh_token_data['exp']))
-
-        self.__token_update_time = datetime.now()
+        if location_id is None:
+            self._cache.invalidate()
+        else:
+            self._cache.invalidate(f'{self.__api_url}/locations/{location_id}/')
 
     async def __get_oidc_action(self) -> Tuple[SimpleCookie, str]:
         """
@@ -124,6 +163,7 @@ class OndusApi:
                 return token_url
             else:
                 _LOGGER.error('Login failed (and we got no redirect) with status code %s', response.status)
+                raise OndusAuthenticationError(f'Login failed with status code {response.status}')
 
     async def __get_tokens(self, url: str, cookies: SimpleCookie) -> OndusToken:
         """
@@ -141,7 +181,7 @@ class OndusApi:
         except Exception as e:
             _LOGGER.error('Get Refresh Token response exception %s', str(e))
         else:
-            return OndusToken.from_dict(await response.json())
+            return decode(OndusToken, await response.json(loads=json_loads))
 
     async def __refresh_tokens(self, refresh_token: str) -> OndusToken:
         """
@@ -157,69 +197,132 @@ class OndusApi:
             'refresh_token': refresh_token
         })
 
-        return OndusToken.from_dict(await response.json())
+        if response.status in (400, 401, 403):
+            _LOGGER.error('Refreshing tokens failed with status code %s', response.status)
+            raise OndusAuthenticationError(f'Refreshing tokens failed with status code {response.status}')
+        elif response.status != 200:
+            # E.g. the identity provider is temporarily not available, the refresh token might still be valid
+            response.release()
+            raise OndusApiError(f'Refreshing tokens failed with status code {response.status}')
 
-    def __is_access_token_valid(self) -> bool:
-        """
-        Check if the access token is still valid.
+        return decode(OndusToken, await response.json(loads=json_loads))
 
-        :return: True if the token is valid, False otherwise.
-        :rtype: bool
+    async def __send(self, method: str, url: str, data: Dict[str, Any] | None = None,
+                     priority: OndusRequestPriority = OndusRequestPriority.NORMAL) -> ClientResponse:
         """
-        if (self.__tokens is not None and
-                self.__access_token_expires is not None and
-                self.__access_token_expires - self.__update_token_before_expiration > datetime.now()):
-            return True
-        else:
-            return False
+        Send a request through the request scheduler and the circuit breaker of its endpoint family.
 
-    def __is_refresh_token_valid(self) -> bool:
-        """
-        Check if the refresh token is valid.
+        If the server throttles the request (429/503), all requests are paused for the time given by Retry-After and
+        the request is sent again. Idempotent requests (GET/PUT) which fail with a network error or a server error are
+        retried with a jittered exponential backoff.
 
-        :return: True if the refresh token is still valid, False otherwise.
-        :rtype: bool
-        """
-        if (self.__tokens is not None and
-                self.__refresh_token_expires is not None and
-                self.__refresh_token_expires - self.__update_token_before_expiration > datetime.now()):
-            return True
+        CRITICAL requests (the emergency shut-off) are sent even if the circuit of their endpoint family is open. As
+        they set an absolute state, they are safe to repeat and are retried regardless of the method, with a shorter
+        backoff.
+
+        :param method: The HTTP method of the request.
+        :type method: str
+        :param url: The URL to send the request to.
+        :type url: str
+        :param data: The data to include in the request body.
+        :type data: Dict[str, Any]
+        :param priority: The priority of the request in the request scheduler.
+        :type priority: OndusRequestPriority
+        :return: The response of the request (status code below 500).
+        :rtype: ClientResponse
+        :raises OndusCircuitOpenError: If the circuit of the endpoint family is open (not for CRITICAL requests).
+        :raises OndusApiError: If the request failed, even after retrying it.
+        """
+        await self._auth.ensure_valid_token()
+
+        breaker = self._circuit_breakers[get_endpoint_family(url)]
+        critical = priority == OndusRequestPriority.CRITICAL
+        if critical:
+            max_attempts = self.__max_critical_retries + 1
+            backoff_base = self.__critical_backoff_base
         else:
-            return False
+            max_attempts = self.__max_retries + 1 if method in ('GET', 'PUT') else 1
+            backoff_base = self.__retry_backoff_base
+        kwargs = {} if method == 'GET' else {'json': data}
+
+        attempt = 0
+        while True:
+            attempt += 1
+            if not critical:
+                breaker.before_request()
+
+            throttled = 0
+            try:
+                while True:
+                    await self._scheduler.acquire(priority)
+                    response = await self._session.request(method, url=url, headers={
+                        'Authorization': f'Bearer {self._auth.access_token}'
+                    }, **kwargs)
+
+                    if response.status in (429, 503) and throttled < self.__max_throttled_retries:
+                        throttled += 1
+                        response.release()
+                        self._scheduler.throttle(parse_retry_after(response.headers.get('Retry-After')))
+                        continue
+                    break
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                breaker.record_failure()
+                error = OndusApiError(f'Request to {url} failed: {e!r}')
+                error.__cause__ = e
+            else:
+                if response.status < 500 and response.status != 429:
+                    breaker.record_success()
+                    return response
 
-    async def __update_invalid_token(self):
-        """
-        Update the invalid token with a new token if possible, otherwise raise an error.
+                breaker.record_failure()
+                response.release()
+                error = OndusApiError(f'URL {url} returned status code {response.status}')
 
-        :return: None
-        """
-        if not self.__is_access_token_valid() and self.__is_refresh_token_valid():
-            self.__set_token(await self.__refresh_tokens(self.__tokens.refresh_token))
-        elif not self.__is_access_token_valid() and not self.__is_refresh_token_valid():
-            _LOGGER.error('Both access token and refresh token are invalid. Please login again.')
-            raise ValueError('Both access token and refresh token are invalid. Please login again.')
+            if attempt >= max_attempts:
+                raise error
+
+            delay = min(backoff_base * 2 ** (attempt - 1), self.__retry_backoff_max)
+            delay *= random.uniform(0.5, 1.5)
+            breaker.record_retry()
+            _LOGGER.debug('%s (attempt %d/%d), retrying in %.1f s', error, attempt, max_attempts, delay)
+            await asyncio.sleep(delay)
 
-    async def __get(self, url: str) -> Dict[str, Any] | None:
+    async def __get(self, url: str, priority: OndusRequestPriority = OndusRequestPriority.NORMAL,
+                    use_cache: bool = True) -> Dict[str, Any] | None:
         """
-        Retrieve data from the specified URL using a GET request.
+        Retrieve data from the specified URL using a GET request. Responses of cacheable endpoint families are served
+        from the response cache while they are valid.
 
         :param url: The URL to retrieve data from.
         :type url: str
+        :param priority: The priority of the request in the request scheduler.
+        :type priority: OndusRequestPriority
+        :param use_cache: Whether the response cache may be used for this request.
+        :type use_cache: bool
         :return: A dictionary containing the retrieved data.
         :rtype: Dict[str, Any]
         """
-        await self.__update_invalid_token()
-        response = await self._session.get(url=url, headers={
-            'Authorization': f'Bearer {self.__tokens.access_token}'
-        })
+        family = get_endpoint_family(url)
+        use_cache = use_cache and self._cache.is_cacheable(family)
+        if use_cache:
+            cached, data = self._cache.get(url)
+            if cached:
+                _LOGGER.debug('Serving %s from cache', url)
+                return data
+
+        response = await self.__send('GET', url, priority=priority)
 
         if response.status in (200, 201):
-            return await response.json()
+            data = await response.json(loads=json_loads)
+            if use_cache:
+                self._cache.set(url, family, data)
+            return data
         else:
             _LOGGER.warning(f'URL {url} returned status code {response.status}')
             return None
 
-    async def __post(self, url: str, data: Dict[str, Any] | None) -> Dict[str, Any]:
+    async def __post(self, url: str, data: Dict[str, Any] | None,
+                     priority: OndusRequestPriority = OndusRequestPriority.NORMAL) -> Dict[str, Any]:
         """
         Send a POST request to the specified URL with the given data.
 
@@ -227,18 +330,18 @@ class OndusApi:
         :type url: str
         :param data: The data to include in the request body.
         :type data: Dict[str, Any]
+        :param priority: The priority of the request in the request scheduler.
+        :type priority: OndusRequestPriority
         :return: A dictionary representing the response JSON.
         :rtype: Dict[str, Any]
         """
-        await self.__update_invalid_token()
-        response = await self._session.post(url=url, json=data, headers={
-            'Authorization': f'Bearer {self.__tokens.access_token}'
-        })
+        response = await self.__send('POST', url, data, priority)
 
         if response.status == 201:
-            return await response.json()
+            return await response.json(loads=json_loads)
 
-    async def __put(self, url: str, data: Dict[str, Any] | None) -> Dict[str, Any] | None:
+    async def __put(self, url: str, data: Dict[str, Any] | None,
+                    priority: OndusRequestPriority = OndusRequestPriority.NORMAL) -> Dict[str, Any] | None:
         """
         Send a PUT request to the specified URL with the given data.
 
@@ -246,20 +349,21 @@ class OndusApi:
         :type url: str
         :param data: The data to include in the request body.
         :type data: Dict[str, Any]
+        :param priority: The priority of the request in the request scheduler.
+        :type priority: OndusRequestPriority
         :return: A dictionary representing the response JSON.
         :rtype: Dict[str, Any]
+        :raises OndusApiError: If the server did not accept the request.
         """
-        await self.__update_invalid_token()
-        response = await self._session.put(url=url, json=data, headers={
-            'Authorization': f'Bearer {self.__tokens.access_token}'
-        })
+        response = await self.__send('PUT', url, data, priority)
 
         if response.status == 201:
-            return await response.json()
+            return await response.json(loads=json_loads)
         elif response.status == 200:
             return None
         else:
-            _LOGGER.warning(f'URL {url} returned status code {response.status} for PUT request')
+            response.release()
+            raise OndusApiError(f'URL {url} returned status code {response.status} for PUT request')
 
     async def login(self, username: Optional[str] = None, password: Optional[str] = None,
                     refresh_token: Optional[str] = None) -> bool:
@@ -280,19 +384,19 @@ class OndusApi:
 
         if refresh_token is not None:
             _LOGGER.debug('Login with refresh token')
-            self.__set_token(await self.__refresh_tokens(refresh_token))
+            self._auth.set_token(await self.__refresh_tokens(refresh_token))
 
         elif username is not None and password is not None:
             _LOGGER.debug('Login with username/password')
             cookie, action = await self.__get_oidc_action()
             token_url = await self.__login(action, username, password, cookie)
-            self.__set_token(await self.__get_tokens(token_url, cookie))
+            self._auth.set_token(await self.__get_tokens(token_url, cookie))
 
         else:
             _LOGGER.error('Login required.')
             raise ValueError('Invalid login parameters.')
 
-        if self.__is_access_token_valid():
+        if self._auth.is_access_token_valid():
             return True
         else:
             return False
@@ -308,7 +412,21 @@ class OndusApi:
         _LOGGER.debug('Get dashboard information')
         url = f'{self.__api_url}/dashboard'
         data = await self.__get(url)
-        return Locations.from_dict(data)
+        if data is not None:
+            # The dashboard contains the whole topology, keep it for the discovery of the next setup (e.g. a reload)
+            self._cache.set(f'{url}#topology', OndusEndpointFamily.TOPOLOGY, data)
+        return decode(Locations, data)
+
+    def get_cached_topology(self) -> Locations | None:
+        """
+        Get the locations, rooms and appliances of the last dashboard from the response cache, without a request.
+        Only the topology is meant to be used, the latest data of the appliances in it may be outdated.
+
+        :return: The locations of the last dashboard or None if there is none or it expired.
+        :rtype: Locations | None
+        """
+        cached, data = self._cache.get(f'{self.__api_url}/dashboard#topology')
+        return decode(Locations, data) if cached else None
 
     async def get_locations(self) -> List[Location]:
         """
@@ -323,7 +441,7 @@ class OndusApi:
         if data is None or not is_iteratable(data):
             return []
         else:
-            return [Location.from_dict(location) for location in data]
+            return decode_list(Location, data)
 
     async def get_rooms(self, location_id: string) -> List[Room]:
         """
@@ -340,7 +458,7 @@ class OndusApi:
         if data is None or not is_iteratable(data):
             return []
         else:
-            return [Room.from_dict(room) for room in data]
+            return decode_list(Room, data)
 
     async def get_appliances(self, location_id: string, room_id: string) -> List[Appliance]:
         """
@@ -359,7 +477,7 @@ class OndusApi:
         if data is None or not is_iteratable(data):
             return []
         else:
-            return [Appliance.from_dict(appliance) for appliance in data]
+            return decode_list(Appliance, data)
 
     async def get_appliance_info(self, location_id: string, room_id: string, appliance_id: string) -> Appliance:
         """
@@ -377,9 +495,10 @@ class OndusApi:
         _LOGGER.debug('Get appliance information for appliance %s', appliance_id)
         url = f'{self.__api_url}/locations/{location_id}/rooms/{room_id}/appliances/{appliance_id}'
         data = await self.__get(url)
-        return Appliance.from_dict(data)
+        return decode(Appliance, data)
 
-    async def get_appliance_details(self, location_id: string, room_id: string, appliance_id: string) -> Appliance:
+    async def get_appliance_details(self, location_id: string, room_id: string, appliance_id: string,
+                                    fields: Optional[Iterable[str]] = None) -> Appliance:
         """
         Get details of an appliance by location, room, and appliance IDs.
 
@@ -389,13 +508,18 @@ class OndusApi:
         :type room_id: str
         :param appliance_id: ID of the appliance to get details for.
         :type appliance_id: str
+        :param fields: (optional) Names of the Appliance fields to decode, e.g. ('last_pressure_measurement',).
+                       All other fields except the ID are set to None. Defaults to None (decode everything).
+        :type fields: Iterable[str]
         :return: Appliance object containing the details.
         :rtype: Appliance
         """
         _LOGGER.debug('Get appliance details for appliance %s', appliance_id)
         url = f'{self.__api_url}/locations/{location_id}/rooms/{room_id}/appliances/{appliance_id}/details'
         data = await self.__get(url)
-        return Appliance.from_dict(data)
+        if fields is not None:
+            return decode(Appliance, data, only={'id', *fields})
+        return decode(Appliance, data)
 
     async def get_appliance_status(self, location_id: string, room_id: string, appliance_id: string) -> List[Status]:
         """
@@ -413,9 +537,10 @@ class OndusApi:
         _LOGGER.debug('Get appliance status for appliance %s', appliance_id)
         url = f'{self.__api_url}/locations/{location_id}/rooms/{room_id}/appliances/{appliance_id}/status'
         data = await self.__get(url)
-        return [Status.from_dict(state) for state in data]
+        return decode_list(Status, data)
 
-    async def get_appliance_command(self, location_id: string, room_id: string, appliance_id: string) \
+    async def get_appliance_command(self, location_id: string, room_id: string, appliance_id: string,
+                                    priority: OndusRequestPriority = OndusRequestPriority.NORMAL) \
             -> ApplianceCommand | None:
         """
         Get possible commands for an appliance.
@@ -426,14 +551,16 @@ class OndusApi:
         :type room_id: str
         :param appliance_id: ID of the appliance to get details for.
         :type appliance_id: str
+        :param priority: The priority of the request in the request scheduler.
+        :type priority: OndusRequestPriority
         :return: The command for the specified appliance.
         :rtype: ApplianceCommand
         """
         _LOGGER.debug('Get appliance command for appliance %s', appliance_id)
         url = f'{self.__api_url}/locations/{location_id}/rooms/{room_id}/appliances/{appliance_id}/command'
-        data = await self.__get(url)
+        data = await self.__get(url, priority)
         if data is not None:
-            return ApplianceCommand.from_dict(data)
+            return decode(ApplianceCommand, data)
         else:
             return None
 
@@ -456,18 +583,7 @@ class OndusApi:
         data = await self.__get(url)
 
         if data is not None:
-            notifications = [Notification.from_dict(notification) for notification in data]
-            for notification in notifications:
-                notify_text: str = ''
-                notify_type: str = ''
-                try:
-                    notify_text = ondus_notifications['category'][notification.category]['type'][notification.type]
-                    notify_type = ondus_notifications['category'][notification.category]['text']
-                except KeyError:
-                    notify_text = f'Unknown: Category {notification.category}, Type {notification.type}'
-                finally:
-                    notification.notification_text = notify_text
-                    notification.notification_type = notify_type
+            notifications = [set_notification_text(notification) for notification in decode_list(Notification, data)]
         else:
             notifications = []
 
@@ -476,7 +592,9 @@ class OndusApi:
     async def get_appliance_data(self, location_id: string, room_id: string, appliance_id: string,
                                  from_date: Optional[datetime] = None, to_date: Optional[datetime] = None,
                                  group_by: Optional[OndusGroupByTypes] = None,
-                                 date_as_full_day: Optional[bool] = None) -> MeasurementData | None:
+                                 date_as_full_day: Optional[bool] = None,
+                                 priority: OndusRequestPriority = OndusRequestPriority.NORMAL) \
+            -> MeasurementData | None:
         """
         Retrieves aggregated data for a specific appliance within a room.
 
@@ -494,6 +612,8 @@ class OndusApi:
         :type group_by: OndusGroupByTypes
         :param date_as_full_day: 
         :type date_as_full_day: bool
+        :param priority: The priority of the request in the request scheduler.
+        :type priority: OndusRequestPriority
         :return: The aggregated measurement data for the specified appliance.
         :rtype: MeasurementData
         """
@@ -519,14 +639,16 @@ class OndusApi:
         if params:
             url += '?' + urllib.parse.urlencode(params)
 
-        data = await self.__get(url)
+        data = await self.__get(url, priority)
         if data is not None:
-            return MeasurementData.from_dict(data)
+            return decode(MeasurementData, data)
         else:
             return None
 
     async def set_appliance_command(self, location_id: string, room_id: string, appliance_id: string,
-                                    command: OndusCommands, value: bool) -> ApplianceCommand:
+                                    command: OndusCommands, value: bool,
+                                    priority: OndusRequestPriority = OndusRequestPriority.HIGH) \
+            -> ApplianceCommand | None:
         """
         This method sets the command for a specific appliance. It takes the location ID, room ID, appliance ID,
         command, and value as parameters.
@@ -541,7 +663,10 @@ class OndusApi:
         :type command: OndusCommands
         :param value: The value associated with the command.
         :type value: bool
-        :return: None
+        :param priority: The priority of the request in the request scheduler.
+        :type priority: OndusRequestPriority
+        :return: The command state returned by the API or None if the command was not accepted.
+        :rtype: ApplianceCommand | None
         """
         _LOGGER.debug('Set appliance command for appliance %s with (command: %s, value: %s)',
                       appliance_id, command.value, value)
@@ -552,9 +677,12 @@ class OndusApi:
             commands[OndusCommands.OPEN_VALVE.value] = value
 
         data = {'type': GroheTypes.GROHE_SENSE_GUARD.value, 'command': commands}
-        response = await self.__post(url, data)
+        response = await self.__post(url, data, priority)
 
-        return ApplianceCommand.from_dict(response)
+        if response is not None:
+            return decode(ApplianceCommand, response)
+        else:
+            return None
 
     async def start_pressure_measurement(self, location_id: string, room_id: string,
                                          appliance_id: string) -> PressureMeasurementStart | None:
@@ -573,42 +701,71 @@ class OndusApi:
         _LOGGER.debug('Start pressure measurement for appliance %s',appliance_id)
         url = f'{self.__api_url}/locations/{location_id}/rooms/{room_id}/appliances/{appliance_id}/pressuremeasurement'
 
-        response = await self.__post(url, None)
+        response = await self.__post(url, None, OndusRequestPriority.HIGH)
 
         if response is not None:
-            return PressureMeasurementStart.from_dict(response)
+            return decode(PressureMeasurementStart, response)
         else:
             return None
 
-    async def get_profile_notifications(self, page_size: int = 50) -> ProfileNotifications | None:
+    async def get_profile_notifications(self, page_size: int = 50,
+                                        continuation_token: str | None = None) -> ProfileNotifications | None:
         """
             Get profile notifications.
 
             :param page_size: The maximum number of notifications to retrieve per page. Default is 50.
+            :param continuation_token: (optional) The token of the previous page to get the next page.
             :return: ProfileNotifications.
         """
         _LOGGER.debug('Get latest %d notifications', page_size)
         url = f'{self.__api_url}/profile/notifications?pageSize={page_size}'
+        if continuation_token:
+            url += f'&continuationToken={urllib.parse.quote(continuation_token)}'
         data = await self.__get(url)
 
         if data is not None:
-            notifications = ProfileNotifications.from_dict(data)
+            notifications = decode(ProfileNotifications, data)
         else:
             notifications = None
 
         return notifications
 
-    async def update_profile_notification_state(self, notification_id: str, state: bool) -> None:
+    async def iter_profile_notifications(self, page_size: int = 50) -> AsyncIterator[ProfileNotification]:
         """
-            Get profile notifications.
+            Iterate over the profile notifications of all appliances, newest first. The next page is only requested
+            once the notifications of the current page are consumed, so stopping the iteration saves the requests.
+
+            :param page_size: The maximum number of notifications to retrieve per page. Default is 50.
+            :return: An async iterator over the notifications.
+            :raises OndusApiError: If a page could not be retrieved.
+        """
+        continuation_token: str | None = None
+        while True:
+            page = await self.get_profile_notifications(page_size, continuation_token)
+            if page is None:
+                raise OndusApiError('Profile notifications are not available')
+
+            for notification in page.notifications:
+                yield notification
+
+            continuation_token = page.continuation_token
+            if not continuation_token or not page.remaining_notifications or not page.notifications:
+                return
+
+    async def update_profile_notification_state(self, notification_id: str, state: bool,
+                                                priority: OndusRequestPriority = OndusRequestPriority.NORMAL) -> None:
+        """
+            Set the read state of a profile notification.
 
             :param notification_id: The unique ID of the notification to update.
             :param state: Sets the state of the notification
+            :param priority: The priority of the request in the request scheduler.
             :return: None.
+            :raises OndusApiError: If the state could not be set.
         """
         _LOGGER.debug('Set state of notification %s to %s', notification_id, state)
         url = f'{self.__api_url}/profile/notifications/{notification_id}'
         data = {'is_read': state}
-        await self.__put(url, data)
+        await self.__put(url, data, priority)
 
         return None
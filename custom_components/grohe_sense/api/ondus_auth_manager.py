@@ -0,0 +1,267 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Awaitable, List
+
+import jwt
+
+from custom_components.grohe_sense.api.ondus_exceptions import OndusAuthenticationError, OndusApiError
+from custom_components.grohe_sense.dto.ondus_dtos import OndusToken
+from custom_components.grohe_sense.dto.ondus_statistics_dtos import TokenRefreshStatistics
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class OndusAuthManager:
+    """
+    Holds the tokens of the Ondus API and keeps them valid.
+
+    Refreshes are serialized behind a lock, so concurrent callers with an expired access token share one refresh.
+    Additionally, a background task renews the access token before it expires, so requests do not have to wait for
+    a refresh.
+    """
+    __update_token_before_expiration: timedelta = timedelta(seconds=300)
+    __renew_before_invalidation: timedelta = timedelta(seconds=60)
+    __retry_failed_renewal: timedelta = timedelta(seconds=30)
+    __min_renewal_interval: timedelta = timedelta(seconds=30)
+
+    def __init__(self, refresh_tokens: Callable[[str], Awaitable[OndusToken]]) -> None:
+        self._refresh_tokens = refresh_tokens
+        self._lock = asyncio.Lock()
+        self._renewal_task: asyncio.Task | None = None
+        self._statistics = TokenRefreshStatistics()
+        self._token_listeners: List[Callable[[], None]] = []
+        self._auth_failure_listeners: List[Callable[[], None]] = []
+
+        self._tokens: OndusToken | None = None
+        self._token_update_time: datetime | None = None
+        self._access_token_expires: datetime | None = None
+        self._refresh_token_expires: datetime | None = None
+        self._user_id: str | None = None
+
+    @property
+    def access_token(self) -> str | None:
+        return self._tokens.access_token if self._tokens is not None else None
+
+    @property
+    def refresh_token(self) -> str | None:
+        return self._tokens.refresh_token if self._tokens is not None else None
+
+    @property
+    def access_token_expires(self) -> datetime | None:
+        return self._access_token_expires
+
+    @property
+    def refresh_token_expires(self) -> datetime | None:
+        return self._refresh_token_expires
+
+    @property
+    def user_id(self) -> str | None:
+        return self._user_id
+
+    @property
+    def statistics(self) -> TokenRefreshStatistics:
+        return self._statistics
+
+    def set_token(self, token: OndusToken) -> None:
+        """
+        Set the token and update the last update
+
+        :param token: The token to be set.
+        :return: None
+        """
+        self._tokens = token
+        access_token_data = jwt.decode(token.access_token, options={'verify_signature': False})
+        self._access_token_expires = datetime.fromtimestamp(int(access_token_data['exp']))
+        self._user_id = access_token_data['sub']
+
+        refresh_token_data = jwt.decode(token.refresh_token, options={'verify_signature': False})
+        self._refresh_token_expires = datetime.fromtimestamp(int(refresh_token_data['exp']))
+
+        self._token_update_time = datetime.now()
+
+        for listener in self._token_listeners:
+            listener()
+
+    def add_token_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """
+        Add a listener which is called whenever new tokens are set (login or refresh).
+
+        :param listener: The listener to be called.
+        :return: A function which removes the listener again.
+        """
+        self._token_listeners.append(listener)
+
+        def remove_listener() -> None:
+            if listener in self._token_listeners:
+                self._token_listeners.remove(listener)
+
+        return remove_listener
+
+    def add_auth_failure_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """
+        Add a listener which is called when the background renewal was rejected, so a new login is required.
+
+        :param listener: The listener to be called.
+        :return: A function which removes the listener again.
+        """
+        self._auth_failure_listeners.append(listener)
+
+        def remove_listener() -> None:
+            if listener in self._auth_failure_listeners:
+                self._auth_failure_listeners.remove(listener)
+
+        return remove_listener
+
+    def is_access_token_valid(self) -> bool:
+        """
+        Check if the access token is still valid.
+
+        :return: True if the token is valid, False otherwise.
+        :rtype: bool
+        """
+        if (self._tokens is not None and
+                self._access_token_expires is not None and
+                self._access_token_expires - self.__update_token_before_expiration > datetime.now()):
+            return True
+        else:
+            return False
+
+    def is_refresh_token_valid(self) -> bool:
+        """
+        Check if the refresh token is valid.
+
+        :return: True if the refresh token is still valid, False otherwise.
+        :rtype: bool
+        """
+        if (self._tokens is not None and
+                self._refresh_token_expires is not None and
+                self._refresh_token_expires - self.__update_token_before_expiration > datetime.now()):
+            return True
+        else:
+            return False
+
+    async def __refresh(self, proactive: bool) -> None:
+        """
+        Refresh the tokens and record the duration. Has to be called while holding the lock.
+
+        :param proactive: Whether the refresh was triggered by the background renewal.
+        :type proactive: bool
+        :return: None
+        """
+        start = time.monotonic()
+        try:
+            token = await self._refresh_tokens(self._tokens.refresh_token)
+            self.set_token(token)
+        except Exception:
+            self._statistics.failed_refresh_count += 1
+            raise
+
+        duration = time.monotonic() - start
+        self._statistics.refresh_count += 1
+        if proactive:
+            self._statistics.proactive_refresh_count += 1
+        self._statistics.last_refresh_duration = duration
+        self._statistics.total_refresh_duration += duration
+        self._statistics.max_refresh_duration = max(self._statistics.max_refresh_duration or 0.0, duration)
+        self._statistics.last_refresh = datetime.now()
+        _LOGGER.debug('Refreshed tokens in %.3f s (proactive: %s)', duration, proactive)
+
+    async def ensure_valid_token(self) -> None:
+        """
+        Update the invalid token with a new token if possible, otherwise raise an error.
+        Concurrent callers wait for the same refresh instead of starting their own.
+
+        :return: None
+        :raises OndusApiError: If there was no login yet.
+        :raises OndusAuthenticationError: If both tokens are invalid.
+        """
+        if self.is_access_token_valid():
+            return
+
+        async with self._lock:
+            # Another caller might have refreshed the token while we were waiting for the lock
+            if self.is_access_token_valid():
+                return
+
+            if self._tokens is None:
+                # E.g. entities restored from a snapshot poll before the login in the background is done
+                raise OndusApiError('Not logged in yet.')
+            elif self.is_refresh_token_valid():
+                await self.__refresh(False)
+            else:
+                _LOGGER.error('Both access token and refresh token are invalid. Please login again.')
+                raise OndusAuthenticationError('Both access token and refresh token are invalid. Please login again.')
+
+    def _get_renewal_delay(self) -> float:
+        """
+        Get the seconds until the access token should be renewed in the background. The token is renewed before it
+        is considered invalid, but not before half of its lifetime passed (and at least __min_renewal_interval), so
+        short-lived tokens are not refreshed back-to-back.
+
+        :return: The delay in seconds (0 if the renewal is already due).
+        :rtype: float
+        """
+        if self._access_token_expires is None or self._token_update_time is None:
+            return 0.0
+
+        renew_at = (self._access_token_expires - self.__update_token_before_expiration -
+                    self.__renew_before_invalidation)
+        lifetime = self._access_token_expires - self._token_update_time
+        earliest = self._token_update_time + max(lifetime / 2, self.__min_renewal_interval)
+        return max((max(renew_at, earliest) - datetime.now()).total_seconds(), 0.0)
+
+    def _notify_auth_failure(self) -> None:
+        for listener in self._auth_failure_listeners:
+            listener()
+
+    async def _renewal_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._get_renewal_delay())
+
+            async with self._lock:
+                if not self.is_refresh_token_valid():
+                    _LOGGER.warning('Refresh token expired, stopping background token renewal.')
+                    self._notify_auth_failure()
+                    return
+
+                if self._get_renewal_delay() > 0:
+                    # Token was already refreshed in the meantime
+                    continue
+
+                try:
+                    await self.__refresh(True)
+                except OndusAuthenticationError as e:
+                    _LOGGER.error('Background token renewal was rejected, a new login is required: %s', str(e))
+                    self._notify_auth_failure()
+                    return
+                except Exception as e:
+                    _LOGGER.warning('Background token renewal failed, retrying in %s: %s',
+                                    self.__retry_failed_renewal, str(e))
+                    failed = True
+                else:
+                    failed = False
+
+            if failed:
+                await asyncio.sleep(self.__retry_failed_renewal.total_seconds())
+
+    def start_renewal(self) -> None:
+        """
+        Start the background renewal of the access token.
+
+        :return: None
+        """
+        if self._renewal_task is None or self._renewal_task.done():
+            self._renewal_task = asyncio.get_running_loop().create_task(self._renewal_loop(),
+                                                                        name='Grohe Sense token renewal')
+
+    def stop_renewal(self) -> None:
+        """
+        Stop the background renewal of the access token.
+
+        :return: None
+        """
+        if self._renewal_task is not None:
+            self._renewal_task.cancel()
+            self._renewal_task = None
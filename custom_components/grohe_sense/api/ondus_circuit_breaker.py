@@ -0,0 +1,118 @@
+import logging
+import re
+import time
+from datetime import datetime, timedelta
+
+from custom_components.grohe_sense.api.ondus_exceptions import OndusCircuitOpenError
+from custom_components.grohe_sense.dto.ondus_statistics_dtos import CircuitBreakerStatistics
+from custom_components.grohe_sense.enum.ondus_types import OndusEndpointFamily, CircuitBreakerState
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = timedelta(seconds=120)
+
+# Locations, a location, its rooms, a room and the appliance list of a room
+_TOPOLOGY_PATH = re.compile(r'/locations(/[^/]+(/rooms(/[^/]+(/appliances)?)?)?)?$')
+
+
+def get_endpoint_family(url: str) -> OndusEndpointFamily:
+    """
+    Get the endpoint family of an Ondus API URL.
+
+    :param url: The URL of the request.
+    :type url: str
+    :return: The endpoint family the URL belongs to.
+    :rtype: OndusEndpointFamily
+    """
+    path = url.split('?', 1)[0]
+    if path.endswith('/dashboard'):
+        return OndusEndpointFamily.DASHBOARD
+    elif path.endswith('/data/aggregated'):
+        return OndusEndpointFamily.DATA
+    elif path.endswith('/details'):
+        return OndusEndpointFamily.DETAILS
+    elif '/notifications' in path:
+        return OndusEndpointFamily.NOTIFICATIONS
+    elif path.endswith('/command') or path.endswith('/pressuremeasurement'):
+        return OndusEndpointFamily.COMMAND
+    elif _TOPOLOGY_PATH.search(path):
+        return OndusEndpointFamily.TOPOLOGY
+    else:
+        # The status and info of single appliances and anything unknown are volatile
+        return OndusEndpointFamily.STATUS
+
+
+class OndusCircuitBreaker:
+    """
+    Circuit breaker for one endpoint family. After failure_threshold consecutive failures the circuit opens and
+    requests are rejected without being sent. After reset_timeout one trial request is let through (half open),
+    which either closes the circuit again or keeps it open for another reset_timeout.
+    """
+    def __init__(self, family: OndusEndpointFamily, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout: timedelta = DEFAULT_RESET_TIMEOUT) -> None:
+        self._family = family
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout.total_seconds()
+        self._state = CircuitBreakerState.CLOSED
+        self._opened_at: float = 0.0
+        self._trial_started: float | None = None
+        self._statistics = CircuitBreakerStatistics()
+
+    @property
+    def state(self) -> CircuitBreakerState:
+        return self._state
+
+    @property
+    def statistics(self) -> CircuitBreakerStatistics:
+        self._statistics.state = self._state.value
+        return self._statistics
+
+    def _is_trial_running(self) -> bool:
+        # A trial which did not report back (e.g. cancelled) does not block the circuit forever
+        return self._trial_started is not None and time.monotonic() - self._trial_started < self._reset_timeout
+
+    def before_request(self) -> None:
+        """
+        Check whether a request may be sent.
+
+        :return: None
+        :raises OndusCircuitOpenError: If the circuit is open.
+        """
+        if self._state == CircuitBreakerState.OPEN and time.monotonic() - self._opened_at >= self._reset_timeout:
+            _LOGGER.debug('Circuit for %s is half open, sending trial request', self._family.value)
+            self._state = CircuitBreakerState.HALF_OPEN
+            self._trial_started = None
+
+        if self._state == CircuitBreakerState.OPEN or (self._state == CircuitBreakerState.HALF_OPEN and
+                                                       self._is_trial_running()):
+            self._statistics.rejected_count += 1
+            raise OndusCircuitOpenError(f'Circuit for {self._family.value} endpoints is open')
+
+        if self._state == CircuitBreakerState.HALF_OPEN:
+            self._trial_started = time.monotonic()
+
+    def record_success(self) -> None:
+        if self._state != CircuitBreakerState.CLOSED:
+            _LOGGER.info('Circuit for %s endpoints closed again', self._family.value)
+        self._state = CircuitBreakerState.CLOSED
+        self._trial_started = None
+        self._statistics.consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        self._statistics.failure_count += 1
+        self._statistics.consecutive_failures += 1
+
+        if (self._state == CircuitBreakerState.HALF_OPEN or
+                self._statistics.consecutive_failures >= self._failure_threshold):
+            if self._state != CircuitBreakerState.OPEN:
+                _LOGGER.warning('Circuit for %s endpoints opened after %d consecutive failures',
+                                self._family.value, self._statistics.consecutive_failures)
+                self._statistics.open_count += 1
+                self._statistics.last_opened = datetime.now()
+            self._state = CircuitBreakerState.OPEN
+            self._opened_at = time.monotonic()
+            self._trial_started = None
+
+    def record_retry(self) -> None:
+        self._statistics.retry_count += 1
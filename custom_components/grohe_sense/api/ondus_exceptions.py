@@ -0,0 +1,10 @@
+class OndusAuthenticationError(ValueError):
+    """Raised if the Ondus API rejects the credentials or tokens and a new login is required."""
+
+
+class OndusApiError(Exception):
+    """Raised if a request to the Ondus API failed, even after retrying it."""
+
+
+class OndusCircuitOpenError(OndusApiError):
+    """Raised without sending a request if the endpoint family failed too often recently."""
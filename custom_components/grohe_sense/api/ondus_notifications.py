@@ -1,3 +1,15 @@
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Tuple, Iterable, Optional
+
+from custom_components.grohe_sense.dto.ondus_dtos import Notification
+from custom_components.grohe_sense.enum.ondus_types import NotificationSeverity
+
+_LOGGER = logging.getLogger(__name__)
+
+TRANSLATIONS_PATH = Path(__file__).parent.parent / 'translations' / 'notifications'
+
 ondus_notifications = {
     'category': {
         0: {
@@ -88,4 +100,115 @@ ondus_notifications = {
             },
         },
     },
-}
\ No newline at end of file
+}
+
+
+_SEVERITIES: Dict[int, NotificationSeverity] = {
+    10: NotificationSeverity.INFORMATION,
+    20: NotificationSeverity.WARNING,
+    30: NotificationSeverity.ALARM,
+}
+
+
+class NotificationCatalog:
+    """
+    Resolves notification texts from a flat table keyed by (category, type), so resolving is one dict lookup. The
+    table is built from the English texts of ondus_notifications and rebuilt once with the texts of the configured
+    language when the integration is set up. Unknown codes are logged once.
+
+    The texts of a language are read from translations/notifications/<language>.json, which has the structure of
+    ondus_notifications: {"category": {"30": {"text": "Alarm", "type": {"0": "Flooding detected ..."}}}}
+    """
+    def __init__(self, notifications: Dict = ondus_notifications) -> None:
+        self._notifications = notifications
+        self._language: str | None = None
+        self._texts: Dict[Tuple[int, int], Tuple[str, str]] = self._build({})
+        self._unknown: Dict[Tuple[int, int], Tuple[str, str]] = {}
+
+    def _build(self, translations: Dict) -> Dict[Tuple[int, int], Tuple[str, str]]:
+        texts: Dict[Tuple[int, int], Tuple[str, str]] = {}
+        for category, category_config in self._notifications['category'].items():
+            translated = translations.get(str(category), {})
+            category_text = translated.get('text', category_config['text'])
+            translated_types = translated.get('type', {})
+            for notification_type, text in category_config['type'].items():
+                texts[(category, notification_type)] = (translated_types.get(str(notification_type), text),
+                                                        category_text)
+        return texts
+
+    def load_translations(self, language: str) -> None:
+        """
+        Rebuild the table with the texts of a language, e.g. "de" or "de-CH" (falls back to "de"). Texts missing in
+        the file of the language, and all texts of languages without a file, stay English. Reads the file, so it has
+        to run in the executor.
+
+        :param language: The language of Home Assistant.
+        :type language: str
+        :return: None
+        """
+        if language == self._language:
+            return
+
+        translations: Dict = {}
+        for candidate in dict.fromkeys((language, language.split('-')[0])):
+            path = TRANSLATIONS_PATH / f'{candidate}.json'
+            if path.is_file():
+                try:
+                    translations = json.loads(path.read_text(encoding='utf-8'))['category']
+                except (OSError, ValueError, KeyError) as e:
+                    _LOGGER.warning('Could not load the Grohe notification texts of %s: %s', candidate, str(e))
+                break
+
+        self._texts = self._build(translations)
+        self._language = language
+
+    def resolve(self, category: int, notification_type: int) -> Tuple[str, str]:
+        """
+        Get the text and the category text of a notification.
+
+        :param category: The category of the notification.
+        :type category: int
+        :param notification_type: The type of the notification.
+        :type notification_type: int
+        :return: The text and the category text. Unknown codes get a generic text and an empty category text.
+        :rtype: Tuple[str, str]
+        """
+        key = (category, notification_type)
+        texts = self._texts.get(key)
+        if texts is None:
+            texts = self._unknown.get(key)
+            if texts is None:
+                _LOGGER.info('Unknown Grohe notification category %s, type %s', category, notification_type)
+                texts = (f'Unknown: Category {category}, Type {notification_type}', '')
+                self._unknown[key] = texts
+        return texts
+
+    @staticmethod
+    def severity(category: int) -> NotificationSeverity:
+        return _SEVERITIES.get(category, NotificationSeverity.OTHER)
+
+    @staticmethod
+    def latest_unread(notifications: Iterable[Notification],
+                      min_severity: NotificationSeverity = NotificationSeverity.OTHER) -> Optional[Notification]:
+        """
+        Get the latest unread notification with at least the given severity.
+
+        :param notifications: The notifications to search.
+        :type notifications: Iterable[Notification]
+        :param min_severity: The minimum severity, e.g. ALARM to get the latest unread alarm.
+        :type min_severity: NotificationSeverity
+        :return: The latest matching notification or None if there is none.
+        :rtype: Notification | None
+        """
+        latest: Notification | None = None
+        for notification in notifications:
+            if notification.is_read is not False:
+                continue
+            if min_severity and _SEVERITIES.get(notification.category, NotificationSeverity.OTHER) < min_severity:
+                continue
+            if latest is None or notification.timestamp > latest.timestamp:
+                latest = notification
+        return latest
+
+
+NOTIFICATION_CATALOG = NotificationCatalog()
@@ -0,0 +1,149 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from typing import List, Tuple
+
+from custom_components.grohe_sense.dto.ondus_statistics_dtos import RequestSchedulerStatistics
+from custom_components.grohe_sense.enum.ondus_types import OndusRequestPriority
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_REQUEST_RATE = 2.0
+DEFAULT_REQUEST_BURST = 10
+DEFAULT_RETRY_AFTER = timedelta(seconds=30)
+
+
+def parse_retry_after(value: str | None) -> float:
+    """
+    Parse the value of a Retry-After header, which is either a number of seconds or an HTTP date.
+
+    :param value: The value of the header.
+    :type value: str | None
+    :return: The number of seconds to wait. If the header is missing or invalid, DEFAULT_RETRY_AFTER is returned.
+    :rtype: float
+    """
+    if value is None:
+        return DEFAULT_RETRY_AFTER.total_seconds()
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max((retry_at - datetime.now(retry_at.tzinfo)).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        _LOGGER.debug('Could not parse Retry-After header %s', value)
+        return DEFAULT_RETRY_AFTER.total_seconds()
+
+
+class OndusRequestScheduler:
+    """
+    Paces all requests of one account with a token bucket. Requests which have to wait are queued by priority, so
+    user initiated requests are sent before background polling. After a 429/503 response the whole account is
+    paused for the time given by Retry-After. CRITICAL requests (emergency shut-off) never wait for a token, they
+    still take one from the bucket, so the following requests pay back the burst. A throttle pause is respected by
+    CRITICAL requests as well, they are sent first once it is over.
+    """
+    def __init__(self, rate: float = DEFAULT_REQUEST_RATE, burst: int = DEFAULT_REQUEST_BURST) -> None:
+        self._rate = rate
+        self._burst = burst
+        self._tokens: float = burst
+        self._last_refill = time.monotonic()
+        self._throttled_until: float = 0.0
+
+        self._queue: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._dispatcher: asyncio.Task | None = None
+        self._statistics = RequestSchedulerStatistics()
+
+    @property
+    def statistics(self) -> RequestSchedulerStatistics:
+        self._statistics.queue_depth = len(self._queue)
+        return self._statistics
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._last_refill) * self._rate)
+        self._last_refill = now
+
+    def _get_delay(self, priority: OndusRequestPriority = OndusRequestPriority.NORMAL) -> float:
+        """
+        Get the seconds until the next request with the given priority may be sent.
+
+        :param priority: The priority of the request.
+        :type priority: OndusRequestPriority
+        :return: The delay in seconds (0 if a request may be sent right now).
+        :rtype: float
+        """
+        self._refill()
+        throttle_delay = max(self._throttled_until - time.monotonic(), 0.0)
+        if priority == OndusRequestPriority.CRITICAL:
+            return throttle_delay
+        token_delay = (1 - self._tokens) / self._rate if self._tokens < 1 else 0.0
+        return max(throttle_delay, token_delay, 0.0)
+
+    def _record(self, priority: OndusRequestPriority, wait_time: float) -> None:
+        self._statistics.request_count += 1
+        self._statistics.total_wait_time += wait_time
+        self._statistics.max_wait_time = max(self._statistics.max_wait_time, wait_time)
+        self._statistics.requests_per_priority[priority.name] = (
+                self._statistics.requests_per_priority.get(priority.name, 0) + 1)
+
+    async def acquire(self, priority: OndusRequestPriority = OndusRequestPriority.NORMAL) -> None:
+        """
+        Wait until a request with the given priority may be sent.
+
+        :param priority: The priority of the request.
+        :type priority: OndusRequestPriority
+        :return: None
+        """
+        # CRITICAL requests overtake the queue, but not a throttle pause
+        if (not self._queue or priority == OndusRequestPriority.CRITICAL) and self._get_delay(priority) == 0:
+            self._refill()
+            self._tokens -= 1
+            self._record(priority, 0.0)
+            return
+
+        start = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority.value, next(self._sequence), future))
+        self._statistics.queued_request_count += 1
+        self._statistics.max_queue_depth = max(self._statistics.max_queue_depth, len(self._queue))
+
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch(),
+                                                                      name='Grohe Sense request scheduler')
+
+        await future
+        self._record(priority, time.monotonic() - start)
+
+    async def _dispatch(self) -> None:
+        while self._queue:
+            delay = self._get_delay(OndusRequestPriority(self._queue[0][0]))
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+
+            _, _, future = heapq.heappop(self._queue)
+            if not future.done():
+                self._tokens -= 1
+                future.set_result(None)
+
+    def throttle(self, retry_after: float) -> None:
+        """
+        Pause all requests, e.g. because the server answered with 429 or 503.
+
+        :param retry_after: The seconds to pause.
+        :type retry_after: float
+        :return: None
+        """
+        _LOGGER.warning('Grohe API throttled requests, pausing for %.0f s', retry_after)
+        self._throttled_until = max(self._throttled_until, time.monotonic() + retry_after)
+        self._statistics.throttle_count += 1
+        self._statistics.throttled_until = datetime.now() + timedelta(seconds=retry_after)
@@ -0,0 +1,98 @@
+import logging
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Any, Dict, Tuple
+
+from custom_components.grohe_sense.dto.ondus_statistics_dtos import ResponseCacheStatistics
+from custom_components.grohe_sense.enum.ondus_types import OndusEndpointFamily
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_TTLS: Dict[OndusEndpointFamily, timedelta] = {
+    # Locations, rooms and appliances change maybe once a month
+    OndusEndpointFamily.TOPOLOGY: timedelta(hours=24),
+}
+
+
+class OndusResponseCache:
+    """
+    Caches GET responses of the Ondus API by URL. Every endpoint family has its own time to live, families without
+    one (like data/aggregated) are not cached at all. The number of entries is bounded, the least recently used
+    entries are evicted first.
+    """
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 ttls: Dict[OndusEndpointFamily, timedelta] | None = None) -> None:
+        self._max_entries = max_entries
+        self._ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self._entries: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+        self._statistics = ResponseCacheStatistics()
+
+    @property
+    def statistics(self) -> ResponseCacheStatistics:
+        self._statistics.entries = len(self._entries)
+        return self._statistics
+
+    def is_cacheable(self, family: OndusEndpointFamily) -> bool:
+        return self._ttls.get(family) is not None
+
+    def get(self, url: str) -> Tuple[bool, Any]:
+        """
+        Get a cached response.
+
+        :param url: The URL of the request.
+        :type url: str
+        :return: A tuple whether the URL was cached and the cached data.
+        :rtype: Tuple[bool, Any]
+        """
+        entry = self._entries.get(url)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[url]
+            self._statistics.misses += 1
+            return False, None
+
+        self._entries.move_to_end(url)
+        self._statistics.hits += 1
+        return True, entry[1]
+
+    def set(self, url: str, family: OndusEndpointFamily, data: Any) -> None:
+        """
+        Cache a response if its endpoint family is cacheable.
+
+        :param url: The URL of the request.
+        :type url: str
+        :param family: The endpoint family of the URL.
+        :type family: OndusEndpointFamily
+        :param data: The response data.
+        :type data: Any
+        :return: None
+        """
+        ttl = self._ttls.get(family)
+        if ttl is None:
+            return
+
+        self._entries[url] = (time.monotonic() + ttl.total_seconds(), data)
+        self._entries.move_to_end(url)
+
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._statistics.evictions += 1
+
+    def invalidate(self, url_prefix: str | None = None) -> None:
+        """
+        Remove cached responses.
+
+        :param url_prefix: Only remove responses whose URL starts with this prefix. If None, everything is removed.
+        :type url_prefix: str | None
+        :return: None
+        """
+        if url_prefix is None:
+            self._entries.clear()
+        else:
+            for url in [url for url in self._entries if url.startswith(url_prefix)]:
+                del self._entries[url]
+
+        self._statistics.invalidations += 1
+        _LOGGER.debug('Invalidated cached responses (prefix: %s)', url_prefix)
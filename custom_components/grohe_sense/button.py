@@ -1,5 +1,5 @@
 import logging
-from typing import List
+from typing import List, Dict
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
@@ -8,7 +8,7 @@ from . import (DOMAIN)
 from .api.ondus_api import OndusApi
 from .dto.grohe_device import GroheDevice
 from .entities.grohe_sense_guard_button import GroheSenseGuardButton
-from .entities.grohe_sense_guard_valve import GroheSenseGuardValve
+from .entities.grohe_sense_update_coordinator import GroheSenseUpdateCoordinator
 from .enum.ondus_types import GroheTypes
 
 _LOGGER = logging.getLogger(__name__)
@@ -19,10 +19,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
 
     ondus_api: OndusApi = hass.data[DOMAIN]['session']
     devices: List[GroheDevice] = hass.data[DOMAIN]['devices']
+    coordinators: Dict[str, GroheSenseUpdateCoordinator] = hass.data[DOMAIN]['coordinators']
     entities = []
 
     for device in filter(lambda d: d.type == GroheTypes.GROHE_SENSE_GUARD, devices):
         if device.stripped_sw_version >= (3, 6):
-            entities.append(GroheSenseGuardButton(DOMAIN, ondus_api, device))
+            entities.append(GroheSenseGuardButton(DOMAIN, ondus_api, device, coordinators.get(device.appliance_id)))
     if entities:
         async_add_entities(entities)
@@ -1,8 +1,15 @@
 import logging
+from typing import Any, Mapping
 
 from homeassistant import config_entries
+from homeassistant.core import callback
+from homeassistant.helpers import aiohttp_client
 
-from .const import DOMAIN, CONF_PASSWORD, CONF_USERNAME
+from .api.ondus_api import OndusApi
+from .api.ondus_exceptions import OndusAuthenticationError
+from .const import DOMAIN, CONF_PASSWORD, CONF_USERNAME, CONF_INTERVAL_FLOOR, CONF_INTERVAL_CEILING, \
+    DATA_RESPONSE_CACHE
+from .entities.grohe_adaptive_interval import DEFAULT_INTERVAL_FLOOR, DEFAULT_INTERVAL_CEILING
 import voluptuous as vol
 import homeassistant.helpers.config_validation as cv
 
@@ -13,6 +20,13 @@ class GroheSenseConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
     CONNECTION_CLASS = config_entries.CONN_CLASS_CLOUD_POLL
 
+    _reauth_entry: config_entries.ConfigEntry | None = None
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: config_entries.ConfigEntry) -> config_entries.OptionsFlow:
+        return GroheSenseOptionsFlow(config_entry)
+
     async def async_step_user(self, user_input=None):
 
         if user_input is not None:
@@ -31,3 +45,71 @@ class GroheSenseConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             ),
             errors={},
         )
+
+    async def async_step_reauth(self, entry_data: Mapping[str, Any]):
+        self._reauth_entry = self.hass.config_entries.async_get_entry(self.context['entry_id'])
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(self, user_input=None):
+        errors = {}
+
+        if user_input is not None:
+            api = OndusApi(aiohttp_client.async_get_clientsession(self.hass))
+            try:
+                logged_in = await api.login(user_input[CONF_USERNAME], user_input[CONF_PASSWORD])
+            except OndusAuthenticationError:
+                errors['base'] = 'invalid_auth'
+            except Exception as e:
+                _LOGGER.error('Could not login to Grohe: %s', str(e))
+                errors['base'] = 'cannot_connect'
+            else:
+                if logged_in:
+                    if user_input[CONF_USERNAME] != self._reauth_entry.data.get(CONF_USERNAME):
+                        # The cached topology belongs to the previous account
+                        self.hass.data.get(DATA_RESPONSE_CACHE, {}).pop(self._reauth_entry.entry_id, None)
+                    return self.async_update_reload_and_abort(self._reauth_entry,
+                                                              data={**self._reauth_entry.data, **user_input})
+                errors['base'] = 'invalid_auth'
+
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_USERNAME, default=self._reauth_entry.data.get(CONF_USERNAME)): cv.string,
+                    vol.Required(CONF_PASSWORD): cv.string,
+                }
+            ),
+            errors=errors,
+        )
+
+
+class GroheSenseOptionsFlow(config_entries.OptionsFlow):
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        self._config_entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        errors = {}
+
+        if user_input is not None:
+            if user_input[CONF_INTERVAL_FLOOR] > user_input[CONF_INTERVAL_CEILING]:
+                errors['base'] = 'invalid_interval'
+            else:
+                return self.async_create_entry(title='', data=user_input)
+
+        options = self._config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_INTERVAL_FLOOR,
+                                 default=options.get(CONF_INTERVAL_FLOOR,
+                                                     int(DEFAULT_INTERVAL_FLOOR.total_seconds()))):
+                        vol.All(vol.Coerce(int), vol.Range(min=10)),
+                    vol.Required(CONF_INTERVAL_CEILING,
+                                 default=options.get(CONF_INTERVAL_CEILING,
+                                                     int(DEFAULT_INTERVAL_CEILING.total_seconds()))):
+                        vol.All(vol.Coerce(int), vol.Range(min=10)),
+                }
+            ),
+            errors=errors,
+        )
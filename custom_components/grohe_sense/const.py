@@ -2,3 +2,8 @@ DOMAIN = 'grohe_sense'
 CONF_USERNAME = 'username'
 CONF_PASSWORD = 'password'
 CONF_PLATFORM = ['sensor', 'valve', 'button']
+DEFAULT_DISCOVERY_CONCURRENCY = 10
+DATA_RESPONSE_CACHE = f'{DOMAIN}_response_cache'
+EVENT_NOTIFICATION = f'{DOMAIN}_notification'
+CONF_INTERVAL_FLOOR = 'interval_floor'
+CONF_INTERVAL_CEILING = 'interval_ceiling'
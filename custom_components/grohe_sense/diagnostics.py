@@ -0,0 +1,35 @@
+from typing import Any, Dict
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .api.ondus_api import OndusApi
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> Dict[str, Any]:
+    ondus_api: OndusApi = hass.data[DOMAIN]['session']
+    token_refresh = ondus_api.auth.statistics
+    scheduler = ondus_api.scheduler.statistics
+    cache = ondus_api.cache.statistics
+    coordinators = hass.data[DOMAIN].get('coordinators', {})
+
+    return {
+        'token_refresh': {**token_refresh.to_dict(),
+                          'average_refresh_duration': token_refresh.average_refresh_duration},
+        'request_scheduler': {**scheduler.to_dict(), 'average_wait_time': scheduler.average_wait_time},
+        'circuit_breakers': {family.value: breaker.statistics.to_dict()
+                             for family, breaker in ondus_api.circuit_breakers.items()},
+        'response_cache': {**cache.to_dict(), 'hit_ratio': cache.hit_ratio},
+        'sub_fetches': {appliance_id: {name: {**statistics.to_dict(), 'average_duration': statistics.average_duration}
+                                       for name, statistics in coordinator.fetch_statistics.items()}
+                        for appliance_id, coordinator in coordinators.items()
+                        if hasattr(coordinator, 'fetch_statistics')},
+        'poll_schedules': {appliance_id: coordinator.poll_statistics.to_dict()
+                           for appliance_id, coordinator in coordinators.items()
+                           if getattr(coordinator, 'poll_statistics', None) is not None},
+        'commands': {appliance_id: {**coordinator.command_pipeline.statistics.to_dict(),
+                                    'average_latency': coordinator.command_pipeline.statistics.average_latency}
+                     for appliance_id, coordinator in coordinators.items()
+                     if getattr(coordinator, 'command_pipeline', None) is not None},
+    }
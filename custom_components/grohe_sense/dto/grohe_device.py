@@ -1,17 +1,28 @@
+import asyncio
 import logging
-from typing import List
+from typing import List, Awaitable, TypeVar, Dict, Any
 
 from custom_components.grohe_sense.api.ondus_api import OndusApi
-from custom_components.grohe_sense.dto.ondus_dtos import Appliance
+from custom_components.grohe_sense.const import DEFAULT_DISCOVERY_CONCURRENCY
+from custom_components.grohe_sense.dto.ondus_dtos import Appliance, Locations, Location, Room
 from custom_components.grohe_sense.enum.ondus_types import GroheTypes
 
 _LOGGER = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
+_VOLATILE_APPLIANCE_FIELDS = ('params', 'error', 'state', 'last_pressure_measurement', 'command', 'notifications',
+                              'status', 'data_latest')
+
 
 class GroheDevice:
-    def __init__(self, location_id: int, room_id: int, appliance: Appliance):
+    def __init__(self, location_id: int, room_id: int, appliance: Appliance, location_name: str | None = None,
+                 room_name: str | None = None, emergency_shutdown_enable: bool | None = None):
         self._location_id = location_id
         self._room_id = room_id
+        self._location_name = location_name
+        self._room_name = room_name
+        self._emergency_shutdown_enable = emergency_shutdown_enable
         self.appliance = appliance
 
     @property
@@ -22,6 +33,19 @@ class GroheDevice:
     def room_id(self):
         return self._room_id
 
+    @property
+    def location_name(self) -> str | None:
+        return self._location_name
+
+    @property
+    def room_name(self) -> str | None:
+        return self._room_name
+
+    @property
+    def emergency_shutdown_enable(self) -> bool | None:
+        """Whether emergency shutdown is enabled for the location of the device, None if unknown."""
+        return self._emergency_shutdown_enable
+
     @property
     def appliance_id(self) -> str:
         return self.appliance.id
@@ -60,30 +84,108 @@ class GroheDevice:
         else:
             return 'Unknown'
 
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize the device, e.g. to persist the discovered topology. Volatile data of the appliance (measurements,
+        notifications, states, ...) is not included.
+
+        :return: The device as JSON serializable dict.
+        :rtype: Dict[str, Any]
+        """
+        appliance = self.appliance.to_dict()
+        for key in _VOLATILE_APPLIANCE_FIELDS:
+            appliance.pop(key, None)
+        return {'location_id': self._location_id, 'room_id': self._room_id, 'location_name': self._location_name,
+                'room_name': self._room_name, 'emergency_shutdown_enable': self._emergency_shutdown_enable,
+                'appliance': appliance}
+
     @staticmethod
-    async def get_devices(ondus_api: OndusApi) -> List['GroheDevice']:
+    def from_dict(data: Dict[str, Any]) -> 'GroheDevice':
+        """
+        Deserialize a device serialized by to_dict.
+
+        :param data: The serialized device.
+        :type data: Dict[str, Any]
+        :return: The device.
+        :rtype: GroheDevice
+        """
+        return GroheDevice(data['location_id'], data['room_id'], Appliance.from_dict(data['appliance']),
+                           data.get('location_name'), data.get('room_name'), data.get('emergency_shutdown_enable'))
+
+    @staticmethod
+    def _log_found_appliance(location: Location, room: Room, appliance: Appliance) -> None:
+        _LOGGER.debug(
+            f'Found in location {location.id} and room {room.id} the following appliance: {appliance.id} '
+            f'from type {appliance.type} with name {appliance.name}'
+        )
+
+    @staticmethod
+    def get_devices_from_locations(locations: Locations) -> List['GroheDevice']:
+        """
+        Builds all devices from an already fetched location tree (e.g. the dashboard).
+
+        :param locations: The locations including their rooms and appliances.
+        :type locations: Locations
+        :return: A list of GroheDevice objects representing the discovered devices.
+        :rtype: List[GroheDevice]
+        """
+        devices: List[GroheDevice] = []
+        for location in locations.locations:
+            for room in location.rooms or []:
+                for appliance in room.appliances or []:
+                    GroheDevice._log_found_appliance(location, room, appliance)
+                    devices.append(GroheDevice(location.id, room.id, appliance, location.name, room.name,
+                                               location.emergency_shutdown_enable))
+
+        return devices
+
+    @staticmethod
+    async def get_devices(ondus_api: OndusApi, max_concurrency: int = DEFAULT_DISCOVERY_CONCURRENCY,
+                          use_dashboard: bool = False) -> List['GroheDevice']:
         """
         Fetches all devices associated with the provided OndusApi instance.
 
+        Rooms and appliances are requested concurrently, but never more than max_concurrency requests at once.
+        With use_dashboard the whole tree is built from one dashboard request. If that fails, the tree is crawled.
+
         :param ondus_api: An instance of the OndusApi class.
         :type ondus_api: OndusApi
+        :param max_concurrency: The maximum number of concurrent requests while crawling the tree.
+        :type max_concurrency: int
+        :param use_dashboard: Build the devices from the dashboard instead of crawling locations and rooms.
+        :type use_dashboard: bool
         :return: A list of GroheDevice objects representing the discovered devices.
         :rtype: List[GroheDevice]
         """
         _LOGGER.debug(f'Getting all available Grohe devices')
-        devices: List[GroheDevice] = []
+
+        if use_dashboard:
+            try:
+                return GroheDevice.get_devices_from_locations(await ondus_api.get_dashboard())
+            except Exception as e:
+                _LOGGER.warning('Could not discover devices from dashboard, crawling locations instead: %s', str(e))
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def limited(request: Awaitable[T]) -> T:
+            async with semaphore:
+                return await request
+
+        async def get_room_devices(location: Location, room: Room) -> List[GroheDevice]:
+            appliances = await limited(ondus_api.get_appliances(location.id, room.id))
+            room_devices: List[GroheDevice] = []
+            for appliance in appliances:
+                GroheDevice._log_found_appliance(location, room, appliance)
+                room_devices.append(GroheDevice(location.id, room.id, appliance, location.name, room.name,
+                                                location.emergency_shutdown_enable))
+            return room_devices
+
+        async def get_location_devices(location: Location) -> List[GroheDevice]:
+            rooms = await limited(ondus_api.get_rooms(location.id))
+            room_devices = await asyncio.gather(*[get_room_devices(location, room) for room in rooms])
+            return [device for devices_of_room in room_devices for device in devices_of_room]
 
         locations = await ondus_api.get_locations()
+        location_devices = await asyncio.gather(*[get_location_devices(location) for location in locations])
 
-        for location in locations:
-            rooms = await ondus_api.get_rooms(location.id)
-            for room in rooms:
-                appliances = await ondus_api.get_appliances(location.id, room.id)
-                for appliance in appliances:
-                    _LOGGER.debug(
-                        f'Found in location {location.id} and room {room.id} the following appliance: {appliance.id} '
-                        f'from type {appliance.type} with name {appliance.name}'
-                    )
-                    devices.append(GroheDevice(location.id, room.id, appliance))
-
-        return devices
\ No newline at end of file
+        return [device for devices_of_location in location_devices for device in devices_of_location]
@@ -0,0 +1,228 @@
+import json
+import logging
+import types
+import typing
+from dataclasses import fields, is_dataclass, MISSING
+from typing import Any, Callable, Dict, List, Type, TypeVar, Iterable, FrozenSet, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is shipped with Home Assistant
+    orjson = None
+
+_LOGGER = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+_PRIMITIVES = (int, float, str, bool)
+
+
+def json_loads(data: str | bytes) -> Any:
+    """
+    Parse JSON with orjson if it is available, otherwise with the json module.
+
+    :param data: The JSON document.
+    :return: The parsed document.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class _Unsupported(Exception):
+    """Raised while compiling a decoder for a type which is only handled by dataclasses_json."""
+
+
+def _is_union(type_: Any) -> bool:
+    return typing.get_origin(type_) is typing.Union or isinstance(type_, types.UnionType)
+
+
+def _later_key(data: Dict[str, Any], first: str, second: str) -> str:
+    """
+    Get which of two keys was inserted later into a dict. dataclasses_json renames the keys of the payload to the
+    field names, so if the payload contains both the alias and the field name, the later one wins.
+    """
+    for key in reversed(data):
+        if key == first or key == second:
+            return key
+    return second
+
+
+class _DecoderCompiler:
+    """
+    Generates one decode function per dataclass. The generated functions build the objects exactly like
+    dataclasses_json's from_dict (field aliases, defaults, coercion of primitive values, nested dataclasses and
+    lists), but without inspecting the type hints for every single object.
+    """
+    def __init__(self) -> None:
+        self._decoders: Dict[Tuple[type, FrozenSet[str] | None], Callable[[Any], Any]] = {}
+
+    def get_decoder(self, cls: Type[T], only: FrozenSet[str] | None = None) -> Callable[[Any], T]:
+        decoder = self._decoders.get((cls, only))
+        if decoder is None:
+            try:
+                decoder = self._compile_dataclass(cls, only)
+            except _Unsupported as e:
+                if only is not None:
+                    raise ValueError(f'Projected decoding of {cls.__name__} is not supported: {e}') from e
+                _LOGGER.debug('Using dataclasses_json to decode %s: %s', cls.__name__, str(e))
+                decoder = cls.from_dict
+            self._decoders[(cls, only)] = decoder
+        return decoder
+
+    def _compile_type(self, type_: Any) -> Callable[[Any], Any] | None:
+        """
+        Compile the conversion of a (not None) value to the given type.
+
+        :return: The conversion function or None if the value is taken as it is.
+        """
+        if type_ is Any:
+            return None
+
+        if isinstance(type_, type) and is_dataclass(type_):
+            nested: List[Callable[[Any], Any]] = []
+
+            def decode_nested(value: Any, cls=type_) -> Any:
+                if is_dataclass(value):
+                    return value
+                if not nested:
+                    nested.append(self.get_decoder(cls))
+                return nested[0](value)
+
+            return decode_nested
+
+        if _is_union(type_):
+            args = typing.get_args(type_)
+            if len(args) == 2 and type(None) in args:
+                inner = self._compile_type(args[0] if args[1] is type(None) else args[1])
+                if inner is None:
+                    return None
+                return lambda value: None if value is None else inner(value)
+            if any(isinstance(arg, type) and is_dataclass(arg) for arg in args):
+                raise _Unsupported(f'Union of dataclasses {type_}')
+            return None
+
+        origin = typing.get_origin(type_)
+        if origin is list:
+            item = self._compile_type((typing.get_args(type_) or (Any,))[0])
+            if item is None:
+                return list
+            return lambda value: [item(x) for x in value]
+
+        if origin is not None:
+            raise _Unsupported(f'Generic type {type_}')
+
+        if type_ in _PRIMITIVES:
+            return lambda value, t=type_: value if isinstance(value, t) else t(value)
+
+        raise _Unsupported(f'Type {type_}')
+
+    def _compile_dataclass(self, cls: type, only: FrozenSet[str] | None = None) -> Callable[[Any], Any]:
+        if getattr(cls, 'dataclass_json_config', None):
+            raise _Unsupported('class level dataclasses_json configuration')
+        if only is not None:
+            unknown = only - {field.name for field in fields(cls)}
+            if unknown:
+                raise ValueError(f'{cls.__name__} has no fields {", ".join(sorted(unknown))}')
+
+        hints = typing.get_type_hints(cls)
+        namespace: Dict[str, Any] = {'cls': cls, 'MISSING': MISSING, '_later_key': _later_key}
+        lines = ['def decode(data):',
+                 '    if isinstance(data, cls):',
+                 '        return data']
+        args: List[str] = []
+
+        for index, field in enumerate(fields(cls)):
+            if not field.init:
+                continue
+            if field.kw_only:
+                raise _Unsupported(f'keyword only field {field.name}')
+
+            overrides = dict(field.metadata.get('dataclasses_json', {}))
+            letter_case = overrides.pop('letter_case', None)
+            if overrides.get('decoder') is not None:
+                raise _Unsupported(f'custom decoder for {field.name}')
+            key = letter_case(field.name) if letter_case is not None else field.name
+
+            var = f'v{index}'
+            if only is not None and field.name not in only:
+                # Not projected fields are neither read nor decoded
+                args.append('None')
+                continue
+            args.append(var)
+
+            if field.default is not MISSING:
+                namespace[f'default{index}'] = field.default
+                missing = f'default{index}'
+            elif field.default_factory is not MISSING:
+                namespace[f'factory{index}'] = field.default_factory
+                missing = f'factory{index}()'
+            else:
+                missing = None
+
+            if key == field.name:
+                if missing is None:
+                    lines.append(f'    {var} = data[{key!r}]')
+                else:
+                    lines.append(f'    {var} = data.get({key!r}, MISSING)')
+                    lines.append(f'    if {var} is MISSING:')
+                    lines.append(f'        {var} = {missing}')
+            else:
+                lines.append(f'    if {key!r} in data:')
+                lines.append(f'        if {field.name!r} in data:')
+                lines.append(f'            {var} = data[_later_key(data, {key!r}, {field.name!r})]')
+                lines.append(f'        else:')
+                lines.append(f'            {var} = data[{key!r}]')
+                if missing is None:
+                    lines.append(f'    else:')
+                    lines.append(f'        {var} = data[{field.name!r}]')
+                else:
+                    lines.append(f'    else:')
+                    lines.append(f'        {var} = data.get({field.name!r}, MISSING)')
+                    lines.append(f'        if {var} is MISSING:')
+                    lines.append(f'            {var} = {missing}')
+
+            field_type = hints[field.name]
+            if field_type in _PRIMITIVES:
+                # Inline the most common case, a primitive value which already has the right type
+                namespace[f'type{index}'] = field_type
+                lines.append(f'    if {var} is not None and not isinstance({var}, type{index}):')
+                lines.append(f'        {var} = type{index}({var})')
+            else:
+                convert = self._compile_type(field_type)
+                if convert is not None:
+                    namespace[f'convert{index}'] = convert
+                    lines.append(f'    if {var} is not None:')
+                    lines.append(f'        {var} = convert{index}({var})')
+
+        lines.append(f'    return cls({", ".join(args)})')
+
+        exec('\n'.join(lines), namespace)
+        return namespace['decode']
+
+
+_COMPILER = _DecoderCompiler()
+
+
+def decode(cls: Type[T], data: Any, only: Iterable[str] | None = None) -> T:
+    """
+    Decode a payload into a DTO. The result is identical to cls.from_dict(data).
+
+    :param cls: The dataclass_json DTO class.
+    :param data: The payload as parsed from JSON.
+    :param only: (optional) Names of the fields to decode. All other fields are set to None, regardless of their type.
+    :return: The decoded DTO.
+    """
+    return _COMPILER.get_decoder(cls, frozenset(only) if only is not None else None)(data)
+
+
+def decode_list(cls: Type[T], data: Iterable[Any]) -> List[T]:
+    """
+    Decode a list of payloads into DTOs. The result is identical to [cls.from_dict(item) for item in data].
+
+    :param cls: The dataclass_json DTO class.
+    :param data: The payloads as parsed from JSON.
+    :return: The decoded DTOs.
+    """
+    decoder = _COMPILER.get_decoder(cls)
+    return [decoder(item) for item in data]
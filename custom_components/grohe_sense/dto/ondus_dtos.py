@@ -3,8 +3,6 @@ from dataclasses import dataclass, field
 from dataclasses_json import dataclass_json, config
 from typing import List, Optional, Union
 
-from homeassistant.components.persistent_notification import Notification
-
 
 @dataclass_json
 @dataclass
@@ -289,7 +287,7 @@ class Appliance:
     last_pressure_measurement: Optional[LastPressureMeasurement] = None
     installer: Optional[Installer] = None
     command: Optional[Command] = None
-    notifications: Optional[List[Notification]] = None
+    notifications: Optional[List['Notification']] = None
     status: Optional[List[Status]] = None
     data_latest: Optional[DataLatest] = None
 
@@ -340,8 +338,8 @@ class Notification:
     is_read: bool
     timestamp: str
     type: int
-    threshold_quantity: str
-    threshold_type: str
+    threshold_quantity: Optional[str] = None
+    threshold_type: Optional[str] = None
     notification_text: Optional[str] = None
     notification_type: Optional[str] = None
 
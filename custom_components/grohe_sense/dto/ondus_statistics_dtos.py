@@ -0,0 +1,107 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional, Dict
+
+from dataclasses_json import dataclass_json
+
+
+@dataclass_json
+@dataclass
+class TokenRefreshStatistics:
+    refresh_count: int = 0
+    proactive_refresh_count: int = 0
+    failed_refresh_count: int = 0
+    last_refresh_duration: Optional[float] = None
+    max_refresh_duration: Optional[float] = None
+    total_refresh_duration: float = 0.0
+    last_refresh: Optional[datetime] = None
+
+    @property
+    def average_refresh_duration(self) -> float | None:
+        return self.total_refresh_duration / self.refresh_count if self.refresh_count > 0 else None
+
+
+@dataclass_json
+@dataclass
+class RequestSchedulerStatistics:
+    request_count: int = 0
+    queued_request_count: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    total_wait_time: float = 0.0
+    max_wait_time: float = 0.0
+    throttle_count: int = 0
+    throttled_until: Optional[datetime] = None
+    requests_per_priority: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def average_wait_time(self) -> float | None:
+        return self.total_wait_time / self.request_count if self.request_count > 0 else None
+
+
+@dataclass_json
+@dataclass
+class CircuitBreakerStatistics:
+    state: str = 'closed'
+    consecutive_failures: int = 0
+    failure_count: int = 0
+    retry_count: int = 0
+    rejected_count: int = 0
+    open_count: int = 0
+    last_opened: Optional[datetime] = None
+
+
+@dataclass_json
+@dataclass
+class ResponseCacheStatistics:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    entries: int = 0
+
+    @property
+    def hit_ratio(self) -> float | None:
+        return self.hits / (self.hits + self.misses) if self.hits + self.misses > 0 else None
+
+
+@dataclass_json
+@dataclass
+class SubFetchStatistics:
+    fetch_count: int = 0
+    failure_count: int = 0
+    timeout_count: int = 0
+    last_duration: Optional[float] = None
+    max_duration: Optional[float] = None
+    total_duration: float = 0.0
+
+    @property
+    def average_duration(self) -> float | None:
+        return self.total_duration / self.fetch_count if self.fetch_count > 0 else None
+
+
+@dataclass_json
+@dataclass
+class PollScheduleStatistics:
+    transmission_interval: Optional[float] = None
+    polls_per_day: float = 0.0
+    requests_per_poll: int = 0
+    requests_saved_per_day: float = 0.0
+
+
+@dataclass_json
+@dataclass
+class CommandStatistics:
+    command_count: int = 0
+    confirmed_count: int = 0
+    rollback_count: int = 0
+    timeout_count: int = 0
+    confirmation_poll_count: int = 0
+    last_latency: Optional[float] = None
+    max_latency: Optional[float] = None
+    total_latency: float = 0.0
+    last_command: Optional[datetime] = None
+
+    @property
+    def average_latency(self) -> float | None:
+        return self.total_latency / self.confirmed_count if self.confirmed_count > 0 else None
@@ -59,7 +59,7 @@ class Sensor:
 GROHE_ENTITY_CONFIG: Dict[GroheTypes, List[SensorTypes]] = {
     GroheTypes.GROHE_SENSE: [SensorTypes.TEMPERATURE,
                              SensorTypes.HUMIDITY,
-                             SensorTypes.NOTIFICATION
+                             SensorTypes.NOTIFICATION,
                              ],
     GroheTypes.GROHE_SENSE_GUARD: [SensorTypes.TEMPERATURE,
                                    SensorTypes.FLOW_RATE,
@@ -0,0 +1,47 @@
+import logging
+from datetime import timedelta
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = timedelta(seconds=300)
+DEFAULT_INTERVAL_FLOOR = timedelta(seconds=60)
+DEFAULT_INTERVAL_CEILING = timedelta(seconds=900)
+BACKOFF_FACTOR = 2
+
+
+class GroheAdaptiveInterval:
+    """
+    Polling interval which follows the activity of a device. While the device is active (water flowing, pressure
+    measurement running, unread alarm) it is polled with the floor interval. Once it is idle again, the interval
+    grows by BACKOFF_FACTOR per update until it reaches the ceiling.
+    """
+    def __init__(self, floor: timedelta = DEFAULT_INTERVAL_FLOOR, ceiling: timedelta = DEFAULT_INTERVAL_CEILING,
+                 initial: timedelta = DEFAULT_INTERVAL) -> None:
+        if floor > ceiling:
+            raise ValueError(f'Polling interval floor {floor} is above the ceiling {ceiling}')
+        self._floor = floor
+        self._ceiling = ceiling
+        self._interval = min(max(initial, floor), ceiling)
+
+    @property
+    def interval(self) -> timedelta:
+        return self._interval
+
+    def update(self, active: bool) -> timedelta:
+        """
+        Get the interval until the next update.
+
+        :param active: Whether the device showed activity in the last update.
+        :type active: bool
+        :return: The interval until the next update.
+        :rtype: timedelta
+        """
+        if active:
+            interval = self._floor
+        else:
+            interval = min(self._interval * BACKOFF_FACTOR, self._ceiling)
+
+        if interval != self._interval:
+            _LOGGER.debug('Changing polling interval from %s to %s', self._interval, interval)
+        self._interval = interval
+        return interval
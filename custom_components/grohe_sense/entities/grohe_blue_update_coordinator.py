@@ -4,23 +4,33 @@ from typing import List, Tuple
 from datetime import datetime
 
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from custom_components.grohe_sense.api.ondus_api import OndusApi
+from custom_components.grohe_sense.api.ondus_api import OndusApi, set_notification_text
+from custom_components.grohe_sense.api.ondus_notifications import NOTIFICATION_CATALOG
+from custom_components.grohe_sense.api.ondus_exceptions import OndusAuthenticationError
 from custom_components.grohe_sense.dto.grohe_coordinator_dtos import MeasurementSenseDto, CoordinatorDto, \
     MeasurementBlueDto
 from custom_components.grohe_sense.dto.grohe_device import GroheDevice
 from custom_components.grohe_sense.dto.ondus_dtos import Notification
+from custom_components.grohe_sense.entities.grohe_dashboard_update_coordinator import GroheDashboardUpdateCoordinator
+from custom_components.grohe_sense.entities.grohe_staggered_schedule import GroheStaggeredSchedule, DEFAULT_JITTER
 from custom_components.grohe_sense.enum.ondus_types import GroheTypes
 
 _LOGGER = logging.getLogger(__name__)
 
+UPDATE_INTERVAL = timedelta(seconds=300)
+
 
 class GroheBlueUpdateCoordinator(DataUpdateCoordinator):
-    def __init__(self, hass: HomeAssistant, device: GroheDevice, api: OndusApi) -> None:
-        super().__init__(hass, _LOGGER, name='Grohe Blue', update_interval=timedelta(seconds=300), always_update=True)
+    def __init__(self, hass: HomeAssistant, device: GroheDevice, api: OndusApi,
+                 dashboard: GroheDashboardUpdateCoordinator | None = None, jitter: timedelta = DEFAULT_JITTER) -> None:
+        super().__init__(hass, _LOGGER, name='Grohe Blue', update_interval=UPDATE_INTERVAL, always_update=True)
+        self._staggered_schedule = GroheStaggeredSchedule(device.appliance_id, jitter)
         self._api = api
         self._device = device
+        self._dashboard = dashboard
         self._last_update = datetime.now()
         self._notifications: List[Notification] = []
 
@@ -36,17 +46,21 @@ class GroheBlueUpdateCoordinator(DataUpdateCoordinator):
         notification: str = 'No notification'
         measurement: MeasurementBlueDto | None = None
 
-        details = await self._api.get_appliance_details(self._device.location_id, self._device.room_id,
-                                                        self._device.appliance_id)
+        details = None
+        if self._dashboard is not None:
+            details = await self._dashboard.get_appliance(self._device.appliance_id)
+
+        if details is None:
+            details = await self._api.get_appliance_details(self._device.location_id, self._device.room_id,
+                                                            self._device.appliance_id,
+                                                            fields=('notifications', 'data_latest'))
 
         _LOGGER.debug(f'Got the following details for Grohe Blue appliance {self._device.appliance_id}: {details}')
 
         if details.notifications is not None:
-            details.notifications.sort(key=lambda n: n.timestamp, reverse=True)
-            notifications = [notify for notify in details.notifications if notify.is_read is False]
-
-            if len(notifications) > 0:
-                notification = f'{notifications[0].notification_text}'
+            latest = NOTIFICATION_CATALOG.latest_unread(details.notifications)
+            if latest is not None:
+                notification = f'{set_notification_text(latest).notification_text}'
 
         if details.data_latest.measurement is not None:
             measurement = MeasurementBlueDto.from_dict(details.data_latest.measurement.to_dict())
@@ -60,7 +74,10 @@ class GroheBlueUpdateCoordinator(DataUpdateCoordinator):
             data.measurement, data.notification = await self._get_measurement_and_notification()
 
             self._last_update = datetime.now()
+            self.update_interval = self._staggered_schedule.align(UPDATE_INTERVAL)
             return data
 
+        except OndusAuthenticationError as e:
+            raise ConfigEntryAuthFailed(str(e)) from e
         except Exception as e:
-            _LOGGER.error("Error updating Grohe Blue data: %s", str(e))
+            raise UpdateFailed(f'Error updating Grohe Blue data: {e}') from e
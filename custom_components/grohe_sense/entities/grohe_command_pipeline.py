@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import time
+from datetime import timedelta, datetime
+from typing import Callable
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from custom_components.grohe_sense.api.ondus_api import OndusApi
+from custom_components.grohe_sense.api.ondus_exceptions import OndusApiError
+from custom_components.grohe_sense.dto.grohe_coordinator_dtos import CoordinatorDto
+from custom_components.grohe_sense.dto.grohe_device import GroheDevice
+from custom_components.grohe_sense.dto.ondus_dtos import Command
+from custom_components.grohe_sense.dto.ondus_statistics_dtos import CommandStatistics
+from custom_components.grohe_sense.enum.ondus_types import OndusCommands, OndusRequestPriority
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CONFIRMATION_TIMEOUT = timedelta(seconds=60)
+DEFAULT_CONFIRMATION_DELAY = timedelta(seconds=1)
+DEFAULT_CONFIRMATION_MAX_DELAY = timedelta(seconds=10)
+BACKOFF_FACTOR = 2
+
+
+class GroheCommandPipeline:
+    """
+    Sends valve commands to a Sense Guard. The requested valve state is shown optimistically right away, then the
+    physical valve state is confirmed by polling the command endpoint with a short backoff. If the valve does not
+    reach the requested state within the confirmation timeout, the optimistic state is rolled back. In both cases
+    the coordinator refreshes the device shortly after, so that the state of the dashboard is not taken over.
+    """
+    def __init__(self, hass: HomeAssistant, device: GroheDevice, api: OndusApi,
+                 coordinator: DataUpdateCoordinator[CoordinatorDto], schedule_refresh: Callable[[], None],
+                 confirmation_timeout: timedelta = DEFAULT_CONFIRMATION_TIMEOUT,
+                 confirmation_delay: timedelta = DEFAULT_CONFIRMATION_DELAY,
+                 confirmation_max_delay: timedelta = DEFAULT_CONFIRMATION_MAX_DELAY) -> None:
+        self._hass = hass
+        self._device = device
+        self._api = api
+        self._coordinator = coordinator
+        self._schedule_refresh = schedule_refresh
+        self._confirmation_timeout = confirmation_timeout
+        self._confirmation_delay = confirmation_delay
+        self._confirmation_max_delay = confirmation_max_delay
+        self._pending_valve_open: bool | None = None
+        self._confirmation: asyncio.Task | None = None
+        self._statistics = CommandStatistics()
+
+    @property
+    def pending_valve_open(self) -> bool | None:
+        """The requested valve state while it is not confirmed yet, None otherwise."""
+        return self._pending_valve_open
+
+    @property
+    def statistics(self) -> CommandStatistics:
+        return self._statistics
+
+    async def async_set_valve(self, valve_open: bool,
+                              priority: OndusRequestPriority = OndusRequestPriority.HIGH) -> None:
+        """
+        Open or close the valve. Returns once the command is accepted by the API, the confirmation of the physical
+        valve state continues in the background.
+
+        :param valve_open: True to open the valve, False to close it.
+        :type valve_open: bool
+        :param priority: The priority of the command in the request scheduler.
+        :type priority: OndusRequestPriority
+        :return: None
+        :raises OndusApiError: If the command was not accepted. The optimistic state is rolled back in this case.
+        """
+        previous = self._coordinator.data.command if self._coordinator.data is not None else None
+        self.cancel()
+
+        started = time.monotonic()
+        self._statistics.command_count += 1
+        self._statistics.last_command = datetime.now().astimezone()
+        self._pending_valve_open = valve_open
+        self._coordinator.async_update_listeners()
+
+        try:
+            response = await self._api.set_appliance_command(self._device.location_id, self._device.room_id,
+                                                             self._device.appliance_id, OndusCommands.OPEN_VALVE,
+                                                             valve_open, priority)
+        except Exception:
+            self._rollback(previous)
+            raise
+
+        if response is None:
+            self._rollback(previous)
+            raise OndusApiError(f'Valve command for appliance {self._device.appliance_id} was not accepted')
+
+        self._confirmation = self._hass.async_create_background_task(
+            self._async_confirm(valve_open, previous, started),
+            f'Grohe Sense valve confirmation {self._device.appliance_id}')
+
+    def cancel(self) -> None:
+        """
+        Stop confirming the last command, e.g. because a new one is sent or the integration is unloaded.
+
+        :return: None
+        """
+        if self._confirmation is not None and not self._confirmation.done():
+            self._confirmation.cancel()
+        self._confirmation = None
+        self._pending_valve_open = None
+
+    async def _async_confirm(self, valve_open: bool, previous: Command | None, started: float) -> None:
+        deadline = started + self._confirmation_timeout.total_seconds()
+        delay = self._confirmation_delay.total_seconds()
+        last_known = previous
+
+        while True:
+            await asyncio.sleep(max(min(delay, deadline - time.monotonic()), 0))
+            self._statistics.confirmation_poll_count += 1
+            try:
+                response = await self._api.get_appliance_command(self._device.location_id, self._device.room_id,
+                                                                 self._device.appliance_id, OndusRequestPriority.HIGH)
+            except Exception as e:
+                _LOGGER.debug('Could not get valve state of appliance %s: %s', self._device.appliance_id, str(e))
+                response = None
+
+            if response is not None and response.command is not None:
+                last_known = response.command
+                if response.command.valve_open == valve_open:
+                    self._confirm(response.command, started)
+                    return
+
+            if time.monotonic() >= deadline:
+                _LOGGER.warning('Valve of appliance %s did not %s within %s, rolling back', self._device.appliance_id,
+                                'open' if valve_open else 'close', self._confirmation_timeout)
+                self._statistics.timeout_count += 1
+                self._rollback(last_known)
+                return
+
+            delay = min(delay * BACKOFF_FACTOR, self._confirmation_max_delay.total_seconds())
+
+    def _confirm(self, command: Command, started: float) -> None:
+        latency = time.monotonic() - started
+        _LOGGER.debug('Valve state of appliance %s confirmed after %.1fs', self._device.appliance_id, latency)
+
+        self._statistics.confirmed_count += 1
+        self._statistics.last_latency = latency
+        self._statistics.total_latency += latency
+        if self._statistics.max_latency is None or latency > self._statistics.max_latency:
+            self._statistics.max_latency = latency
+
+        self._pending_valve_open = None
+        self._confirmation = None
+        self._set_command(command)
+
+    def _rollback(self, command: Command | None) -> None:
+        self._statistics.rollback_count += 1
+        self._pending_valve_open = None
+        self._confirmation = None
+        self._set_command(command)
+
+    def _set_command(self, command: Command | None) -> None:
+        if command is not None and self._coordinator.data is not None:
+            self._coordinator.data.command = command
+        self._coordinator.async_update_listeners()
+        self._schedule_refresh()
@@ -0,0 +1,26 @@
+from typing import Any, Dict
+
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from custom_components.grohe_sense.entities.grohe_sense_update_coordinator import GroheSenseUpdateCoordinator
+
+ATTR_POLL_INTERVAL = 'poll_interval'
+
+
+class GroheCoordinatorEntity(CoordinatorEntity):
+    """
+    Coordinator entity which takes over the data of its coordinator as soon as it is added. The first refresh of the
+    coordinators already ran during setup, so the entity does not wait for the next update to get its state.
+
+    The entities of a Sense or Sense Guard carry the current polling interval of their device as attribute.
+    """
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        if self.coordinator.data is not None:
+            self._handle_coordinator_update()
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any] | None:
+        if isinstance(self.coordinator, GroheSenseUpdateCoordinator):
+            return {ATTR_POLL_INTERVAL: self.coordinator.poll_interval.total_seconds()}
+        return None
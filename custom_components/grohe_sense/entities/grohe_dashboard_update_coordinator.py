@@ -0,0 +1,101 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from custom_components.grohe_sense.api.ondus_api import OndusApi
+from custom_components.grohe_sense.api.ondus_exceptions import OndusAuthenticationError
+from custom_components.grohe_sense.dto.ondus_dtos import Appliance, Locations
+
+_LOGGER = logging.getLogger(__name__)
+
+DASHBOARD_MAX_AGE = timedelta(seconds=60)
+
+
+class GroheDashboardUpdateCoordinator(DataUpdateCoordinator):
+    """
+    Account wide coordinator which fetches the whole dashboard (locations, rooms and appliances including their latest
+    data) with one request. It has no own update interval, instead the appliance coordinators request their slice
+    and the dashboard is only fetched again if the cached one is older than max_age.
+    """
+    def __init__(self, hass: HomeAssistant, api: OndusApi, max_age: timedelta = DASHBOARD_MAX_AGE) -> None:
+        super().__init__(hass, _LOGGER, name='Grohe Dashboard', update_interval=None, always_update=True)
+        self._api = api
+        self._max_age = max_age
+        self._lock = asyncio.Lock()
+        self._last_fetch: datetime | None = None
+        self._appliances: Dict[str, Appliance] = {}
+
+    def invalidate(self) -> None:
+        """
+        Fetch the dashboard again on the next request, e.g. because a command changed the state of an appliance.
+
+        :return: None
+        """
+        self._last_fetch = None
+
+    def _is_outdated(self) -> bool:
+        return self._last_fetch is None or datetime.now() - self._last_fetch > self._max_age
+
+    async def _ensure_current(self) -> bool:
+        """
+        Fetch the dashboard again if it is outdated. Concurrent callers share one fetch.
+
+        :return: True if a current dashboard is available, False otherwise.
+        :rtype: bool
+        """
+        async with self._lock:
+            if self._is_outdated():
+                await self.async_refresh()
+                # Also set on failures, so that a failing dashboard is not requested by every appliance coordinator
+                self._last_fetch = datetime.now()
+
+        return self.last_update_success and self.data is not None
+
+    async def get_locations(self) -> Locations | None:
+        """
+        Get the whole dashboard. If the dashboard is outdated, it is fetched again.
+
+        :return: The locations of the dashboard or None if the dashboard is not available.
+        :rtype: Locations | None
+        """
+        if not await self._ensure_current():
+            return None
+
+        return self.data
+
+    async def get_appliance(self, appliance_id: str) -> Appliance | None:
+        """
+        Get the dashboard slice of a single appliance. If the dashboard is outdated, it is fetched again.
+
+        :param appliance_id: ID of the appliance to get the dashboard data for.
+        :type appliance_id: str
+        :return: The appliance from the dashboard or None if the dashboard is not available or does not contain it.
+        :rtype: Appliance | None
+        """
+        if not await self._ensure_current():
+            return None
+
+        return self._appliances.get(appliance_id)
+
+    async def _async_update_data(self) -> Locations:
+        _LOGGER.debug('Updating Grohe dashboard')
+        try:
+            dashboard = await self._api.get_dashboard()
+        except OndusAuthenticationError as e:
+            raise ConfigEntryAuthFailed(str(e)) from e
+        except Exception as e:
+            raise UpdateFailed(f'Error updating Grohe dashboard: {e}') from e
+
+        appliances: Dict[str, Appliance] = {}
+        for location in dashboard.locations:
+            for room in location.rooms or []:
+                for appliance in room.appliances or []:
+                    appliances[appliance.id] = appliance
+
+        self._appliances = appliances
+        return dashboard
@@ -0,0 +1,121 @@
+import logging
+from collections import OrderedDict
+from typing import Dict, Iterable, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.grohe_sense.const import DOMAIN, EVENT_NOTIFICATION
+from custom_components.grohe_sense.dto.grohe_device import GroheDevice
+from custom_components.grohe_sense.dto.ondus_dtos import Notification
+from custom_components.grohe_sense.storage.grohe_notification_store import GroheNotificationStore
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_SEEN = 1000
+
+
+class GroheNotificationEvents:
+    """
+    Fires a grohe_sense_notification event for every new unread notification. The IDs of the notifications already
+    fired are kept in a bounded LRU, which is persisted, so every notification fires exactly once. If nothing was
+    persisted yet (first start), no event is fired until the IDs are primed with the notifications of the whole
+    account, so the existing backlog does not fire a burst of events. Notifications dispatched before are only
+    recorded.
+    """
+    def __init__(self, hass: HomeAssistant, store: GroheNotificationStore, devices: Iterable[GroheDevice],
+                 max_seen: int = DEFAULT_MAX_SEEN) -> None:
+        self._hass = hass
+        self._store = store
+        self._devices: Dict[str, GroheDevice] = {device.appliance_id: device for device in devices}
+        self._max_seen = max_seen
+        self._seen: OrderedDict[str, None] = OrderedDict()
+        self._primed = False
+
+    async def async_load(self) -> None:
+        """
+        Load the IDs of the already fired notifications.
+
+        :return: None
+        """
+        seen = await self._store.async_load()
+        if seen is not None:
+            self._seen = OrderedDict.fromkeys(seen[-self._max_seen:])
+            self._primed = True
+
+    @property
+    def primed(self) -> bool:
+        return self._primed
+
+    @callback
+    def async_prime(self, notifications: Iterable[Notification]) -> None:
+        """
+        Record the notifications of a full sync of the account without firing events.
+
+        :param notifications: All notifications of the account.
+        :type notifications: Iterable[Notification]
+        :return: None
+        """
+        for notification in notifications:
+            if notification.is_read is False:
+                self._remember(notification.id)
+        self._primed = True
+        self._store.async_delay_save(lambda: list(self._seen))
+        _LOGGER.debug('Primed Grohe notification events with %d notifications', len(self._seen))
+
+    def _remember(self, notification_id: str) -> bool:
+        """
+        Remember a notification ID.
+
+        :return: True if the ID is new, False if it was seen already.
+        """
+        if notification_id in self._seen:
+            self._seen.move_to_end(notification_id)
+            return False
+
+        self._seen[notification_id] = None
+        if len(self._seen) > self._max_seen:
+            self._seen.popitem(last=False)
+        return True
+
+    @callback
+    def async_dispatch(self, notifications: Iterable[Notification]) -> int:
+        """
+        Fire an event for every new unread notification. Until the events are primed, the notifications are only
+        recorded.
+
+        :param notifications: The notifications with resolved texts.
+        :type notifications: Iterable[Notification]
+        :return: The number of fired events.
+        :rtype: int
+        """
+        fired = 0
+        changed = False
+        for notification in notifications:
+            if notification.is_read is not False or not self._remember(notification.id):
+                continue
+            changed = True
+            if self._primed:
+                self._hass.bus.async_fire(EVENT_NOTIFICATION, self._get_event_data(notification))
+                fired += 1
+
+        if changed:
+            self._store.async_delay_save(lambda: list(self._seen))
+        if fired:
+            _LOGGER.debug('Fired %d Grohe notification events', fired)
+        return fired
+
+    def _get_event_data(self, notification: Notification) -> Dict[str, Any]:
+        device = self._devices.get(notification.appliance_id)
+        device_entry = dr.async_get(self._hass).async_get_device(identifiers={(DOMAIN, notification.appliance_id)})
+        return {
+            'notification_id': notification.id,
+            'appliance_id': notification.appliance_id,
+            'appliance_name': device.name if device is not None else None,
+            'device_id': device_entry.id if device_entry is not None else None,
+            'category': notification.category,
+            'category_text': notification.notification_type,
+            'type': notification.type,
+            'text': notification.notification_text,
+            'timestamp': notification.timestamp,
+        }
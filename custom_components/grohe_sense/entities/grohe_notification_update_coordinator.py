@@ -0,0 +1,232 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Set
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from custom_components.grohe_sense.api.ondus_api import OndusApi, set_notification_text
+from custom_components.grohe_sense.api.ondus_exceptions import OndusAuthenticationError
+from custom_components.grohe_sense.dto.ondus_dtos import Notification, ProfileNotification
+from custom_components.grohe_sense.entities.grohe_notification_events import GroheNotificationEvents
+from custom_components.grohe_sense.enum.ondus_types import OndusRequestPriority
+
+_LOGGER = logging.getLogger(__name__)
+
+NOTIFICATIONS_MAX_AGE = timedelta(seconds=60)
+NOTIFICATIONS_UPDATE_INTERVAL = timedelta(minutes=5)
+FULL_SYNC_INTERVAL = timedelta(hours=1)
+FULL_SYNC_MAX_PAGES = 10
+PAGE_SIZE = 50
+MAX_NOTIFICATIONS_PER_APPLIANCE = 100
+MARK_READ_PROGRESS_STEP = 50
+
+
+def _convert_profile_notification(notification: ProfileNotification) -> Notification:
+    """
+    Convert a profile notification into the appliance notification format, including its resolved texts.
+
+    :param notification: The profile notification.
+    :type notification: ProfileNotification
+    :return: The appliance notification.
+    :rtype: Notification
+    """
+    # The profile notifications contain the timestamp in milliseconds, the appliance notifications as ISO string
+    seconds = notification.timestamp / 1000 if notification.timestamp > 10 ** 11 else notification.timestamp
+    timestamp = datetime.fromtimestamp(seconds, tz=timezone.utc).isoformat(timespec='milliseconds')
+    return set_notification_text(Notification(appliance_id=notification.appliance_id,
+                                              id=notification.notification_id,
+                                              category=notification.category,
+                                              is_read=notification.is_read,
+                                              timestamp=timestamp,
+                                              type=notification.notification_type))
+
+
+class GroheNotificationUpdateCoordinator(DataUpdateCoordinator):
+    """
+    Account wide coordinator which syncs the notifications of all appliances from the profile notifications. Only
+    the pages with new notifications are requested, the iteration stops at the first already known notification.
+    Once every FULL_SYNC_INTERVAL the index is rebuilt from scratch to pick up notifications read in the app. The
+    sync runs on its own update interval (while it has listeners), so the events of new notifications do not depend
+    on the polling of the appliances. The appliance coordinators request their notifications in between, the sync
+    only runs again for them once it is older than max_age. New unread notifications fire their events right from
+    the sync, before the appliance coordinators and their entities are updated.
+    """
+    def __init__(self, hass: HomeAssistant, api: OndusApi, events: GroheNotificationEvents | None = None,
+                 max_age: timedelta = NOTIFICATIONS_MAX_AGE,
+                 full_sync_interval: timedelta = FULL_SYNC_INTERVAL,
+                 update_interval: timedelta = NOTIFICATIONS_UPDATE_INTERVAL) -> None:
+        super().__init__(hass, _LOGGER, name='Grohe Notifications', update_interval=update_interval,
+                         always_update=True)
+        self._api = api
+        self._events = events
+        self._max_age = max_age
+        self._full_sync_interval = full_sync_interval
+        self._lock = asyncio.Lock()
+        self._last_fetch: datetime | None = None
+        self._last_full_sync: datetime | None = None
+        self._index: Dict[str, Dict[str, Notification]] = {}
+
+    def _is_outdated(self) -> bool:
+        return self._last_fetch is None or datetime.now() - self._last_fetch > self._max_age
+
+    async def _ensure_current(self) -> bool:
+        """
+        Sync the notifications again if they are outdated. Concurrent callers share one sync.
+
+        :return: True if current notifications are available, False otherwise.
+        :rtype: bool
+        """
+        if self._is_outdated():
+            await self.async_refresh()
+
+        return self.last_update_success and self.data is not None
+
+    async def get_notifications(self, appliance_id: str) -> List[Notification] | None:
+        """
+        Get the notifications of a single appliance. If the notifications are outdated, they are synced again.
+
+        :param appliance_id: ID of the appliance to get the notifications for.
+        :type appliance_id: str
+        :return: The notifications of the appliance or None if the notifications are not available.
+        :rtype: List[Notification] | None
+        """
+        if not await self._ensure_current():
+            return None
+
+        return list(self._index.get(appliance_id, {}).values())
+
+    def async_dispatch(self, notifications: List[Notification]) -> None:
+        """
+        Fire the events of notifications which were not received by the sync, e.g. from the dashboard.
+
+        :param notifications: The notifications with resolved texts.
+        :type notifications: List[Notification]
+        :return: None
+        """
+        if self._events is not None:
+            self._events.async_dispatch(notifications)
+
+    async def async_find_unread(self, appliance_ids: Set[str] | None = None, categories: Set[int] | None = None,
+                                older_than: datetime | None = None) -> List[Notification]:
+        """
+        Page through all profile notifications and collect the unread ones, independent of the bounded index.
+
+        :param appliance_ids: (optional) Only collect the notifications of these appliances.
+        :type appliance_ids: Set[str] | None
+        :param categories: (optional) Only collect the notifications of these categories.
+        :type categories: Set[int] | None
+        :param older_than: (optional) Only collect the notifications older than this point in time.
+        :type older_than: datetime | None
+        :return: The matching unread notifications.
+        :rtype: List[Notification]
+        """
+        unread: List[Notification] = []
+        async for profile_notification in self._api.iter_profile_notifications(PAGE_SIZE):
+            if profile_notification.is_read:
+                continue
+            if appliance_ids is not None and profile_notification.appliance_id not in appliance_ids:
+                continue
+            if categories is not None and profile_notification.category not in categories:
+                continue
+            notification = _convert_profile_notification(profile_notification)
+            if older_than is not None and datetime.fromisoformat(notification.timestamp) >= older_than:
+                continue
+            unread.append(notification)
+        return unread
+
+    async def async_mark_read(self, notifications: List[Notification]) -> Dict[str, str]:
+        """
+        Mark notifications as read. The requests run concurrently with LOW priority, so the request scheduler paces
+        them behind the regular polling. The index is updated optimistically and reverted for the failed ones.
+
+        :param notifications: The notifications to mark as read.
+        :type notifications: List[Notification]
+        :return: The error by notification ID of the notifications which could not be marked as read.
+        :rtype: Dict[str, str]
+        """
+        self._set_read(notifications, True)
+        failures: Dict[str, str] = {}
+        done = 0
+
+        async def mark_read(notification: Notification) -> None:
+            nonlocal done
+            try:
+                await self._api.update_profile_notification_state(notification.id, True, OndusRequestPriority.LOW)
+            except Exception as e:
+                failures[notification.id] = str(e)
+            done += 1
+            if done % MARK_READ_PROGRESS_STEP == 0:
+                _LOGGER.info('Marked %d of %d Grohe notifications as read (%d failed)', done, len(notifications),
+                             len(failures))
+
+        await asyncio.gather(*[mark_read(notification) for notification in notifications])
+
+        if failures:
+            self._set_read([notification for notification in notifications if notification.id in failures], False)
+        _LOGGER.info('Marked %d of %d Grohe notifications as read', len(notifications) - len(failures),
+                     len(notifications))
+        return failures
+
+    def _set_read(self, notifications: List[Notification], is_read: bool) -> None:
+        for notification in notifications:
+            indexed = self._index.get(notification.appliance_id, {}).get(notification.id)
+            if indexed is not None:
+                indexed.is_read = is_read
+
+    async def _async_update_data(self) -> Dict[str, Dict[str, Notification]]:
+        # The syncs of the update interval and the ones requested by the appliance coordinators share the index, so
+        # only one runs at a time
+        async with self._lock:
+            if not self._is_outdated():
+                # Another sync finished while this one was waiting
+                if not self.last_update_success:
+                    raise UpdateFailed('Grohe notifications are not available')
+                return self._index
+
+            # Also set on failures, so that a failing sync is not repeated by every appliance coordinator
+            self._last_fetch = datetime.now()
+            return await self._async_sync()
+
+    async def _async_sync(self) -> Dict[str, Dict[str, Notification]]:
+        full_sync = (self._last_full_sync is None or
+                     datetime.now() - self._last_full_sync > self._full_sync_interval)
+        _LOGGER.debug('Syncing Grohe notifications (full sync: %s)', full_sync)
+
+        index: Dict[str, Dict[str, Notification]] = {} if full_sync else self._index
+        new_notifications: List[Notification] = []
+        try:
+            async for notification in self._api.iter_profile_notifications(PAGE_SIZE):
+                if full_sync:
+                    if len(new_notifications) >= FULL_SYNC_MAX_PAGES * PAGE_SIZE:
+                        break
+                elif notification.notification_id in index.get(notification.appliance_id, {}):
+                    break
+                new_notifications.append(_convert_profile_notification(notification))
+        except OndusAuthenticationError as e:
+            raise ConfigEntryAuthFailed(str(e)) from e
+        except Exception as e:
+            raise UpdateFailed(f'Error syncing Grohe notifications: {e}') from e
+
+        # The pages are ordered newest first, so the notifications are handled oldest first to keep the order
+        new_notifications.reverse()
+        if self._events is not None:
+            if full_sync and not self._events.primed:
+                self._events.async_prime(new_notifications)
+            else:
+                self._events.async_dispatch(new_notifications)
+
+        for notification in new_notifications:
+            notifications = index.setdefault(notification.appliance_id, {})
+            notifications[notification.id] = notification
+            if len(notifications) > MAX_NOTIFICATIONS_PER_APPLIANCE:
+                del notifications[next(iter(notifications))]
+
+        if full_sync:
+            self._last_full_sync = datetime.now()
+        _LOGGER.debug('Synced %d new Grohe notifications', len(new_notifications))
+
+        self._index = index
+        return index
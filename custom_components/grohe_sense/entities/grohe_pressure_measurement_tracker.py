@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import time
+from datetime import timedelta, datetime
+from typing import Callable
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from custom_components.grohe_sense.api.ondus_api import OndusApi
+from custom_components.grohe_sense.dto.grohe_coordinator_dtos import CoordinatorDto, LastPressureMeasurement
+from custom_components.grohe_sense.dto.grohe_device import GroheDevice
+from custom_components.grohe_sense.dto.ondus_dtos import Appliance, PressureMeasurementStart
+from custom_components.grohe_sense.enum.ondus_types import PressureMeasurementState
+
+_LOGGER = logging.getLogger(__name__)
+
+MIN_POLL_INTERVAL = timedelta(seconds=10)
+OVERDUE_POLL_INTERVAL = timedelta(seconds=15)
+DEFAULT_MAX_DURATION = timedelta(minutes=15)
+
+
+class GrohePressureMeasurementTracker:
+    """
+    Follows a pressure measurement started on a Sense Guard. While the measurement is running, the appliance details
+    are polled at its estimated time of completion (and every OVERDUE_POLL_INTERVAL once it is overdue), so the
+    result is pushed to the entities as soon as it is available instead of with the next regular update.
+    """
+    def __init__(self, hass: HomeAssistant, device: GroheDevice, api: OndusApi,
+                 coordinator: DataUpdateCoordinator[CoordinatorDto],
+                 convert: Callable[[Appliance | None], LastPressureMeasurement | None],
+                 max_duration: timedelta = DEFAULT_MAX_DURATION) -> None:
+        self._hass = hass
+        self._device = device
+        self._api = api
+        self._coordinator = coordinator
+        self._convert = convert
+        self._max_duration = max_duration
+        self._measurement_id: str | None = None
+        self._result: LastPressureMeasurement | None = None
+        self._tracking: asyncio.Task | None = None
+
+    @property
+    def measurement_id(self) -> str | None:
+        """The ID of the tracked measurement while it is running, None otherwise."""
+        return self._measurement_id
+
+    @property
+    def active(self) -> bool:
+        return self._tracking is not None and not self._tracking.done()
+
+    async def async_start(self) -> PressureMeasurementStart | None:
+        """
+        Start a pressure measurement and track it in the background until it completed.
+
+        :return: The response of the API or None if the measurement was not started.
+        :rtype: PressureMeasurementStart | None
+        """
+        response = await self._api.start_pressure_measurement(self._device.location_id, self._device.room_id,
+                                                              self._device.appliance_id)
+        if response is None or not response.fields:
+            _LOGGER.warning('Pressure measurement of %s did not return a measurement ID: %s', self._device.name,
+                            response)
+            return response
+
+        self.cancel()
+        self._measurement_id = response.fields[0].id
+        _LOGGER.debug('Tracking pressure measurement %s of appliance %s', self._measurement_id,
+                      self._device.appliance_id)
+        self._tracking = self._hass.async_create_background_task(
+            self._async_track(self._measurement_id),
+            f'Grohe Sense pressure measurement {self._device.appliance_id}')
+        return response
+
+    def cancel(self) -> None:
+        """
+        Stop tracking the running measurement.
+
+        :return: None
+        """
+        if self._tracking is not None and not self._tracking.done():
+            self._tracking.cancel()
+        self._tracking = None
+        self._measurement_id = None
+
+    def reconcile(self, measurement: LastPressureMeasurement | None) -> LastPressureMeasurement | None:
+        """
+        Get the measurement to show after a regular update. The dashboard may still contain the tracked measurement
+        as running, while the tracker already got its result.
+
+        :param measurement: The last pressure measurement of the regular update.
+        :type measurement: LastPressureMeasurement | None
+        :return: The more recent of the given and the tracked measurement.
+        :rtype: LastPressureMeasurement | None
+        """
+        if (self._result is not None and measurement is not None and measurement.id == self._result.id
+                and measurement.status == PressureMeasurementState.START.value):
+            return self._result
+        return measurement
+
+    def _get_poll_delay(self, measurement: LastPressureMeasurement | None) -> float:
+        """
+        Get the seconds until the next poll. The measurement is polled at its estimated time of completion, but not
+        more often than MIN_POLL_INTERVAL.
+        """
+        if measurement is None:
+            return MIN_POLL_INTERVAL.total_seconds()
+
+        try:
+            completion = datetime.fromisoformat(measurement.estimated_stop_time)
+        except (TypeError, ValueError):
+            return OVERDUE_POLL_INTERVAL.total_seconds()
+
+        remaining = (completion - datetime.now(completion.tzinfo)).total_seconds()
+        if remaining <= 0:
+            return OVERDUE_POLL_INTERVAL.total_seconds()
+        return max(remaining, MIN_POLL_INTERVAL.total_seconds())
+
+    async def _async_track(self, measurement_id: str) -> None:
+        deadline = time.monotonic() + self._max_duration.total_seconds()
+        measurement: LastPressureMeasurement | None = None
+
+        while time.monotonic() < deadline:
+            await asyncio.sleep(min(self._get_poll_delay(measurement), max(deadline - time.monotonic(), 0)))
+            try:
+                details = await self._api.get_appliance_details(self._device.location_id, self._device.room_id,
+                                                                self._device.appliance_id,
+                                                                fields=('last_pressure_measurement',))
+            except Exception as e:
+                _LOGGER.debug('Could not get pressure measurement %s: %s', measurement_id, str(e))
+                continue
+
+            current = self._convert(details)
+            if current is None or current.id != measurement_id:
+                # The details still contain the previous measurement
+                continue
+
+            if measurement is None or current.status != measurement.status:
+                self._push(current)
+            measurement = current
+
+            if current.status != PressureMeasurementState.START.value:
+                _LOGGER.debug('Pressure measurement %s of appliance %s finished with %s', measurement_id,
+                              self._device.appliance_id, current.status)
+                self._result = current
+                self._measurement_id = None
+                return
+
+        _LOGGER.warning('Pressure measurement %s of %s did not finish within %s', measurement_id, self._device.name,
+                        self._max_duration)
+        self._measurement_id = None
+
+    def _push(self, measurement: LastPressureMeasurement) -> None:
+        if self._coordinator.data is not None:
+            self._coordinator.data.last_pressure_measurement = measurement
+            self._coordinator.async_update_listeners()
@@ -1,14 +1,14 @@
 from homeassistant.components.sensor import SensorEntity, SensorStateClass
 from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .grohe_coordinator_entity import GroheCoordinatorEntity
 from .configuration.grohe_entity_configuration import SensorTypes, SENSOR_CONFIGURATION
 from .grohe_sense_update_coordinator import GroheSenseUpdateCoordinator
 from ..dto.grohe_device import GroheDevice
 
 
-class GroheSenseGuardWithdrawalsEntity(CoordinatorEntity, SensorEntity):
+class GroheSenseGuardWithdrawalsEntity(GroheCoordinatorEntity, SensorEntity):
     def __init__(self, domain: str, coordinator: GroheSenseUpdateCoordinator, device: GroheDevice, sensor_type: SensorTypes):
         super().__init__(coordinator)
         self._coordinator = coordinator
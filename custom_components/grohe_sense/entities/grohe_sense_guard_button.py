@@ -1,17 +1,22 @@
 import logging
 
 from homeassistant.components.button import ButtonEntity
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.device_registry import DeviceInfo
 
 from custom_components.grohe_sense.api.ondus_api import OndusApi
+from custom_components.grohe_sense.api.ondus_exceptions import OndusApiError
 from custom_components.grohe_sense.dto.grohe_device import GroheDevice
+from custom_components.grohe_sense.entities.grohe_sense_update_coordinator import GroheSenseUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
 
 class GroheSenseGuardButton(ButtonEntity):
-    def __init__(self, domain: str, auth_session: OndusApi, device: GroheDevice):
+    def __init__(self, domain: str, auth_session: OndusApi, device: GroheDevice,
+                 coordinator: GroheSenseUpdateCoordinator | None = None):
         self._auth_session = auth_session
+        self._coordinator = coordinator
         self._device = device
         self._domain = domain
 
@@ -33,5 +38,18 @@ class GroheSenseGuardButton(ButtonEntity):
 
     async def async_press(self) -> None:
         _LOGGER.info('Starting pressure measurement for %s', self._device.name)
-        await self._auth_session.start_pressure_measurement(self._device.location_id, self._device.room_id,
-                                                            self._device.appliance_id)
+        try:
+            if self._coordinator is None:
+                response = await self._auth_session.start_pressure_measurement(self._device.location_id,
+                                                                               self._device.room_id,
+                                                                               self._device.appliance_id)
+            else:
+                response = await self._coordinator.pressure_measurement_tracker.async_start()
+        except OndusApiError as e:
+            raise HomeAssistantError(f'Could not start pressure measurement of {self._device.name}: {e}') from e
+
+        if response is None:
+            raise HomeAssistantError(f'Could not start pressure measurement of {self._device.name}')
+
+        if self._coordinator is not None:
+            self._coordinator.async_schedule_command_refresh()
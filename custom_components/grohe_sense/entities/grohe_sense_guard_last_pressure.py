@@ -3,15 +3,15 @@ from datetime import datetime
 from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
 from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .grohe_coordinator_entity import GroheCoordinatorEntity
 from .configuration.grohe_entity_configuration import SensorTypes, SENSOR_CONFIGURATION
 from .grohe_blue_update_coordinator import GroheBlueUpdateCoordinator
 from .grohe_sense_update_coordinator import GroheSenseUpdateCoordinator
 from ..dto.grohe_device import GroheDevice
 
 
-class GroheSenseGuardLastPressureEntity(CoordinatorEntity, SensorEntity):
+class GroheSenseGuardLastPressureEntity(GroheCoordinatorEntity, SensorEntity):
     def __init__(self, domain: str, coordinator: GroheSenseUpdateCoordinator,
                  device: GroheDevice, sensor_type: SensorTypes):
         super().__init__(coordinator)
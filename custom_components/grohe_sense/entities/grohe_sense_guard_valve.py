@@ -1,26 +1,28 @@
 import logging
-from datetime import timedelta
 
 from homeassistant.components.valve import ValveEntity, ValveEntityFeature, ValveDeviceClass
-from homeassistant.const import STATE_UNKNOWN
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.util import Throttle
 
 from custom_components.grohe_sense.api.ondus_api import OndusApi
+from custom_components.grohe_sense.api.ondus_exceptions import OndusApiError
 from custom_components.grohe_sense.dto.grohe_device import GroheDevice
-from custom_components.grohe_sense.enum.ondus_types import OndusCommands
+from custom_components.grohe_sense.entities.grohe_coordinator_entity import GroheCoordinatorEntity
+from custom_components.grohe_sense.entities.grohe_sense_update_coordinator import GroheSenseUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
-VALVE_UPDATE_DELAY = timedelta(minutes=1)
 
-
-class GroheSenseGuardValve(ValveEntity):
-    def __init__(self, domain: str, auth_session: OndusApi, device: GroheDevice):
+class GroheSenseGuardValve(GroheCoordinatorEntity, ValveEntity):
+    def __init__(self, domain: str, auth_session: OndusApi, device: GroheDevice,
+                 coordinator: GroheSenseUpdateCoordinator):
+        super().__init__(coordinator)
+        self._coordinator = coordinator
         self._auth_session = auth_session
         self._device = device
         self._domain = domain
-        self._is_closed = STATE_UNKNOWN
+        self._is_closed: bool | None = None
 
         # Needed for ValveEntity
         self._attr_icon = 'mdi:water'
@@ -45,31 +47,29 @@ class GroheSenseGuardValve(ValveEntity):
         return False
 
     @property
-    def is_closed(self) -> bool:
+    def is_closed(self) -> bool | None:
         return self._is_closed
 
-    @Throttle(VALVE_UPDATE_DELAY)
-    async def async_update(self):
-        command_response = await self._auth_session.get_appliance_command(self._device.location_id,
-                                                                          self._device.room_id,
-                                                                          self._device.appliance_id)
-
-        if command_response and command_response.command and command_response.command.valve_open is not None:
-            _LOGGER.debug(f'Valve_open state: {command_response.command.valve_open} for appliance '
-                          f'{self._device.appliance_id}')
-            self._is_closed = not command_response.command.valve_open
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        command = self._coordinator.data.command if self._coordinator.data is not None else None
+        pending = self._coordinator.command_pipeline.pending_valve_open
+        if pending is not None:
+            # Show the requested state until the valve confirmed or missed it
+            self._is_closed = not pending
+        elif command is not None and command.valve_open is not None:
+            _LOGGER.debug(f'Valve_open state: {command.valve_open} for appliance {self._device.appliance_id}')
+            self._is_closed = not command.valve_open
         else:
-            _LOGGER.error('Failed to parse out valve_open from commands response: %s', command_response)
+            _LOGGER.debug('No valve state for appliance %s', self._device.appliance_id)
+        self.async_write_ha_state()
 
     async def _set_state(self, state):
-        command_response = await self._auth_session.set_appliance_command(self._device.location_id,
-                                                                          self._device.room_id,
-                                                                          self._device.appliance_id,
-                                                                          OndusCommands.OPEN_VALVE, state)
-        if command_response.command.valve_open is not None:
-            self._is_closed = not command_response.command.valve_open
-        else:
-            _LOGGER.warning('Got unknown response back when setting valve state: %s', command_response)
+        try:
+            await self._coordinator.command_pipeline.async_set_valve(state)
+        except OndusApiError as e:
+            action = 'open' if state else 'close'
+            raise HomeAssistantError(f'Could not {action} valve of {self._device.name}: {e}') from e
 
     async def async_open_valve(self) -> None:
         _LOGGER.info('Turning on water for %s', self._device.name)
@@ -3,15 +3,15 @@ from typing import List
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from custom_components.grohe_sense.dto.grohe_device import GroheDevice
 from custom_components.grohe_sense.dto.ondus_dtos import Notification
+from custom_components.grohe_sense.entities.grohe_coordinator_entity import GroheCoordinatorEntity
 from custom_components.grohe_sense.entities.configuration.grohe_entity_configuration import SensorTypes
 from custom_components.grohe_sense.entities.grohe_blue_update_coordinator import GroheBlueUpdateCoordinator
 from custom_components.grohe_sense.entities.grohe_sense_update_coordinator import GroheSenseUpdateCoordinator
 
 
-class GroheSenseNotificationEntity(CoordinatorEntity, SensorEntity):
+class GroheSenseNotificationEntity(GroheCoordinatorEntity, SensorEntity):
     def __init__(self, domain: str, coordinator: GroheSenseUpdateCoordinator | GroheBlueUpdateCoordinator,
                  device: GroheDevice, sensor_type: SensorTypes):
         super().__init__(coordinator)
@@ -1,48 +1,214 @@
+import asyncio
 import json
 import logging
+import time
 from datetime import timedelta
-from typing import List
-from datetime import datetime
+from typing import List, Tuple, Dict, Any, Awaitable
+from datetime import datetime, date
 
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.core import HomeAssistant, CALLBACK_TYPE, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from custom_components.grohe_sense.api.ondus_api import OndusApi
+from custom_components.grohe_sense.api.ondus_api import OndusApi, set_notification_text
+from custom_components.grohe_sense.api.ondus_exceptions import OndusAuthenticationError
+from custom_components.grohe_sense.api.ondus_notifications import NOTIFICATION_CATALOG
 from custom_components.grohe_sense.dto.grohe_coordinator_dtos import MeasurementSenseDto, CoordinatorDto, \
     LastPressureMeasurement
 from custom_components.grohe_sense.dto.grohe_device import GroheDevice
-from custom_components.grohe_sense.dto.ondus_dtos import Notification
-from custom_components.grohe_sense.enum.ondus_types import GroheTypes, OndusGroupByTypes
+from custom_components.grohe_sense.dto.ondus_dtos import Notification, Appliance, MeasurementData, Command, \
+    MeasurementSenseDto as AggregatedMeasurement
+from custom_components.grohe_sense.dto.ondus_statistics_dtos import SubFetchStatistics, PollScheduleStatistics
+from custom_components.grohe_sense.entities.grohe_dashboard_update_coordinator import GroheDashboardUpdateCoordinator
+from custom_components.grohe_sense.entities.grohe_command_pipeline import GroheCommandPipeline
+from custom_components.grohe_sense.entities.grohe_notification_update_coordinator import \
+    GroheNotificationUpdateCoordinator
+from custom_components.grohe_sense.entities.grohe_pressure_measurement_tracker import GrohePressureMeasurementTracker
+from custom_components.grohe_sense.entities.grohe_adaptive_interval import GroheAdaptiveInterval, \
+    DEFAULT_INTERVAL, DEFAULT_INTERVAL_FLOOR, DEFAULT_INTERVAL_CEILING
+from custom_components.grohe_sense.entities.grohe_staggered_schedule import GroheStaggeredSchedule, DEFAULT_JITTER
+from custom_components.grohe_sense.entities.grohe_transmission_schedule import GroheTransmissionSchedule
+from custom_components.grohe_sense.enum.ondus_types import GroheTypes, OndusGroupByTypes, PressureMeasurementState, \
+    NotificationSeverity, OndusRequestPriority
+from custom_components.grohe_sense.storage.grohe_timeseries_store import GroheTimeSeriesStore
 
 _LOGGER = logging.getLogger(__name__)
 
+DEFAULT_DATA_WINDOW = timedelta(hours=1)
+DEFAULT_FETCH_TIMEOUT = timedelta(seconds=30)
+COMMAND_REFRESH_DELAY = timedelta(seconds=5)
+MAX_BACKFILL = timedelta(days=7)
+# Alarms and notifications are not bound to the uploads of the Sense, it is polled for them at least this often
+MAX_ALERT_INTERVAL = DEFAULT_INTERVAL
+
 
 class GroheSenseUpdateCoordinator(DataUpdateCoordinator):
-    def __init__(self, hass: HomeAssistant, device: GroheDevice, api: OndusApi) -> None:
-        super().__init__(hass, _LOGGER, name='Grohe Sense', update_interval=timedelta(seconds=300), always_update=True)
+    def __init__(self, hass: HomeAssistant, device: GroheDevice, api: OndusApi,
+                 dashboard: GroheDashboardUpdateCoordinator | None = None,
+                 notifications: GroheNotificationUpdateCoordinator | None = None,
+                 timeseries: GroheTimeSeriesStore | None = None,
+                 data_window: timedelta = DEFAULT_DATA_WINDOW,
+                 fetch_timeout: timedelta = DEFAULT_FETCH_TIMEOUT,
+                 interval_floor: timedelta = DEFAULT_INTERVAL_FLOOR,
+                 interval_ceiling: timedelta = DEFAULT_INTERVAL_CEILING,
+                 jitter: timedelta = DEFAULT_JITTER) -> None:
+        self._adaptive_interval = GroheAdaptiveInterval(interval_floor, interval_ceiling)
+        self._staggered_schedule = GroheStaggeredSchedule(device.appliance_id, jitter)
+        # The battery powered Sense only uploads its measurements every few hours, so they are fetched after its uploads
+        self._transmission_schedule: GroheTransmissionSchedule | None = None
+        if device.type == GroheTypes.GROHE_SENSE:
+            self._transmission_schedule = GroheTransmissionSchedule(device.appliance.config)
+        self._poll_interval = self._adaptive_interval.interval
+        super().__init__(hass, _LOGGER, name='Grohe Sense', update_interval=self._adaptive_interval.interval,
+                         always_update=True)
         self._api = api
         self._device = device
+        self._dashboard = dashboard
+        self._notification_sync = notifications
+        self._timeseries = timeseries
+        self._backfill: asyncio.Task | None = None
+        self._data_window = data_window
+        self._fetch_timeout = fetch_timeout
+        self._fetch_statistics: Dict[str, SubFetchStatistics] = {}
         self._timezone = datetime.now().astimezone().tzinfo
         self._last_update = datetime.now().astimezone().replace(tzinfo=self._timezone)
         self._notifications: List[Notification] = []
+        self._unread_alarm = False
+        self._active = False
+        self._last_measurement_fetch: float | None = None
+        self._requests_per_measurement = 0
+        self._command_refresh_pending = False
+        self._cancel_command_refresh: CALLBACK_TYPE | None = None
+        self._command_pipeline: GroheCommandPipeline | None = None
+        self._pressure_measurement_tracker: GrohePressureMeasurementTracker | None = None
+        if device.type == GroheTypes.GROHE_SENSE_GUARD:
+            self._command_pipeline = GroheCommandPipeline(hass, device, api, self,
+                                                         self.async_schedule_command_refresh)
+            self._pressure_measurement_tracker = GrohePressureMeasurementTracker(
+                hass, device, api, self, self._convert_last_pressure_measurement)
+
+    @property
+    def command_pipeline(self) -> GroheCommandPipeline | None:
+        return self._command_pipeline
+
+    @property
+    def pressure_measurement_tracker(self) -> GrohePressureMeasurementTracker | None:
+        return self._pressure_measurement_tracker
+
+    @property
+    def fetch_statistics(self) -> Dict[str, SubFetchStatistics]:
+        return self._fetch_statistics
+
+    @property
+    def poll_interval(self) -> timedelta:
+        """
+        Get the polling interval of the device. Unlike update_interval, it is not aligned to the phase of the device
+        or its next upload and carries no jitter, so it only changes with the activity of the device.
+
+        :return: The polling interval.
+        :rtype: timedelta
+        """
+        return self._poll_interval
+
+    @property
+    def poll_statistics(self) -> PollScheduleStatistics | None:
+        """
+        Get the statistics of the transmission schedule, including the requests it saves compared to fetching the
+        measurements with the default interval.
 
-    async def _get_notification(self) -> str:
+        :return: The statistics or None if the device is not polled by its transmission schedule.
+        :rtype: PollScheduleStatistics | None
         """
-        Get the latest notification for the device.
+        if self._transmission_schedule is None:
+            return None
+
+        transmission_interval = self._transmission_schedule.transmission_interval
+        polls_per_day = self._transmission_schedule.polls_per_day()
+        default_polls_per_day = timedelta(days=1) / DEFAULT_INTERVAL
+        return PollScheduleStatistics(
+            transmission_interval=transmission_interval.total_seconds() if transmission_interval else None,
+            polls_per_day=polls_per_day,
+            requests_per_poll=self._requests_per_measurement,
+            requests_saved_per_day=max(default_polls_per_day - polls_per_day, 0.0) * self._requests_per_measurement)
 
+    async def _get_notification(self, fallback: List[Notification] | None = None) -> str:
+        """
+        Get the latest notification for the device. The notifications are taken from the account wide notification
+        sync, if it is not available from the fallback (e.g. the dashboard) or from the appliance endpoint.
+
+        :param fallback: (optional) The notifications to use if the notification sync is not available.
+        :type fallback: List[Notification] | None
         :return: The latest notification text. If no notifications are found, returns 'No notifications'.
         :rtype: str
         """
-        notifications = await self._api.get_appliance_notifications(self._device.location_id, self._device.room_id,
-                                                                    self._device.appliance_id)
-        notifications.sort(key=lambda n: n.timestamp, reverse=True)
-        notifications = [notification for notification in notifications if notification.is_read is False]
+        notifications = None
+        if self._notification_sync is not None:
+            notifications = await self._notification_sync.get_notifications(self._device.appliance_id)
+        if notifications is None:
+            if fallback is not None:
+                notifications = [set_notification_text(notification) for notification in fallback]
+            else:
+                notifications = await self._api.get_appliance_notifications(self._device.location_id,
+                                                                            self._device.room_id,
+                                                                            self._device.appliance_id)
+            if self._notification_sync is not None:
+                self._notification_sync.async_dispatch(notifications)
+        self._unread_alarm = self._has_unread_alarm(notifications)
+        return self._get_latest_notification_text(notifications)
 
-        if len(notifications) > 0:
-            return f'{notifications[0].notification_text}'
-        else:
+    @staticmethod
+    def _has_unread_alarm(notifications: List[Notification]) -> bool:
+        return NOTIFICATION_CATALOG.latest_unread(notifications, NotificationSeverity.ALARM) is not None
+
+    def _is_measurement_due(self) -> bool:
+        """
+        Check whether the measurements have to be fetched. The Sense only has new measurements after its uploads, so
+        they are fetched once per upload while the device is idle.
+
+        :return: True if the measurements have to be fetched.
+        :rtype: bool
+        """
+        if self._transmission_schedule is None or self._active or self._last_measurement_fetch is None:
+            return True
+        return self._transmission_schedule.is_upload_due(self._last_measurement_fetch)
+
+    def _is_active(self, data: CoordinatorDto) -> bool:
+        """
+        Check whether the device is active, which means it is polled with the floor interval.
+
+        :param data: The data of the last update.
+        :type data: CoordinatorDto
+        :return: True if water is flowing, a pressure measurement is running or an alarm is unread.
+        :rtype: bool
+        """
+        if data.measurement is not None and data.measurement.flow_rate:
+            return True
+        if (data.last_pressure_measurement is not None and
+                data.last_pressure_measurement.status == PressureMeasurementState.START.value):
+            return True
+        if data.command is not None and data.command.pressure_measurement_running:
+            return True
+        return self._unread_alarm
+
+    @staticmethod
+    def _get_latest_notification_text(notifications: List[Notification]) -> str:
+        """
+        Get the text of the latest unread notification.
+
+        :param notifications: The notifications of the device.
+        :type notifications: List[Notification]
+        :return: The latest notification text. If no notifications are found, returns 'No notifications'.
+        :rtype: str
+        """
+        latest = NOTIFICATION_CATALOG.latest_unread(notifications)
+        if latest is None:
             return 'No notifications'
 
+        if latest.notification_text is None:
+            set_notification_text(latest)
+        return f'{latest.notification_text}'
+
     async def _get_actual_measurement(self) -> MeasurementSenseDto:
         """
         Get the actual measurement data of the device.
@@ -57,23 +223,43 @@ class GroheSenseUpdateCoordinator(DataUpdateCoordinator):
 
         measurements_response = await self._api.get_appliance_data(self._device.location_id, self._device.room_id,
                                                                    self._device.appliance_id,
-                                                                   self._last_update - timedelta(hours=1), None,
+                                                                   self._last_update - self._data_window, None,
                                                                    group_by, False)
 
-        measurement_data = MeasurementSenseDto()
+        return self._get_latest_measurement(measurements_response) or MeasurementSenseDto()
+
+    def _get_latest_measurement(self, measurements_response: MeasurementData | None) -> MeasurementSenseDto | None:
+        """
+        Get the latest measurement out of an aggregated data response.
+
+        :param measurements_response: The response of the aggregated data endpoint.
+        :type measurements_response: MeasurementData | None
+        :return: The latest measurement or None if the response does not contain any measurement.
+        :rtype: MeasurementSenseDto | None
+        """
         if measurements_response and measurements_response.data and measurements_response.data.measurement and len(measurements_response.data.measurement) > 0:
             """Get the first measurement of the device. This is also the latest measurement"""
             measurements_response.data.measurement.sort(key=lambda m: m.date, reverse=True)
-            measure = measurements_response.data.measurement[0]
+            return self._convert_measurement(measurements_response.data.measurement[0])
+        return None
 
-            measurement_data.pressure = measure.pressure
-            measurement_data.flow_rate = measure.flow_rate
-            measurement_data.humidity = measure.humidity
+    def _convert_measurement(self, measure) -> MeasurementSenseDto:
+        """
+        Convert a measurement of the API into the coordinator representation.
 
-            if self._device.type == GroheTypes.GROHE_SENSE:
-                measurement_data.temperature = measure.temperature
-            elif self._device.type == GroheTypes.GROHE_SENSE_GUARD:
-                measurement_data.temperature = measure.temperature_guard
+        :param measure: The measurement as delivered by the API.
+        :return: MeasurementSenseDto object with the values of the measurement.
+        :rtype: MeasurementSenseDto
+        """
+        measurement_data = MeasurementSenseDto()
+        measurement_data.pressure = measure.pressure
+        measurement_data.flow_rate = measure.flow_rate
+        measurement_data.humidity = measure.humidity
+
+        if self._device.type == GroheTypes.GROHE_SENSE:
+            measurement_data.temperature = measure.temperature
+        elif self._device.type == GroheTypes.GROHE_SENSE_GUARD:
+            measurement_data.temperature = measure.temperature_guard
 
         return measurement_data
 
@@ -81,8 +267,20 @@ class GroheSenseUpdateCoordinator(DataUpdateCoordinator):
         _LOGGER.debug(f'Get last pressure measurement for appliance {self._device.appliance_id}')
 
         appliance_details = await self._api.get_appliance_details(self._device.location_id, self._device.room_id,
-                                                                  self._device.appliance_id)
+                                                                  self._device.appliance_id,
+                                                                  fields=('last_pressure_measurement',))
+        return self._convert_last_pressure_measurement(appliance_details)
 
+    def _convert_last_pressure_measurement(self, appliance_details: Appliance | None) \
+            -> LastPressureMeasurement | None:
+        """
+        Convert the last pressure measurement of the appliance details into the coordinator representation.
+
+        :param appliance_details: The appliance details (or dashboard slice) containing the last pressure measurement.
+        :type appliance_details: Appliance | None
+        :return: The last pressure measurement including the maximum flow rate or None if not available.
+        :rtype: LastPressureMeasurement | None
+        """
         measurement: LastPressureMeasurement | None = None
         if appliance_details and appliance_details.last_pressure_measurement is not None:
             measurement = LastPressureMeasurement.from_dict(appliance_details.last_pressure_measurement.to_dict())
@@ -111,13 +309,29 @@ class GroheSenseUpdateCoordinator(DataUpdateCoordinator):
         measurements_response = await self._api.get_appliance_data(self._device.location_id, self._device.room_id,
                                                                    self._device.appliance_id,
                                                                    self._last_update, None, None, True)
+        await self._ingest(measurements_response)
+        return self._get_latest_withdrawal(measurements_response)
+
+    def _get_latest_withdrawal(self, measurements_response: MeasurementData | None,
+                               since: date | None = None) -> float | None:
+        """
+        Get the latest withdrawal out of an aggregated data response.
 
+        :param measurements_response: The response of the aggregated data endpoint.
+        :type measurements_response: MeasurementData | None
+        :param since: (optional) Only take the withdrawals of this day and later into account.
+        :type since: date | None
+        :return: The latest withdrawal value, 0 if the response does not contain withdrawals and None if there is no
+                 data at all.
+        :rtype: float | None
+        """
         withdrawal: float | None = None
         if measurements_response is not None:
             if measurements_response.data is not None:
-                if (measurements_response.data.withdrawals is not None
-                        and len(measurements_response.data.withdrawals) > 0):
-                    withdrawals = measurements_response.data.withdrawals
+                withdrawals = measurements_response.data.withdrawals
+                if withdrawals and since is not None:
+                    withdrawals = [w for w in withdrawals if self._parse_date(w.date).date() >= since]
+                if withdrawals is not None and len(withdrawals) > 0:
                     withdrawals.sort(key=lambda m: m.date, reverse=True)
                     withdrawal = withdrawals[0].waterconsumption if withdrawals else None
                 else:
@@ -125,19 +339,383 @@ class GroheSenseUpdateCoordinator(DataUpdateCoordinator):
 
         return withdrawal
 
+    def _parse_date(self, value: datetime | str) -> datetime:
+        parsed = datetime.fromisoformat(value) if isinstance(value, str) else value
+        return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=self._timezone)
+
+    def _get_latest_measurement_group(self, measurements_response: MeasurementData | None,
+                                      since: datetime) -> MeasurementSenseDto | None:
+        """
+        Get the actual measurement out of an ungrouped aggregated data response, grouped like _get_actual_measurement
+        requests it: the measurements since the given time are grouped by hour (by day for the Sense) and the values
+        of the latest group are averaged, as the aggregated data endpoint does for grouped requests.
+
+        :param measurements_response: The ungrouped response of the aggregated data endpoint.
+        :type measurements_response: MeasurementData | None
+        :param since: Only take the measurements since this time into account.
+        :type since: datetime
+        :return: The actual measurement, an empty measurement if there is none since the given time, or None if the
+                 response does not contain any measurement at all.
+        :rtype: MeasurementSenseDto | None
+        """
+        if not (measurements_response and measurements_response.data and measurements_response.data.measurement):
+            return None
+
+        groups: Dict[Any, List[Any]] = {}
+        for measure in measurements_response.data.measurement:
+            measured = self._parse_date(measure.date)
+            if measured < since:
+                continue
+            if self._device.type == GroheTypes.GROHE_SENSE:
+                key = measured.date()
+            else:
+                key = measured.replace(minute=0, second=0, microsecond=0)
+            groups.setdefault(key, []).append(measure)
+
+        if not groups:
+            return MeasurementSenseDto()
+
+        key = max(groups)
+        latest = groups[key]
+
+        def average(attribute: str) -> float | None:
+            values = [getattr(measure, attribute) for measure in latest if getattr(measure, attribute) is not None]
+            return sum(values) / len(values) if values else None
+
+        return self._convert_measurement(AggregatedMeasurement(
+            date=str(key), flow_rate=average('flow_rate'), pressure=average('pressure'),
+            temperature_guard=average('temperature_guard'), temperature=average('temperature'),
+            humidity=average('humidity')))
+
+    async def _get_withdrawal_and_measurement(self) -> Tuple[float | None, MeasurementSenseDto]:
+        """
+        Get the latest withdrawal and the actual measurement of the device with one aggregated data request.
+        The request covers the full days of the configured data window before the last update, without grouping,
+        so it contains the withdrawals as well as the single measurements. The values are derived like the
+        separate requests of _get_withdrawal and _get_actual_measurement do: the withdrawals of the day of the last
+        update and the latest hourly (daily for the Sense) group of the measurements within the data window. Only if
+        the response does not contain any measurement, the measurement is requested separately.
+
+        :return: A tuple of the latest withdrawal and the actual measurement.
+        :rtype: Tuple[float | None, MeasurementSenseDto]
+        """
+        since = self._last_update - self._data_window
+        measurements_response = await self._api.get_appliance_data(self._device.location_id, self._device.room_id,
+                                                                   self._device.appliance_id, since, None, None,
+                                                                   True)
+        await self._ingest(measurements_response)
+
+        withdrawal = self._get_latest_withdrawal(measurements_response, self._last_update.date())
+        measurement = self._get_latest_measurement_group(measurements_response, since)
+        if measurement is None:
+            _LOGGER.debug(f'No measurement in aggregated data of appliance {self._device.appliance_id}, '
+                          f'requesting it separately')
+            measurement = await self._get_actual_measurement()
+
+        return withdrawal, measurement
+
+    async def _ingest(self, measurements_response: MeasurementData | None) -> None:
+        """
+        Store all measurements and withdrawals of an ungrouped aggregated data response in the time-series store.
+        Grouped responses are not stored, as they only contain averages. A failing store does not fail the update.
+
+        :param measurements_response: The response of the aggregated data endpoint.
+        :type measurements_response: MeasurementData | None
+        :return: None
+        """
+        if self._timeseries is None or measurements_response is None or measurements_response.data is None:
+            return
+        try:
+            await self._timeseries.async_ingest(self._device.appliance_id, measurements_response.data.measurement,
+                                                measurements_response.data.withdrawals)
+        except Exception as e:
+            _LOGGER.warning(f'Could not store the data of appliance {self._device.appliance_id}: {e}')
+
+    async def _async_backfill(self) -> None:
+        """
+        Request the data since the latest stored row (at most MAX_BACKFILL) once, so the time-series store has no gap
+        for the time Home Assistant was not running. The regular updates only cover the data window.
+
+        :return: None
+        """
+        now = datetime.now().astimezone()
+        try:
+            latest = await self._timeseries.async_get_latest(self._device.appliance_id)
+            start = now - MAX_BACKFILL if latest is None else max(latest, now - MAX_BACKFILL)
+            if now - start <= self._data_window:
+                return
+
+            _LOGGER.debug(f'Backfilling the data of appliance {self._device.appliance_id} since {start}')
+            measurements_response = await self._api.get_appliance_data(self._device.location_id,
+                                                                       self._device.room_id,
+                                                                       self._device.appliance_id, start, None, None,
+                                                                       True, OndusRequestPriority.LOW)
+        except Exception as e:
+            _LOGGER.warning(f'Could not backfill the data of appliance {self._device.appliance_id}: {e}')
+            return
+        await self._ingest(measurements_response)
+
+    async def _ingest_dashboard_measurement(self, appliance: Appliance) -> None:
+        """
+        Store the latest measurement of the dashboard slice in the time-series store. Without it, nothing would be
+        stored for a Sense updated from the dashboard after the backfill, as it does not request the aggregated data.
+        A measurement which was already stored is updated.
+
+        :param appliance: The appliance as delivered by the dashboard.
+        :type appliance: Appliance
+        :return: None
+        """
+        if self._timeseries is None or appliance.data_latest is None or appliance.data_latest.measurement is None:
+            return
+        measure = appliance.data_latest.measurement
+        if measure.timestamp is None:
+            return
+        measurement = AggregatedMeasurement(measure.timestamp, measure.flow_rate, measure.pressure,
+                                            measure.temperature_guard, measure.temperature, measure.humidity)
+        try:
+            await self._timeseries.async_ingest(self._device.appliance_id, [measurement], None)
+        except Exception as e:
+            _LOGGER.warning(f'Could not store the data of appliance {self._device.appliance_id}: {e}')
+
+    def _get_dashboard_measurement(self, appliance: Appliance) -> MeasurementSenseDto:
+        """
+        Get the actual measurement data of the device from its dashboard slice.
+
+        :param appliance: The appliance as delivered by the dashboard.
+        :type appliance: Appliance
+        :return: MeasurementSenseDto object with the latest measurement of the device.
+        :rtype: MeasurementSenseDto
+        """
+        if appliance.data_latest is not None and appliance.data_latest.measurement is not None:
+            return self._convert_measurement(appliance.data_latest.measurement)
+        return MeasurementSenseDto()
+
+    async def _get_command(self) -> Command | None:
+        """
+        Get the command state (valve, buzzer, running pressure measurement, ...) of the device.
+
+        :return: The command state or None if not available.
+        :rtype: Command | None
+        """
+        response = await self._api.get_appliance_command(self._device.location_id, self._device.room_id,
+                                                         self._device.appliance_id)
+        self._command_refresh_pending = False
+        return response.command if response is not None else None
+
+    @callback
+    def async_schedule_command_refresh(self, delay: timedelta = COMMAND_REFRESH_DELAY) -> None:
+        """
+        Schedule a refresh shortly after a command was sent to the device, instead of waiting for the next regular
+        update. The refresh requests the command state from the device, even if the dashboard contains it, and the
+        dashboard is fetched again.
+
+        :param delay: The delay of the refresh.
+        :type delay: timedelta
+        :return: None
+        """
+        self._command_refresh_pending = True
+        if self._dashboard is not None:
+            # A dashboard fetched before the command still contains the previous command state
+            self._dashboard.invalidate()
+        if self._cancel_command_refresh is not None:
+            self._cancel_command_refresh()
+        self._cancel_command_refresh = async_call_later(self.hass, delay, self._async_command_refresh)
+
+    async def _async_command_refresh(self, _now: datetime) -> None:
+        self._cancel_command_refresh = None
+        await self.async_refresh()
+
+    async def async_shutdown(self) -> None:
+        if self._command_pipeline is not None:
+            self._command_pipeline.cancel()
+        if self._pressure_measurement_tracker is not None:
+            self._pressure_measurement_tracker.cancel()
+        if self._cancel_command_refresh is not None:
+            self._cancel_command_refresh()
+            self._cancel_command_refresh = None
+        if self._backfill is not None and not self._backfill.done():
+            self._backfill.cancel()
+        await super().async_shutdown()
+
+    async def _sub_fetch(self, name: str, fetch: Awaitable[Any]) -> Tuple[bool, Any]:
+        """
+        Run one sub-fetch of the update with a timeout and record its latency.
+
+        :param name: The name of the sub-fetch, used for the statistics.
+        :type name: str
+        :param fetch: The sub-fetch to run.
+        :type fetch: Awaitable[Any]
+        :return: A tuple of whether the sub-fetch succeeded and its result (or the raised exception).
+        :rtype: Tuple[bool, Any]
+        """
+        statistics = self._fetch_statistics.setdefault(name, SubFetchStatistics())
+        start = time.monotonic()
+        try:
+            result = await asyncio.wait_for(fetch, self._fetch_timeout.total_seconds())
+            success = True
+        except asyncio.TimeoutError as e:
+            _LOGGER.warning(f'Fetching {name} of appliance {self._device.appliance_id} timed out')
+            statistics.timeout_count += 1
+            result, success = e, False
+        except Exception as e:
+            _LOGGER.warning(f'Fetching {name} of appliance {self._device.appliance_id} failed: {e}')
+            statistics.failure_count += 1
+            result, success = e, False
+
+        duration = time.monotonic() - start
+        statistics.fetch_count += 1
+        statistics.last_duration = duration
+        statistics.total_duration += duration
+        statistics.max_duration = max(statistics.max_duration or 0.0, duration)
+        return success, result
+
+    async def _run_sub_fetches(self, fetches: Dict[str, Awaitable[Any]]) -> Dict[str, Any]:
+        """
+        Run the independent sub-fetches of an update concurrently.
+
+        :param fetches: The sub-fetches by name.
+        :type fetches: Dict[str, Awaitable[Any]]
+        :return: The results of the successful sub-fetches by name. Failed sub-fetches are missing, so their previous
+                 values can be kept.
+        :rtype: Dict[str, Any]
+        :raises OndusAuthenticationError: If one of the sub-fetches failed because of the authentication.
+        :raises UpdateFailed: If all sub-fetches failed.
+        """
+        if not fetches:
+            return {}
+
+        outcomes = await asyncio.gather(*(self._sub_fetch(name, fetch) for name, fetch in fetches.items()))
+        results = {name: result for name, (success, result) in zip(fetches, outcomes) if success}
+
+        for success, result in outcomes:
+            if not success and isinstance(result, OndusAuthenticationError):
+                raise result
+
+        if not results:
+            raise UpdateFailed(f'All requests for appliance {self._device.appliance_id} failed')
+
+        return results
+
+    def _get_previous(self, attribute: str) -> Any:
+        return getattr(self.data, attribute, None) if self.data is not None else None
+
+    async def _update_from_dashboard(self, appliance: Appliance) -> CoordinatorDto:
+        """
+        Fill the coordinator data from the dashboard slice of the device. Per appliance endpoints are only requested
+        for data which is not part of the dashboard.
+
+        :param appliance: The appliance as delivered by the dashboard.
+        :type appliance: Appliance
+        :return: The coordinator data of the device.
+        :rtype: CoordinatorDto
+        """
+        data = CoordinatorDto()
+        data.measurement = self._get_dashboard_measurement(appliance)
+        # The measurements are part of the shared dashboard request
+        self._requests_per_measurement = 0
+        await self._ingest_dashboard_measurement(appliance)
+
+        fetches: Dict[str, Awaitable[Any]] = {}
+        if self._notification_sync is not None:
+            fetches['notification'] = self._get_notification(appliance.notifications)
+        elif appliance.notifications is not None:
+            self._unread_alarm = self._has_unread_alarm(appliance.notifications)
+            data.notification = self._get_latest_notification_text(appliance.notifications)
+        else:
+            fetches['notification'] = self._get_notification()
+
+        if self._device.type == GroheTypes.GROHE_SENSE_GUARD:
+            fetches['withdrawal'] = self._get_withdrawal()
+
+            if appliance.last_pressure_measurement is not None:
+                data.last_pressure_measurement = self._convert_last_pressure_measurement(appliance)
+            else:
+                fetches['last_pressure_measurement'] = self._get_last_pressure_measurement()
+
+            if appliance.command is not None and not self._command_refresh_pending:
+                data.command = appliance.command
+            else:
+                fetches['command'] = self._get_command()
+
+        try:
+            results = await self._run_sub_fetches(fetches)
+        except UpdateFailed:
+            # The dashboard slice itself is still current
+            results = {}
+
+        for attribute in fetches:
+            setattr(data, attribute, results[attribute] if attribute in results else self._get_previous(attribute))
+
+        if self._pressure_measurement_tracker is not None:
+            data.last_pressure_measurement = self._pressure_measurement_tracker.reconcile(
+                data.last_pressure_measurement)
+        return data
+
+    async def _update_from_endpoints(self) -> CoordinatorDto:
+        """
+        Fill the coordinator data from the per appliance endpoints, which are requested concurrently.
+
+        :return: The coordinator data of the device.
+        :rtype: CoordinatorDto
+        """
+        fetches: Dict[str, Awaitable[Any]] = {'notification': self._get_notification()}
+        if self._is_measurement_due():
+            fetches['data'] = self._get_withdrawal_and_measurement()
+        if self._device.type == GroheTypes.GROHE_SENSE_GUARD:
+            fetches['last_pressure_measurement'] = self._get_last_pressure_measurement()
+            fetches['command'] = self._get_command()
+
+        results = await self._run_sub_fetches(fetches)
+
+        data = CoordinatorDto()
+        if 'data' in results:
+            data.withdrawal, data.measurement = results['data']
+            self._last_measurement_fetch = time.time()
+            self._requests_per_measurement = 1
+        else:
+            data.withdrawal = self._get_previous('withdrawal')
+            data.measurement = self._get_previous('measurement') or MeasurementSenseDto()
+
+        data.notification = results.get('notification', self._get_previous('notification'))
+        if self._device.type == GroheTypes.GROHE_SENSE_GUARD:
+            data.last_pressure_measurement = self._pressure_measurement_tracker.reconcile(
+                results.get('last_pressure_measurement', self._get_previous('last_pressure_measurement')))
+            data.command = results.get('command', self._get_previous('command'))
+
+        return data
+
     async def _async_update_data(self) -> CoordinatorDto:
         try:
             _LOGGER.debug(f'Updating {self._device.type} (appliance = {self._device.appliance_id}) data')
-            data = CoordinatorDto()
-            data.withdrawal = await self._get_withdrawal()
-            data.measurement = await self._get_actual_measurement()
-            data.notification = await self._get_notification()
 
-            if self._device.type == GroheTypes.GROHE_SENSE_GUARD:
-                data.last_pressure_measurement = await self._get_last_pressure_measurement()
+            if self._timeseries is not None and self._backfill is None:
+                self._backfill = self.hass.async_create_background_task(
+                    self._async_backfill(), f'Grohe Sense backfill {self._device.appliance_id}')
+
+            appliance = None
+            if self._dashboard is not None:
+                appliance = await self._dashboard.get_appliance(self._device.appliance_id)
+
+            if appliance is not None:
+                data = await self._update_from_dashboard(appliance)
+            else:
+                data = await self._update_from_endpoints()
 
             self._last_update = datetime.now().astimezone().replace(tzinfo=self._timezone)
+            self._active = self._is_active(data)
+            self._poll_interval = self._adaptive_interval.update(self._active)
+            if self._transmission_schedule is not None:
+                # Poll for alarms at least every MAX_ALERT_INTERVAL and for the measurements after the next upload
+                self._poll_interval = min(self._poll_interval, MAX_ALERT_INTERVAL)
+                self.update_interval = min(self._staggered_schedule.align(self._poll_interval), MAX_ALERT_INTERVAL,
+                                           self._transmission_schedule.next_interval())
+            else:
+                self.update_interval = self._staggered_schedule.align(self._poll_interval)
             return data
 
+        except OndusAuthenticationError as e:
+            raise ConfigEntryAuthFailed(str(e)) from e
+        except UpdateFailed:
+            raise
         except Exception as e:
-            _LOGGER.error("Error updating Grohe Sense data: %s", str(e))
+            raise UpdateFailed(f'Error updating Grohe Sense data: {e}') from e
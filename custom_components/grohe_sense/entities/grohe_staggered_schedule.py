@@ -0,0 +1,62 @@
+import hashlib
+import random
+import time
+from datetime import timedelta
+
+DEFAULT_JITTER = timedelta(seconds=10)
+MIN_WAIT_FRACTION = 0.5
+
+
+def get_phase(appliance_id: str) -> float:
+    """
+    Get the deterministic phase of an appliance within a polling interval.
+
+    :param appliance_id: The ID of the appliance.
+    :type appliance_id: str
+    :return: The phase as fraction of the interval in [0, 1).
+    :rtype: float
+    """
+    # Not hash(), which differs between runs
+    digest = hashlib.sha256(appliance_id.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') / 2 ** 64
+
+
+class GroheStaggeredSchedule:
+    """
+    Spreads the polls of the appliances across their interval. Each appliance is polled at its own phase of the
+    interval (derived from its ID), optionally shifted by a random jitter, so that the appliances of an account do
+    not all hit the Grohe cloud at the same moment.
+    """
+    def __init__(self, appliance_id: str, jitter: timedelta = DEFAULT_JITTER) -> None:
+        self._phase = get_phase(appliance_id)
+        self._jitter = jitter.total_seconds()
+
+    @property
+    def phase(self) -> float:
+        return self._phase
+
+    def align(self, interval: timedelta, now: float | None = None) -> timedelta:
+        """
+        Get the wait until the next poll at the phase of the appliance.
+
+        :param interval: The polling interval.
+        :type interval: timedelta
+        :param now: (optional) The current unix timestamp. Defaults to the current time.
+        :type now: float
+        :return: The wait until the next poll, which is between half and one and a half intervals.
+        :rtype: timedelta
+        """
+        seconds = interval.total_seconds()
+        if seconds <= 0:
+            return interval
+
+        now = time.time() if now is None else now
+        wait = seconds - (now - self._phase * seconds) % seconds
+        if wait < seconds * MIN_WAIT_FRACTION:
+            # Do not poll again right after the last poll, e.g. after the first refresh
+            wait += seconds
+
+        if self._jitter > 0:
+            wait += random.uniform(-self._jitter, self._jitter)
+
+        return timedelta(seconds=max(wait, 1.0))
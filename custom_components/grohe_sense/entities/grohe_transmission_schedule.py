@@ -0,0 +1,100 @@
+import logging
+import math
+import time
+from datetime import timedelta
+
+from custom_components.grohe_sense.dto.ondus_dtos import Config
+
+_LOGGER = logging.getLogger(__name__)
+
+UPLOAD_DELAY = timedelta(minutes=2)
+MIN_WAIT = timedelta(seconds=30)
+FALLBACK_INTERVAL = timedelta(hours=1)
+MIN_TRANSMISSION_INTERVAL = timedelta(minutes=5)
+MAX_TRANSMISSION_INTERVAL = timedelta(days=1)
+# Polls are scheduled with a precision of about a second, a poll slightly before its time still counts
+SCHEDULE_TOLERANCE = timedelta(seconds=5)
+
+
+class GroheTransmissionSchedule:
+    """
+    Measurement schedule for battery powered devices (Grohe Sense), which only upload their measurements every
+    measurement_transmission_intervall seconds, shifted by measurement_transmission_intervall_offset seconds.
+    New measurements are expected UPLOAD_DELAY after each upload. If the config does not contain a (plausible)
+    transmission interval, new measurements are expected every FALLBACK_INTERVAL.
+
+    Grohe does not document these values. The interval is taken as seconds, values outside of
+    MIN_TRANSMISSION_INTERVAL and MAX_TRANSMISSION_INTERVAL (e.g. minutes or milliseconds) are ignored. The offset is
+    taken as seconds counted from the unix epoch, so the uploads happen at offset + n * interval. If this phase is
+    wrong, measurements are delayed by at most one interval. Alarms and notifications are not part of the uploads,
+    they are polled independently of this schedule.
+    """
+    def __init__(self, config: Config | None, upload_delay: timedelta = UPLOAD_DELAY,
+                 fallback_interval: timedelta = FALLBACK_INTERVAL) -> None:
+        self._upload_delay = upload_delay.total_seconds()
+        self._fallback_interval = fallback_interval
+        self._interval: float | None = None
+        self._offset: float = 0.0
+
+        if config is not None and config.measurement_transmission_intervall:
+            if (MIN_TRANSMISSION_INTERVAL.total_seconds() <= config.measurement_transmission_intervall <=
+                    MAX_TRANSMISSION_INTERVAL.total_seconds()):
+                self._interval = float(config.measurement_transmission_intervall)
+                self._offset = float(config.measurement_transmission_intervall_offset or 0) % self._interval
+            else:
+                _LOGGER.debug('Ignoring implausible transmission interval of %s s',
+                              config.measurement_transmission_intervall)
+
+    @property
+    def transmission_interval(self) -> timedelta | None:
+        return timedelta(seconds=self._interval) if self._interval is not None else None
+
+    @property
+    def interval(self) -> timedelta:
+        return self.transmission_interval or self._fallback_interval
+
+    def next_interval(self, now: float | None = None) -> timedelta:
+        """
+        Get the interval until the next measurements are expected, which is shortly after the next upload of the
+        device.
+
+        :param now: (optional) The current unix timestamp. Defaults to the current time.
+        :type now: float
+        :return: The interval until the next measurements are expected.
+        :rtype: timedelta
+        """
+        if self._interval is None:
+            return self._fallback_interval
+
+        now = time.time() if now is None else now
+        wait = self._offset + self._upload_delay + (self._get_upload_count(now) + 1) * self._interval - now
+        return timedelta(seconds=max(wait, MIN_WAIT.total_seconds()))
+
+    def is_upload_due(self, last_fetch: float, now: float | None = None) -> bool:
+        """
+        Check whether new measurements are expected since the last fetch of the measurements.
+
+        :param last_fetch: The unix timestamp of the last fetch.
+        :type last_fetch: float
+        :param now: (optional) The current unix timestamp. Defaults to the current time.
+        :type now: float
+        :return: True if an upload (plus UPLOAD_DELAY) happened between the last fetch and now.
+        :rtype: bool
+        """
+        now = time.time() if now is None else now
+        if self._interval is None:
+            return now - last_fetch >= (self._fallback_interval - SCHEDULE_TOLERANCE).total_seconds()
+        return self._get_upload_count(now) > self._get_upload_count(last_fetch)
+
+    def _get_upload_count(self, timestamp: float) -> int:
+        tolerance = SCHEDULE_TOLERANCE.total_seconds()
+        return math.floor((timestamp + tolerance - self._offset - self._upload_delay) / self._interval)
+
+    def polls_per_day(self) -> float:
+        """
+        Get the number of measurement fetches per day with this schedule.
+
+        :return: The number of measurement fetches per day.
+        :rtype: float
+        """
+        return timedelta(days=1) / self.interval
@@ -1,4 +1,4 @@
-from enum import Enum
+from enum import Enum, IntEnum
 
 
 class OndusGroupByTypes(Enum):
@@ -26,3 +26,33 @@ class PressureMeasurementState(Enum):
     START = 'START'
     START_FAILED = 'START_FAILED'
     STOP = 'STOP'
+
+
+class NotificationSeverity(IntEnum):
+    OTHER = 0  # Advertising, web URLs and unknown categories
+    INFORMATION = 1
+    WARNING = 2
+    ALARM = 3
+
+
+class OndusRequestPriority(IntEnum):
+    CRITICAL = -1  # Emergency shut-off commands, sent before anything else
+    HIGH = 0  # User initiated requests like valve commands, which must not wait behind polling
+    NORMAL = 1  # Background polling
+    LOW = 2  # Bulk requests which may wait for everything else
+
+
+class OndusEndpointFamily(Enum):
+    DASHBOARD = 'dashboard'
+    TOPOLOGY = 'topology'  # Locations, rooms and appliance lists
+    STATUS = 'status'  # Status and info of single appliances
+    DATA = 'data'  # data/aggregated
+    DETAILS = 'details'
+    NOTIFICATIONS = 'notifications'
+    COMMAND = 'command'  # Commands and pressure measurements
+
+
+class CircuitBreakerState(Enum):
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
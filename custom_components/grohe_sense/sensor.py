@@ -1,19 +1,16 @@
-from typing import List
+from typing import List, Dict
 import logging
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .const import (DOMAIN)
-from .api.ondus_api import OndusApi
 from .dto.grohe_device import GroheDevice
 from .entities.configuration.grohe_entity_configuration import GROHE_ENTITY_CONFIG, SensorTypes
-from .entities.grohe_blue_update_coordinator import GroheBlueUpdateCoordinator
 from .entities.grohe_sense_guard_last_pressure import GroheSenseGuardLastPressureEntity
 from .entities.grohe_sensor import GroheSensorEntity
 from .entities.grohe_sense_guard import GroheSenseGuardWithdrawalsEntity
 from .entities.grohe_sense_notifications import GroheSenseNotificationEntity
-from .entities.grohe_sense_update_coordinator import GroheSenseUpdateCoordinator
-from .enum.ondus_types import GroheTypes
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,19 +18,16 @@ _LOGGER = logging.getLogger(__name__)
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
     _LOGGER.debug(f'Adding sensor entities from config entry {entry}')
 
-    ondus_api: OndusApi = hass.data[DOMAIN]['session']
+    coordinators: Dict[str, DataUpdateCoordinator] = hass.data[DOMAIN]['coordinators']
 
     entities: List[GroheSenseNotificationEntity | GroheSensorEntity | GroheSenseGuardWithdrawalsEntity |
                    GroheSenseGuardLastPressureEntity] = []
     devices: List[GroheDevice] = hass.data[DOMAIN]['devices']
 
     for device in devices:
-        if device.type == GroheTypes.GROHE_BLUE_PROFESSIONAL or device.type == GroheTypes.GROHE_BLUE_HOME:
-            coordinator = GroheBlueUpdateCoordinator(hass, device, ondus_api)
-        else:
-            coordinator = GroheSenseUpdateCoordinator(hass, device, ondus_api)
+        coordinator = coordinators.get(device.appliance_id)
 
-        if device.type in GROHE_ENTITY_CONFIG:
+        if coordinator is not None and device.type in GROHE_ENTITY_CONFIG:
             for sensors in GROHE_ENTITY_CONFIG.get(device.type):
                 _LOGGER.debug(f'Attaching sensor {sensors} to device {device}')
                 if sensors == SensorTypes.WATER_CONSUMPTION:
@@ -50,7 +44,6 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
                     entities.append(GroheSensorEntity(DOMAIN, coordinator, device, sensors))
         else:
             _LOGGER.warning('Unrecognized appliance %s, ignoring.', device)
-        await coordinator.async_request_refresh()
 
     if entities:
-        async_add_entities(entities, update_before_add=True)
+        async_add_entities(entities)
@@ -0,0 +1,234 @@
+import asyncio
+import logging
+import time
+from dataclasses import asdict
+from datetime import datetime
+from typing import List, Dict, Any, Iterable
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from custom_components.grohe_sense.const import DOMAIN
+from custom_components.grohe_sense.dto.grohe_device import GroheDevice
+from custom_components.grohe_sense.entities.grohe_notification_update_coordinator import \
+    GroheNotificationUpdateCoordinator
+from custom_components.grohe_sense.entities.grohe_sense_update_coordinator import GroheSenseUpdateCoordinator
+from custom_components.grohe_sense.enum.ondus_types import GroheTypes, OndusRequestPriority
+from custom_components.grohe_sense.storage.grohe_timeseries_store import GroheTimeSeriesStore
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_EMERGENCY_SHUTOFF = 'emergency_shutoff'
+SERVICE_MARK_NOTIFICATIONS_READ = 'mark_notifications_read'
+SERVICE_GET_HISTORY = 'get_history'
+ATTR_LOCATION = 'location'
+ATTR_ROOM = 'room'
+ATTR_APPLIANCE = 'appliance'
+ATTR_CATEGORY = 'category'
+ATTR_OLDER_THAN = 'older_than'
+ATTR_START = 'start'
+ATTR_END = 'end'
+ATTR_SERIES = 'series'
+SERIES_MEASUREMENTS = 'measurements'
+SERIES_WITHDRAWALS = 'withdrawals'
+
+EMERGENCY_SHUTOFF_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_LOCATION): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_ROOM): vol.All(cv.ensure_list, [cv.string]),
+})
+
+MARK_NOTIFICATIONS_READ_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_APPLIANCE): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_CATEGORY): vol.All(cv.ensure_list, [vol.Coerce(int)]),
+    vol.Optional(ATTR_OLDER_THAN): cv.time_period,
+})
+
+GET_HISTORY_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_APPLIANCE): vol.All(cv.ensure_list, [cv.string]),
+    vol.Required(ATTR_START): cv.datetime,
+    vol.Optional(ATTR_END): cv.datetime,
+    vol.Optional(ATTR_SERIES, default=[SERIES_MEASUREMENTS, SERIES_WITHDRAWALS]):
+        vol.All(cv.ensure_list, [vol.In([SERIES_MEASUREMENTS, SERIES_WITHDRAWALS])]),
+})
+
+
+def _matches(values: Iterable[str] | None, item_id: Any, item_name: str | None) -> bool:
+    """
+    Check whether a location or room is selected by a list of IDs or names. Names are compared case-insensitive.
+    """
+    if values is None:
+        return True
+    for value in values:
+        if value == str(item_id) or (item_name is not None and value.casefold() == item_name.casefold()):
+            return True
+    return False
+
+
+def _get_guards(hass: HomeAssistant, locations: List[str] | None, rooms: List[str] | None) -> List[GroheDevice]:
+    devices: List[GroheDevice] = hass.data[DOMAIN]['devices']
+    return [device for device in devices
+            if device.type == GroheTypes.GROHE_SENSE_GUARD
+            and _matches(locations, device.location_id, device.location_name)
+            and _matches(rooms, device.room_id, device.room_name)]
+
+
+async def _async_close_valve(coordinator: GroheSenseUpdateCoordinator, device: GroheDevice) -> Dict[str, Any]:
+    started = time.monotonic()
+    result: Dict[str, Any] = {'name': device.name, 'location': device.location_name, 'room': device.room_name}
+    try:
+        await coordinator.command_pipeline.async_set_valve(False, OndusRequestPriority.CRITICAL)
+        result['success'] = True
+    except Exception as e:
+        _LOGGER.error('Emergency shut-off of %s failed: %s', device.name, str(e))
+        result['success'] = False
+        result['error'] = str(e)
+    result['duration'] = round(time.monotonic() - started, 3)
+    return result
+
+
+async def async_emergency_shutoff(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """
+    Close the valves of all Sense Guards, or of the ones in the given locations and rooms, concurrently. Guards in
+    locations with disabled emergency shutdown are skipped.
+
+    :param hass: The Home Assistant instance.
+    :param call: The service call.
+    :return: The result per valve and the total wall time.
+    """
+    started = time.monotonic()
+    coordinators: Dict[str, GroheSenseUpdateCoordinator] = hass.data[DOMAIN]['coordinators']
+
+    targets: List[GroheDevice] = []
+    skipped: Dict[str, Dict[str, Any]] = {}
+    for device in _get_guards(hass, call.data.get(ATTR_LOCATION), call.data.get(ATTR_ROOM)):
+        if device.emergency_shutdown_enable is False:
+            skipped[device.appliance_id] = {'name': device.name, 'location': device.location_name,
+                                            'room': device.room_name, 'reason': 'emergency_shutdown_disabled'}
+        else:
+            targets.append(device)
+
+    _LOGGER.warning('Emergency shut-off of %d Grohe Sense Guard valves (%d skipped)', len(targets), len(skipped))
+
+    # The commands are sent with CRITICAL priority, so they neither wait behind polling nor behind the confirmations,
+    # are sent even if the circuit of the command endpoints is open and are retried if they fail
+    results = await asyncio.gather(*[_async_close_valve(coordinators[device.appliance_id], device)
+                                     for device in targets])
+    duration = time.monotonic() - started
+
+    failed = sum(1 for result in results if not result['success'])
+    _LOGGER.warning('Emergency shut-off finished after %.2fs, %d of %d valves closed', duration,
+                    len(results) - failed, len(results))
+
+    return {
+        'valves': {device.appliance_id: result for device, result in zip(targets, results)},
+        'skipped': skipped,
+        'duration': round(duration, 3),
+    }
+
+
+async def async_mark_notifications_read(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """
+    Mark the unread notifications of all appliances, or the ones matching the given appliances, categories and age,
+    as read.
+
+    :param hass: The Home Assistant instance.
+    :param call: The service call.
+    :return: The number of matched and marked notifications, the failures and the total wall time.
+    """
+    started = time.monotonic()
+    notification_sync: GroheNotificationUpdateCoordinator = hass.data[DOMAIN]['notifications']
+    coordinators: Dict[str, GroheSenseUpdateCoordinator] = hass.data[DOMAIN]['coordinators']
+
+    appliance_ids = None
+    if ATTR_APPLIANCE in call.data:
+        devices: List[GroheDevice] = hass.data[DOMAIN]['devices']
+        appliance_ids = {device.appliance_id for device in devices
+                         if _matches(call.data[ATTR_APPLIANCE], device.appliance_id, device.name)}
+    categories = set(call.data[ATTR_CATEGORY]) if ATTR_CATEGORY in call.data else None
+    older_than = dt_util.utcnow() - call.data[ATTR_OLDER_THAN] if ATTR_OLDER_THAN in call.data else None
+
+    notifications = await notification_sync.async_find_unread(appliance_ids, categories, older_than)
+    _LOGGER.info('Marking %d Grohe notifications as read', len(notifications))
+    failures = await notification_sync.async_mark_read(notifications)
+
+    # Let the notification entities pick up the new read state from the index
+    for appliance_id in {notification.appliance_id for notification in notifications}:
+        if appliance_id in coordinators:
+            await coordinators[appliance_id].async_request_refresh()
+
+    return {
+        'matched': len(notifications),
+        'marked': len(notifications) - len(failures),
+        'failed': failures,
+        'duration': round(time.monotonic() - started, 3),
+    }
+
+
+def _as_aware(value: datetime | None) -> datetime | None:
+    """Take datetimes without timezone as the time zone of Home Assistant."""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    return value
+
+
+async def async_get_history(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """
+    Get the stored measurements and withdrawals of all Sense appliances, or of the given ones, within a time range.
+    The data is read from the local time-series store only, so it is also available while the Grohe cloud is not.
+
+    :param hass: The Home Assistant instance.
+    :param call: The service call.
+    :return: The measurements and withdrawals by appliance ID.
+    """
+    timeseries: GroheTimeSeriesStore = hass.data[DOMAIN]['timeseries']
+    devices: List[GroheDevice] = hass.data[DOMAIN]['devices']
+    start = _as_aware(call.data[ATTR_START])
+    end = _as_aware(call.data.get(ATTR_END))
+    series = call.data[ATTR_SERIES]
+
+    history: Dict[str, Dict[str, Any]] = {}
+    for device in devices:
+        if device.type not in (GroheTypes.GROHE_SENSE, GroheTypes.GROHE_SENSE_GUARD):
+            continue
+        if ATTR_APPLIANCE in call.data and not _matches(call.data[ATTR_APPLIANCE], device.appliance_id, device.name):
+            continue
+
+        result: Dict[str, Any] = {'name': device.name}
+        if SERIES_MEASUREMENTS in series:
+            result[SERIES_MEASUREMENTS] = [asdict(measurement) for measurement in
+                                           await timeseries.async_get_measurements(device.appliance_id, start, end)]
+        if SERIES_WITHDRAWALS in series:
+            result[SERIES_WITHDRAWALS] = [asdict(withdrawal) for withdrawal in
+                                          await timeseries.async_get_withdrawals(device.appliance_id, start, end)]
+        history[device.appliance_id] = result
+
+    return {'appliances': history}
+
+
+def async_register_services(hass: HomeAssistant) -> None:
+    if hass.services.has_service(DOMAIN, SERVICE_EMERGENCY_SHUTOFF):
+        return
+
+    async def handle_emergency_shutoff(call: ServiceCall) -> ServiceResponse:
+        return await async_emergency_shutoff(hass, call)
+
+    async def handle_mark_notifications_read(call: ServiceCall) -> ServiceResponse:
+        return await async_mark_notifications_read(hass, call)
+
+    async def handle_get_history(call: ServiceCall) -> ServiceResponse:
+        return await async_get_history(hass, call)
+
+    hass.services.async_register(DOMAIN, SERVICE_EMERGENCY_SHUTOFF, handle_emergency_shutoff,
+                                 schema=EMERGENCY_SHUTOFF_SCHEMA, supports_response=SupportsResponse.OPTIONAL)
+    hass.services.async_register(DOMAIN, SERVICE_MARK_NOTIFICATIONS_READ, handle_mark_notifications_read,
+                                 schema=MARK_NOTIFICATIONS_READ_SCHEMA, supports_response=SupportsResponse.OPTIONAL)
+    hass.services.async_register(DOMAIN, SERVICE_GET_HISTORY, handle_get_history,
+                                 schema=GET_HISTORY_SCHEMA, supports_response=SupportsResponse.ONLY)
+
+
+def async_unregister_services(hass: HomeAssistant) -> None:
+    hass.services.async_remove(DOMAIN, SERVICE_EMERGENCY_SHUTOFF)
+    hass.services.async_remove(DOMAIN, SERVICE_MARK_NOTIFICATIONS_READ)
+    hass.services.async_remove(DOMAIN, SERVICE_GET_HISTORY)
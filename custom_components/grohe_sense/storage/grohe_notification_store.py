@@ -0,0 +1,46 @@
+import logging
+from typing import List, Callable
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from custom_components.grohe_sense.const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+
+class GroheNotificationStore:
+    """
+    Persists the IDs of the notifications for which an event was fired already, so that a restart does not fire
+    them again.
+    """
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store = Store(hass, STORAGE_VERSION, f'{DOMAIN}.{entry_id}.notifications')
+
+    async def async_load(self) -> List[str] | None:
+        """
+        Load the IDs of the already seen notifications, oldest first.
+
+        :return: The notification IDs or None if nothing was stored yet.
+        :rtype: List[str] | None
+        """
+        data = await self._store.async_load()
+        if not data or not isinstance(data.get('seen'), list):
+            return None
+        return data['seen']
+
+    def async_delay_save(self, get_seen: Callable[[], List[str]]) -> None:
+        """
+        Save the IDs of the seen notifications. The write is delayed, so a burst of notifications results in one write.
+
+        :param get_seen: Callable returning the notification IDs, oldest first.
+        :type get_seen: Callable[[], List[str]]
+        :return: None
+        """
+        self._store.async_delay_save(lambda: {'seen': get_seen()}, SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
@@ -0,0 +1,115 @@
+import logging
+from dataclasses import asdict
+from typing import Dict, List, Tuple, Any, Callable
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from custom_components.grohe_sense.const import DOMAIN
+from custom_components.grohe_sense.dto.grohe_coordinator_dtos import CoordinatorDto, MeasurementSenseDto, \
+    MeasurementBlueDto, LastPressureMeasurement
+from custom_components.grohe_sense.dto.grohe_device import GroheDevice
+from custom_components.grohe_sense.dto.ondus_dtos import Command
+from custom_components.grohe_sense.enum.ondus_types import GroheTypes
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 60
+
+
+def _serialize_data(data: CoordinatorDto) -> Dict[str, Any]:
+    return asdict(data)
+
+
+def _deserialize_data(device: GroheDevice, data: Dict[str, Any]) -> CoordinatorDto:
+    coordinator_data = CoordinatorDto(**data)
+
+    if coordinator_data.measurement is not None:
+        if device.type == GroheTypes.GROHE_BLUE_PROFESSIONAL or device.type == GroheTypes.GROHE_BLUE_HOME:
+            coordinator_data.measurement = MeasurementBlueDto(**coordinator_data.measurement)
+        else:
+            coordinator_data.measurement = MeasurementSenseDto(**coordinator_data.measurement)
+
+    if coordinator_data.last_pressure_measurement is not None:
+        coordinator_data.last_pressure_measurement = LastPressureMeasurement(
+            **coordinator_data.last_pressure_measurement)
+
+    if coordinator_data.command is not None:
+        coordinator_data.command = Command(**coordinator_data.command)
+
+    return coordinator_data
+
+
+class GroheSnapshotStore:
+    """
+    Persists the discovered devices and the last data of their coordinators, so that the entities can be set up
+    right away on startup, even if the Grohe cloud is slow or not reachable.
+    """
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store = Store(hass, STORAGE_VERSION, f'{DOMAIN}.{entry_id}.snapshot')
+
+    async def async_load(self) -> Tuple[List[GroheDevice], Dict[str, CoordinatorDto]] | None:
+        """
+        Load the snapshot of the last run.
+
+        :return: A tuple of the devices and the last coordinator data by appliance ID, or None if there is no
+                 (usable) snapshot.
+        :rtype: Tuple[List[GroheDevice], Dict[str, CoordinatorDto]] | None
+        """
+        data = await self._store.async_load()
+        if not data or not data.get('devices'):
+            return None
+
+        try:
+            devices = [GroheDevice.from_dict(device) for device in data['devices']]
+        except Exception as e:
+            _LOGGER.warning('Could not restore Grohe devices from snapshot: %s', str(e))
+            return None
+
+        coordinator_data: Dict[str, CoordinatorDto] = {}
+        for device in devices:
+            device_data = data.get('data', {}).get(device.appliance_id)
+            if device_data is None:
+                continue
+            try:
+                coordinator_data[device.appliance_id] = _deserialize_data(device, device_data)
+            except Exception as e:
+                _LOGGER.debug('Could not restore data of appliance %s from snapshot: %s', device.appliance_id, str(e))
+
+        return devices, coordinator_data
+
+    def _build(self, devices: List[GroheDevice], data: Dict[str, CoordinatorDto | None]) -> Dict[str, Any]:
+        return {
+            'devices': [device.to_dict() for device in devices],
+            'data': {appliance_id: _serialize_data(appliance_data) for appliance_id, appliance_data in data.items()
+                     if appliance_data is not None},
+        }
+
+    async def async_save(self, devices: List[GroheDevice], data: Dict[str, CoordinatorDto | None]) -> None:
+        """
+        Save the snapshot right away.
+
+        :param devices: The discovered devices.
+        :type devices: List[GroheDevice]
+        :param data: The coordinator data by appliance ID.
+        :type data: Dict[str, CoordinatorDto | None]
+        :return: None
+        """
+        await self._store.async_save(self._build(devices, data))
+
+    def async_delay_save(self, devices: List[GroheDevice],
+                         get_data: Callable[[], Dict[str, CoordinatorDto | None]]) -> None:
+        """
+        Save the snapshot delayed, so that the updates of all coordinators in one cycle result in one write.
+
+        :param devices: The discovered devices.
+        :type devices: List[GroheDevice]
+        :param get_data: Returns the coordinator data by appliance ID at the time of the write.
+        :type get_data: Callable[[], Dict[str, CoordinatorDto | None]]
+        :return: None
+        """
+        self._store.async_delay_save(lambda: self._build(devices, get_data()), SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
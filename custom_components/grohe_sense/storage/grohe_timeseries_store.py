@@ -0,0 +1,216 @@
+import asyncio
+import logging
+import os
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from typing import List, Tuple, Any, Callable, TypeVar, Iterable
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import STORAGE_DIR
+
+from custom_components.grohe_sense.const import DOMAIN
+from custom_components.grohe_sense.dto.ondus_dtos import MeasurementSenseDto, Withdrawal
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar('_T')
+
+DEFAULT_RETENTION = timedelta(days=365)
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS measurements ('
+    ' appliance_id TEXT NOT NULL, timestamp INTEGER NOT NULL, flow_rate REAL, pressure REAL, temperature REAL,'
+    ' temperature_guard REAL, humidity REAL, PRIMARY KEY (appliance_id, timestamp)) WITHOUT ROWID',
+    'CREATE TABLE IF NOT EXISTS withdrawals ('
+    ' appliance_id TEXT NOT NULL, timestamp INTEGER NOT NULL, waterconsumption REAL, hotwater_share REAL,'
+    ' water_cost REAL, energy_cost REAL, PRIMARY KEY (appliance_id, timestamp)) WITHOUT ROWID',
+)
+
+_UPSERT_MEASUREMENT = (
+    'INSERT INTO measurements (appliance_id, timestamp, flow_rate, pressure, temperature, temperature_guard, humidity)'
+    ' VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (appliance_id, timestamp) DO UPDATE SET'
+    ' flow_rate = excluded.flow_rate, pressure = excluded.pressure, temperature = excluded.temperature,'
+    ' temperature_guard = excluded.temperature_guard, humidity = excluded.humidity'
+)
+
+_UPSERT_WITHDRAWAL = (
+    'INSERT INTO withdrawals (appliance_id, timestamp, waterconsumption, hotwater_share, water_cost, energy_cost)'
+    ' VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (appliance_id, timestamp) DO UPDATE SET'
+    ' waterconsumption = excluded.waterconsumption, hotwater_share = excluded.hotwater_share,'
+    ' water_cost = excluded.water_cost, energy_cost = excluded.energy_cost'
+)
+
+
+def _to_timestamp(date: datetime | str) -> int | None:
+    """
+    Convert the date of a measurement or withdrawal into seconds since the epoch. Dates without timezone are taken
+    as local time.
+    """
+    if isinstance(date, str):
+        try:
+            date = datetime.fromisoformat(date)
+        except ValueError:
+            return None
+    if not isinstance(date, datetime):
+        return None
+    if date.tzinfo is None:
+        date = date.astimezone()
+    return int(date.timestamp())
+
+
+def _to_date(timestamp: int) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
+class GroheTimeSeriesStore:
+    """
+    Keeps the measurements and withdrawals of all appliances in a local SQLite database, keyed by appliance and
+    timestamp. Every row of the aggregated data responses is stored, rows which are received again are updated, so
+    the history can be queried for charts and analytics without requesting it from the Grohe cloud again. The
+    database is only accessed from the executor, one statement at a time.
+    """
+    def __init__(self, hass: HomeAssistant, entry_id: str, retention: timedelta = DEFAULT_RETENTION) -> None:
+        self._hass = hass
+        self._path = hass.config.path(STORAGE_DIR, f'{DOMAIN}.{entry_id}.db')
+        self._retention = retention
+        self._connection: sqlite3.Connection | None = None
+        self._lock = asyncio.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            connection = sqlite3.connect(self._path, check_same_thread=False)
+            with connection:
+                for statement in _SCHEMA:
+                    connection.execute(statement)
+                oldest = int((datetime.now(timezone.utc) - self._retention).timestamp())
+                connection.execute('DELETE FROM measurements WHERE timestamp < ?', (oldest,))
+                connection.execute('DELETE FROM withdrawals WHERE timestamp < ?', (oldest,))
+            self._connection = connection
+        return self._connection
+
+    async def _async_run(self, job: Callable[[sqlite3.Connection], _T]) -> _T:
+        async with self._lock:
+            return await self._hass.async_add_executor_job(lambda: job(self._connect()))
+
+    async def async_ingest(self, appliance_id: str, measurements: Iterable[MeasurementSenseDto] | None,
+                           withdrawals: Iterable[Withdrawal] | None) -> Tuple[int, int]:
+        """
+        Store the measurements and withdrawals of an aggregated data response. Rows with an already stored timestamp
+        are updated.
+
+        :param appliance_id: ID of the appliance the rows belong to.
+        :type appliance_id: str
+        :param measurements: The measurements of the response.
+        :type measurements: Iterable[MeasurementSenseDto] | None
+        :param withdrawals: The withdrawals of the response.
+        :type withdrawals: Iterable[Withdrawal] | None
+        :return: The number of stored measurements and withdrawals.
+        :rtype: Tuple[int, int]
+        """
+        measurement_rows: List[Tuple[Any, ...]] = []
+        for measurement in measurements or []:
+            timestamp = _to_timestamp(measurement.date)
+            if timestamp is None:
+                _LOGGER.debug('Skipping measurement of appliance %s with invalid date %s', appliance_id,
+                              measurement.date)
+                continue
+            measurement_rows.append((appliance_id, timestamp, measurement.flow_rate, measurement.pressure,
+                                     measurement.temperature, measurement.temperature_guard, measurement.humidity))
+
+        withdrawal_rows: List[Tuple[Any, ...]] = []
+        for withdrawal in withdrawals or []:
+            timestamp = _to_timestamp(withdrawal.date)
+            if timestamp is None:
+                _LOGGER.debug('Skipping withdrawal of appliance %s with invalid date %s', appliance_id,
+                              withdrawal.date)
+                continue
+            withdrawal_rows.append((appliance_id, timestamp, withdrawal.waterconsumption, withdrawal.hotwater_share,
+                                    withdrawal.water_cost, withdrawal.energy_cost))
+
+        if not measurement_rows and not withdrawal_rows:
+            return 0, 0
+
+        def ingest(connection: sqlite3.Connection) -> None:
+            with connection:
+                connection.executemany(_UPSERT_MEASUREMENT, measurement_rows)
+                connection.executemany(_UPSERT_WITHDRAWAL, withdrawal_rows)
+
+        await self._async_run(ingest)
+        return len(measurement_rows), len(withdrawal_rows)
+
+    async def async_get_measurements(self, appliance_id: str, start: datetime,
+                                     end: datetime | None = None) -> List[MeasurementSenseDto]:
+        """
+        Get the stored measurements of an appliance within a time range, oldest first.
+
+        :param appliance_id: ID of the appliance.
+        :type appliance_id: str
+        :param start: The start of the range (inclusive).
+        :type start: datetime
+        :param end: (optional) The end of the range (exclusive). Defaults to now.
+        :type end: datetime | None
+        :return: The measurements, dated in UTC.
+        :rtype: List[MeasurementSenseDto]
+        """
+        rows = await self._async_run(lambda connection: connection.execute(
+            'SELECT timestamp, flow_rate, pressure, temperature_guard, temperature, humidity FROM measurements'
+            ' WHERE appliance_id = ? AND timestamp >= ? AND timestamp < ? ORDER BY timestamp',
+            (appliance_id, _to_timestamp(start), self._get_end(end))).fetchall())
+        return [MeasurementSenseDto(_to_date(row[0]), *row[1:]) for row in rows]
+
+    async def async_get_withdrawals(self, appliance_id: str, start: datetime,
+                                    end: datetime | None = None) -> List[Withdrawal]:
+        """
+        Get the stored withdrawals of an appliance within a time range, oldest first.
+
+        :param appliance_id: ID of the appliance.
+        :type appliance_id: str
+        :param start: The start of the range (inclusive).
+        :type start: datetime
+        :param end: (optional) The end of the range (exclusive). Defaults to now.
+        :type end: datetime | None
+        :return: The withdrawals, dated in UTC.
+        :rtype: List[Withdrawal]
+        """
+        rows = await self._async_run(lambda connection: connection.execute(
+            'SELECT timestamp, waterconsumption, hotwater_share, water_cost, energy_cost FROM withdrawals'
+            ' WHERE appliance_id = ? AND timestamp >= ? AND timestamp < ? ORDER BY timestamp',
+            (appliance_id, _to_timestamp(start), self._get_end(end))).fetchall())
+        return [Withdrawal(_to_date(row[0]), *row[1:]) for row in rows]
+
+    async def async_get_latest(self, appliance_id: str) -> datetime | None:
+        """
+        Get the time of the latest stored measurement or withdrawal of an appliance.
+
+        :param appliance_id: ID of the appliance.
+        :type appliance_id: str
+        :return: The time of the latest row or None if nothing is stored for the appliance.
+        :rtype: datetime | None
+        """
+        row = await self._async_run(lambda connection: connection.execute(
+            'SELECT MAX(timestamp) FROM (SELECT MAX(timestamp) AS timestamp FROM measurements WHERE appliance_id = ?'
+            ' UNION ALL SELECT MAX(timestamp) FROM withdrawals WHERE appliance_id = ?)',
+            (appliance_id, appliance_id)).fetchone())
+        if row is None or row[0] is None:
+            return None
+        return datetime.fromtimestamp(row[0], tz=timezone.utc)
+
+    @staticmethod
+    def _get_end(end: datetime | None) -> int:
+        return _to_timestamp(end) if end is not None else int(datetime.now(timezone.utc).timestamp()) + 1
+
+    async def async_close(self) -> None:
+        async with self._lock:
+            if self._connection is not None:
+                await self._hass.async_add_executor_job(self._connection.close)
+                self._connection = None
+
+    async def async_remove(self) -> None:
+        await self.async_close()
+
+        def remove() -> None:
+            if os.path.exists(self._path):
+                os.remove(self._path)
+
+        await self._hass.async_add_executor_job(remove)
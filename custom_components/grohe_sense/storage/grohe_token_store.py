@@ -0,0 +1,63 @@
+import logging
+from datetime import datetime, timedelta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from custom_components.grohe_sense.const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+MIN_REMAINING_VALIDITY = timedelta(minutes=5)
+
+
+class GroheTokenStore:
+    """
+    Persists the latest refresh token of a config entry, so that a restart can log in with one refresh request
+    instead of the whole username/password login.
+    """
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store = Store(hass, STORAGE_VERSION, f'{DOMAIN}.{entry_id}.tokens')
+
+    async def async_load(self, username: str) -> str | None:
+        """
+        Load the stored refresh token of the given user.
+
+        :param username: The username the refresh token has to belong to.
+        :type username: str
+        :return: The refresh token if it is stored and still valid for a while, None otherwise.
+        :rtype: str | None
+        """
+        data = await self._store.async_load()
+        if not data or data.get('username') != username or not data.get('refresh_token'):
+            return None
+
+        expires = datetime.fromisoformat(data['refresh_token_expires'])
+        if expires - MIN_REMAINING_VALIDITY <= datetime.now():
+            _LOGGER.debug('Stored refresh token expired at %s', expires)
+            return None
+
+        return data['refresh_token']
+
+    def async_save(self, username: str, refresh_token: str, refresh_token_expires: datetime) -> None:
+        """
+        Save the refresh token of the given user. The write is delayed, so bursts of refreshes result in one write.
+
+        :param username: The username the refresh token belongs to.
+        :type username: str
+        :param refresh_token: The refresh token to store.
+        :type refresh_token: str
+        :param refresh_token_expires: The expiry of the refresh token.
+        :type refresh_token_expires: datetime
+        :return: None
+        """
+        self._store.async_delay_save(lambda: {
+            'username': username,
+            'refresh_token': refresh_token,
+            'refresh_token_expires': refresh_token_expires.isoformat(),
+        }, SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
@@ -0,0 +1,134 @@
+"""
+The GroheTimeSeriesStore keeps one row per appliance and timestamp: rows which are received again are updated, and the
+range queries return the rows of one appliance within [start, end), oldest first. A battery Sense updated from the
+dashboard stores the latest measurement of its dashboard slice on every update.
+
+Run from the repository root:  python -m pytest tests/unit
+"""
+import asyncio
+import json
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.grohe_sense.dto.grohe_device import GroheDevice
+from custom_components.grohe_sense.dto.ondus_decoder import decode
+from custom_components.grohe_sense.dto.ondus_dtos import MeasurementSenseDto, Withdrawal, Appliance
+from custom_components.grohe_sense.entities.grohe_sense_update_coordinator import GroheSenseUpdateCoordinator
+from custom_components.grohe_sense.enum.ondus_types import GroheTypes
+from custom_components.grohe_sense.storage.grohe_timeseries_store import GroheTimeSeriesStore
+
+FIXTURES = Path(__file__).parent.parent / 'fixtures' / 'ondus'
+TZ = timezone(timedelta(hours=1))
+START = datetime.now(TZ).replace(minute=0, second=0, microsecond=0) - timedelta(days=1)
+
+
+def _measurement(hours: int, temperature: float) -> MeasurementSenseDto:
+    return MeasurementSenseDto((START + timedelta(hours=hours)).isoformat(), 0.0, 3.2, temperature, None, 45)
+
+
+def _withdrawal(hours: int, consumption: float) -> Withdrawal:
+    return Withdrawal((START + timedelta(hours=hours)).isoformat(), consumption, 0.0, 0.01, 0.0)
+
+
+async def _run(test, retention: timedelta = timedelta(days=365)) -> None:
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        store = GroheTimeSeriesStore(hass, 'entry', retention)
+        try:
+            await test(hass, store)
+        finally:
+            await store.async_close()
+            await hass.async_stop(force=True)
+
+
+def test_ingest_upserts_rows_received_again():
+    async def test(hass: HomeAssistant, store: GroheTimeSeriesStore) -> None:
+        assert await store.async_ingest('a', [_measurement(0, 14.0), _measurement(1, 14.5)],
+                                        [_withdrawal(0, 10.0)]) == (2, 1)
+        # The second response repeats the hour 1 with a changed value
+        assert await store.async_ingest('a', [_measurement(1, 15.0), _measurement(2, 15.5)],
+                                        [_withdrawal(0, 12.0)]) == (2, 1)
+
+        measurements = await store.async_get_measurements('a', START)
+        assert [m.temperature_guard for m in measurements] == [14.0, 15.0, 15.5]
+        assert [w.waterconsumption for w in await store.async_get_withdrawals('a', START)] == [12.0]
+
+    asyncio.run(_run(test))
+
+
+def test_ingest_collapses_duplicate_rows_within_a_response():
+    async def test(hass: HomeAssistant, store: GroheTimeSeriesStore) -> None:
+        # The same instant in another timezone is the same row
+        same_instant = MeasurementSenseDto((START + timedelta(hours=3)).astimezone(timezone.utc).isoformat(),
+                                           0.0, 3.2, 16.0, None, 45)
+        await store.async_ingest('a', [_measurement(3, 15.0), same_instant, _measurement(3, 17.0)], None)
+
+        measurements = await store.async_get_measurements('a', START)
+        assert len(measurements) == 1 and measurements[0].temperature_guard == 17.0
+
+    asyncio.run(_run(test))
+
+
+def test_ingest_skips_rows_without_valid_date():
+    async def test(hass: HomeAssistant, store: GroheTimeSeriesStore) -> None:
+        invalid = MeasurementSenseDto('not a date', 0.0, 3.2, 14.0, None, 45)
+        assert await store.async_ingest('a', [invalid, _measurement(0, 14.0)], []) == (1, 0)
+        assert await store.async_ingest('a', [invalid], None) == (0, 0)
+
+    asyncio.run(_run(test))
+
+
+def test_range_queries_are_half_open_and_per_appliance():
+    async def test(hass: HomeAssistant, store: GroheTimeSeriesStore) -> None:
+        await store.async_ingest('a', [_measurement(hours, 14.0 + hours) for hours in range(6)],
+                                 [_withdrawal(hours, float(hours)) for hours in range(6)])
+        await store.async_ingest('b', [_measurement(2, 20.0)], [_withdrawal(2, 99.0)])
+
+        measurements = await store.async_get_measurements('a', START + timedelta(hours=1), START + timedelta(hours=4))
+        assert [m.temperature_guard for m in measurements] == [15.0, 16.0, 17.0]
+        assert datetime.fromisoformat(measurements[0].date) == START + timedelta(hours=1)
+
+        withdrawals = await store.async_get_withdrawals('a', START + timedelta(hours=4))
+        assert [w.waterconsumption for w in withdrawals] == [4.0, 5.0]
+        assert [w.waterconsumption for w in await store.async_get_withdrawals('b', START)] == [99.0]
+        assert await store.async_get_measurements('c', START) == []
+
+    asyncio.run(_run(test))
+
+
+def test_get_latest_covers_measurements_and_withdrawals():
+    async def test(hass: HomeAssistant, store: GroheTimeSeriesStore) -> None:
+        assert await store.async_get_latest('a') is None
+        await store.async_ingest('a', [_measurement(2, 14.0)], [_withdrawal(5, 1.0)])
+        assert await store.async_get_latest('a') == START + timedelta(hours=5)
+
+    asyncio.run(_run(test))
+
+
+def _dashboard_sense(payload: dict, timestamp: str, temperature: float) -> Appliance:
+    payload['data_latest']['measurement'].update(timestamp=timestamp, temperature=temperature)
+    return decode(Appliance, payload)
+
+
+def test_dashboard_update_stores_latest_measurement():
+    async def test(hass: HomeAssistant, store: GroheTimeSeriesStore) -> None:
+        dashboard = json.loads((FIXTURES / 'dashboard.json').read_text(encoding='utf-8'))
+        payload = next(appliance for appliance in dashboard['locations'][0]['rooms'][0]['appliances']
+                       if appliance['type'] == GroheTypes.GROHE_SENSE.value)
+        device = GroheDevice(1, 2, decode(Appliance, payload))
+        coordinator = GroheSenseUpdateCoordinator(hass, device, None, timeseries=store)
+
+        # The Sense uploads every few hours, the dashboard repeats its latest measurement until then
+        for timestamp, temperature in (('2024-03-04T06:00:00.000+01:00', 12.4),
+                                       ('2024-03-04T06:00:00.000+01:00', 12.4),
+                                       ('2024-03-04T10:00:00.000+01:00', 13.1)):
+            await coordinator._ingest_dashboard_measurement(_dashboard_sense(payload, timestamp, temperature))
+
+        measurements = await store.async_get_measurements(device.appliance_id, datetime(2024, 3, 4, tzinfo=TZ))
+        assert [(m.temperature, m.humidity) for m in measurements] == [(12.4, 61), (13.1, 61)]
+
+    # The fixture is older than the default retention
+    asyncio.run(_run(test, retention=timedelta(days=365 * 100)))
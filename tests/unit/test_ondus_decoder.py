@@ -0,0 +1,76 @@
+"""
+Equivalence of the compiled DTO decoders with dataclasses_json's from_dict over the Ondus fixture payloads.
+
+Run from the repository root:  python -m pytest tests/unit
+"""
+import json
+import warnings
+from pathlib import Path
+
+import pytest
+
+from custom_components.grohe_sense.dto import ondus_dtos
+from custom_components.grohe_sense.dto.ondus_decoder import decode, decode_list, json_loads
+
+FIXTURES = Path(__file__).parent.parent / 'fixtures' / 'ondus'
+INDEX = json.loads((FIXTURES / 'index.json').read_text(encoding='utf-8'))
+
+
+def _from_dict(cls, payload):
+    with warnings.catch_warnings():
+        # dataclasses_json warns about the Union typed date of the withdrawals
+        warnings.simplefilter('ignore')
+        return cls.from_dict(payload)
+
+
+def _load(name):
+    raw = (FIXTURES / name).read_bytes()
+    entry = INDEX[name]
+    return raw, getattr(ondus_dtos, entry['dto']), entry['list']
+
+
+@pytest.mark.parametrize('name', sorted(INDEX))
+def test_decode_matches_from_dict(name):
+    raw, cls, is_list = _load(name)
+    payload = json.loads(raw)
+
+    if is_list:
+        expected = [_from_dict(cls, item) for item in payload]
+        actual = decode_list(cls, payload)
+    else:
+        expected = _from_dict(cls, payload)
+        actual = decode(cls, payload)
+
+    assert actual == expected
+    # repr also compares the types of the values, e.g. 1 == 1.0 but repr(1) != repr(1.0)
+    assert repr(actual) == repr(expected)
+
+
+@pytest.mark.parametrize('name', sorted(INDEX))
+def test_json_loads_matches_json(name):
+    raw, _, _ = _load(name)
+    assert json_loads(raw) == json.loads(raw)
+
+
+def test_projected_decode_only_decodes_selected_fields():
+    raw, cls, _ = _load('appliance_details_sense_guard.json')
+    payload = json.loads(raw)
+    expected = _from_dict(cls, payload)
+
+    projected = decode(cls, payload, only={'id', 'last_pressure_measurement'})
+
+    assert projected.id == expected.id
+    assert projected.last_pressure_measurement == expected.last_pressure_measurement
+    assert projected.config is None and projected.notifications is None
+
+
+def test_decode_coerces_primitives_like_from_dict():
+    payload = {'type': 'pressure', 'value': '7', 'enabled': 1, 'quantity': 5}
+    assert repr(decode(ondus_dtos.Threshold, payload)) == repr(_from_dict(ondus_dtos.Threshold, payload))
+
+
+def test_decode_uses_the_later_of_alias_and_field_name():
+    raw, cls, _ = _load('appliance_details_sense_guard.json')
+    payload = json.loads(raw)
+    payload['id'] = 'field-name-wins'
+    assert decode(cls, payload).id == _from_dict(cls, payload).id == 'field-name-wins'
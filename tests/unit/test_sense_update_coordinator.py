@@ -0,0 +1,106 @@
+"""
+The combined aggregated data request of the GroheSenseUpdateCoordinator derives the same withdrawal and measurement as
+the two separate requests (_get_withdrawal and _get_actual_measurement) it replaces.
+
+The fake endpoint replays fixed responses of the aggregated data endpoint (tests/fixtures/ondus/data_aggregated_*.json)
+for the exact query of each request: the ungrouped full day responses of the withdrawal and the combined request, and
+the responses grouped by hour (by day for the Sense) of the measurement request.
+
+Run from the repository root:  python -m pytest tests/unit
+"""
+import asyncio
+import json
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Tuple
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.grohe_sense.dto.grohe_device import GroheDevice
+from custom_components.grohe_sense.dto.ondus_decoder import decode
+from custom_components.grohe_sense.dto.ondus_dtos import Appliance, MeasurementData
+from custom_components.grohe_sense.entities.grohe_sense_update_coordinator import GroheSenseUpdateCoordinator
+from custom_components.grohe_sense.enum.ondus_types import GroheTypes
+
+FIXTURES = Path(__file__).parent.parent / 'fixtures' / 'ondus'
+TZ = timezone(timedelta(hours=1))
+
+
+class RecordedAggregatedDataApi:
+    def __init__(self, responses: Dict[Tuple[str, str | None], str]) -> None:
+        self.responses = responses
+        self.requests = []
+
+    async def get_appliance_data(self, location_id, room_id, appliance_id, from_date=None, to_date=None,
+                                 group_by=None, date_as_full_day=None, priority=None) -> MeasurementData:
+        # The query parameters as OndusApi sends them
+        query = (str(from_date.date()) if date_as_full_day else from_date.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                 group_by.value if group_by is not None else None)
+        self.requests.append(query)
+        assert query in self.responses, f'No response for the request {query}'
+        return decode(MeasurementData, json.loads((FIXTURES / self.responses[query]).read_text(encoding='utf-8')))
+
+
+def _device(appliance_type: GroheTypes) -> GroheDevice:
+    payload = json.loads((FIXTURES / 'appliance_details_sense_guard.json').read_text(encoding='utf-8'))
+    payload['type'] = appliance_type.value
+    return GroheDevice(48213, 70311, decode(Appliance, payload))
+
+
+SCENARIOS = {
+    # name: (type, last update, responses by query)
+    'guard_during_the_day': (GroheTypes.GROHE_SENSE_GUARD, datetime(2024, 3, 4, 14, 37, tzinfo=TZ), {
+        ('2024-03-04', None): 'data_aggregated_guard_day.json',
+        ('2024-03-04T13:37:00+0100', 'hour'): 'data_aggregated_guard_hour.json',
+    }),
+    'guard_no_data_within_window': (GroheTypes.GROHE_SENSE_GUARD, datetime(2024, 3, 4, 18, 0, tzinfo=TZ), {
+        ('2024-03-04', None): 'data_aggregated_guard_day.json',
+        ('2024-03-04T17:00:00+0100', 'hour'): 'data_aggregated_guard_hour_empty.json',
+    }),
+    'guard_window_across_midnight': (GroheTypes.GROHE_SENSE_GUARD, datetime(2024, 3, 4, 0, 20, tzinfo=TZ), {
+        ('2024-03-04', None): 'data_aggregated_guard_midnight_day.json',
+        ('2024-03-03', None): 'data_aggregated_guard_midnight_two_days.json',
+        ('2024-03-03T23:20:00+0100', 'hour'): 'data_aggregated_guard_midnight_hour.json',
+    }),
+    'sense_grouped_by_day': (GroheTypes.GROHE_SENSE, datetime(2024, 3, 4, 10, 5, tzinfo=TZ), {
+        ('2024-03-04', None): 'data_aggregated_sense_day.json',
+        ('2024-03-04T09:05:00+0100', 'day'): 'data_aggregated_sense_grouped_day.json',
+    }),
+}
+
+EXPECTED = {
+    # name: (withdrawal, temperature of the separate requests)
+    'guard_during_the_day': (52.56, 14.97),
+    'guard_no_data_within_window': (52.56, None),
+    # The withdrawals of the day before are part of the combined response only
+    'guard_window_across_midnight': (0, 14.5),
+    'sense_grouped_by_day': (0, 18.1),
+}
+
+
+async def _compare(appliance_type, last_update, responses):
+    api = RecordedAggregatedDataApi(responses)
+    coordinator = GroheSenseUpdateCoordinator(HomeAssistant(tempfile.mkdtemp()), _device(appliance_type), api)
+    coordinator._last_update = last_update
+
+    separate = (await coordinator._get_withdrawal(), await coordinator._get_actual_measurement())
+    separate_requests = len(api.requests)
+    api.requests.clear()
+    combined = await coordinator._get_withdrawal_and_measurement()
+
+    assert separate_requests == 2 and len(api.requests) == 1
+    assert combined[0] == separate[0]
+    # The grouped responses carry the group averages rounded to two decimals
+    for attribute in ('flow_rate', 'pressure', 'temperature', 'humidity'):
+        expected = getattr(separate[1], attribute)
+        assert getattr(combined[1], attribute) == (pytest.approx(expected, abs=0.005) if expected is not None
+                                                   else None), attribute
+    return separate
+
+
+@pytest.mark.parametrize('name', sorted(SCENARIOS))
+def test_combined_request_matches_separate_requests(name):
+    withdrawal, measurement = asyncio.run(_compare(*SCENARIOS[name]))
+    assert (withdrawal, measurement.temperature) == EXPECTED[name]
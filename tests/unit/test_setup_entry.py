@@ -0,0 +1,93 @@
+"""
+A reload of the config entry discovers the devices from the topology of the last dashboard in the response cache,
+so it makes no topology requests, while a changed topology is still picked up by the first refresh.
+
+The entry is set up against the local stand-in server of the benchmarks.
+
+Run from the repository root:  python -m pytest tests/unit
+"""
+import asyncio
+import functools
+import tempfile
+
+import pytest
+from homeassistant import bootstrap, loader
+from homeassistant.config_entries import ConfigEntries, ConfigEntry, ConfigEntryState
+from homeassistant.core import HomeAssistant, CoreState
+
+import custom_components.grohe_sense as grohe_sense
+from benchmarks.fake_ondus_server import FakeOndusServer
+from custom_components.grohe_sense.api.ondus_api import OndusApi
+from custom_components.grohe_sense.const import DOMAIN, CONF_USERNAME, CONF_PASSWORD
+
+TOPOLOGY_REQUESTS = ('locations', 'rooms', 'appliances')
+
+
+async def _login(api, entry, token_store) -> bool:
+    return await api.login(refresh_token='test')
+
+
+@pytest.fixture(autouse=True)
+def _patch_setup(monkeypatch):
+    monkeypatch.setattr(grohe_sense, '_login', _login)
+    monkeypatch.setattr(grohe_sense, 'OndusApi',
+                        functools.partial(OndusApi, request_rate=10_000.0, request_burst=10_000))
+    monkeypatch.setattr(OndusApi, '_OndusApi__api_url', OndusApi._OndusApi__api_url)
+    # Retry the failing dashboard without waiting
+    monkeypatch.setattr(OndusApi, '_OndusApi__retry_backoff_base', 0.0)
+
+
+async def _settle(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    # The reconcile and the first refresh run as background tasks of the entry
+    await hass.async_block_till_done()
+    while entry._background_tasks:
+        await asyncio.gather(*list(entry._background_tasks), return_exceptions=True)
+        await hass.async_block_till_done()
+
+
+async def _reload(server: FakeOndusServer, change) -> tuple[ConfigEntry, int]:
+    await server.start()
+    server.patch_api_url()
+    try:
+        with tempfile.TemporaryDirectory() as config_dir:
+            hass = HomeAssistant(config_dir)
+            loader.async_setup(hass)
+            hass.config_entries = ConfigEntries(hass, {})
+            await bootstrap.async_load_base_functionality(hass)
+            hass.set_state(CoreState.running)
+
+            entry = ConfigEntry(version=1, minor_version=1, domain=DOMAIN, title='Grohe Sense', source='user',
+                                data={CONF_USERNAME: 'test', CONF_PASSWORD: 'test'}, options={})
+            await hass.config_entries.async_add(entry)
+            await _settle(hass, entry)
+
+            server.reset()
+            change(server)
+            await hass.config_entries.async_reload(entry.entry_id)
+            await _settle(hass, entry)
+
+            devices = len(hass.data[DOMAIN]['devices'])
+            await hass.async_stop()
+            return entry, devices
+    finally:
+        await server.stop()
+
+
+def test_reload_makes_no_topology_requests():
+    server = FakeOndusServer(appliances=3)
+    # Without the cached topology, the discovery falls back to crawling the locations if the dashboard fails
+    entry, devices = asyncio.run(_reload(server, lambda s: s.failing.add('dashboard')))
+
+    assert entry.state == ConfigEntryState.LOADED and devices == 3
+    assert all(server.requests[name] == 0 for name in TOPOLOGY_REQUESTS), dict(server.requests)
+
+
+def test_reload_picks_up_changed_topology():
+    server = FakeOndusServer(appliances=3)
+
+    def add_appliance(s: FakeOndusServer) -> None:
+        s.appliances = 4
+    entry, devices = asyncio.run(_reload(server, add_appliance))
+
+    assert entry.state == ConfigEntryState.LOADED and devices == 4
+    assert all(server.requests[name] == 0 for name in TOPOLOGY_REQUESTS), dict(server.requests)